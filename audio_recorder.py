@@ -5,6 +5,10 @@ Audio recording module for Voice-Activated Task Manager
 import pyaudio
 import numpy as np
 import wave
+import math
+import mmap
+import queue
+import struct
 import threading
 import time
 from pathlib import Path
@@ -15,6 +19,15 @@ from config import AUDIO_CONFIG, TEMP_DIR
 
 logger = logging.getLogger(__name__)
 
+# Bytes written per stream.write() when playing from a memory map (one page)
+MMAP_CHUNK_BYTES = 4096
+
+# Put on frames_queue when silence starts, i.e. speech may have ended
+PAUSE = b''
+
+# Initial capacity of the reused capture buffer (grows if a recording runs longer)
+RECORD_BUFFER_SECS = 30
+
 class AudioRecorder:
     """Handles audio recording and processing"""
     
@@ -24,13 +37,28 @@ class AudioRecorder:
         self.audio_data = []
         self.recording_thread = None
         self.silence_detector = SilenceDetector()
+        self.audio_file = None
+        # Raw Int16 PCM chunks of the current recording, ended by None (streaming only)
+        self.frames_queue = None
+        # Called on the capture thread as soon as capture ends (end of speech,
+        # duration reached or stop requested), before the WAV is written
+        self.on_endpoint: Optional[Callable[[], None]] = None
+        # Capture buffer reused by every recording instead of a per-chunk list
+        self._pcm = np.empty(RECORD_BUFFER_SECS * AUDIO_CONFIG['sample_rate'] * AUDIO_CONFIG['channels'],
+                             dtype=np.int16)
+        # Samples of the last finished capture held in _pcm
+        self._recorded = 0
+        # Set whenever no recording is in progress (cleared while capturing)
+        self._done = threading.Event()
+        self._done.set()
         
-    def start_recording(self, duration: Optional[int] = None) -> str:
+    def start_recording(self, duration: Optional[int] = None, stream: bool = False) -> str:
         """
         Start recording audio for the specified duration or until silence is detected
         
         Args:
             duration: Recording duration in seconds (None for silence-based)
+            stream: Also publish each captured chunk on a fresh frames_queue
             
         Returns:
             Path to the recorded audio file
@@ -41,10 +69,14 @@ class AudioRecorder:
             
         self.recording = True
         self.audio_data = []
+        self.frames_queue = queue.Queue() if stream else None
+        self._recorded = 0
+        self._done.clear()
         
         # Create temporary file path
         timestamp = int(time.time())
         audio_file = TEMP_DIR / f"recording_{timestamp}.wav"
+        self.audio_file = str(audio_file)
         
         # Start recording thread
         self.recording_thread = threading.Thread(
@@ -79,6 +111,8 @@ class AudioRecorder:
     
     def _record_audio(self, output_file: Path, duration: Optional[int] = None):
         """Internal method to record audio"""
+        frames_queue = self.frames_queue
+        captured = False
         try:
             stream = self.audio.open(
                 format=pyaudio.paInt16,
@@ -88,7 +122,7 @@ class AudioRecorder:
                 frames_per_buffer=AUDIO_CONFIG['chunk_size']
             )
             
-            frames = []
+            recorded = 0
             start_time = time.time()
             silence_start_time = None
             
@@ -97,7 +131,10 @@ class AudioRecorder:
             while self.recording:
                 try:
                     data = stream.read(AUDIO_CONFIG['chunk_size'])
-                    frames.append(data)
+                    audio_chunk = self._append_samples(recorded, data)
+                    recorded += audio_chunk.size
+                    if frames_queue is not None:
+                        frames_queue.put(data)
                     
                     # Check if duration exceeded
                     if duration and (time.time() - start_time) >= duration:
@@ -106,46 +143,80 @@ class AudioRecorder:
                     
                     # Check for silence (if no duration specified)
                     if not duration:
-                        audio_chunk = np.frombuffer(data, dtype=np.int16)
                         if self.silence_detector.is_silence(audio_chunk):
                             if silence_start_time is None:
                                 silence_start_time = time.time()
                                 logger.info("Silence detected, waiting for confirmation...")
+                                if frames_queue is not None:
+                                    frames_queue.put(PAUSE)
                             
                             # Check if we've had enough silence
                             silence_duration = time.time() - silence_start_time
-                            if silence_duration >= 1.0:  # 1 second of silence
+                            if silence_duration >= AUDIO_CONFIG['end_silence_secs']:
                                 logger.info(f"Recording stopped after {silence_duration:.1f} seconds of silence")
                                 break
                         else:
                             # Reset silence timer if we detect sound
                             silence_start_time = None
-                    
-                    # Small delay to allow for stop requests
-                    time.sleep(0.01)
                                 
                 except Exception as e:
                     logger.error(f"Error reading audio data: {e}")
                     break
             
+            # Let consumers start on the in-memory audio while the file is written
+            self._recorded = recorded
+            captured = True
+            self._end_capture(frames_queue)
+            
             stream.stop_stream()
             stream.close()
             
             # Save audio to file
-            self._save_audio(frames, output_file)
+            self._save_audio(self._pcm[:recorded], output_file)
             logger.info(f"Audio saved to {output_file}")
             
         except Exception as e:
             logger.error(f"Error in audio recording: {e}")
+        finally:
+            self.recording = False
+            if not captured:
+                self._end_capture(frames_queue)
+            self._done.set()
+    
+    def _end_capture(self, frames_queue: Optional[queue.Queue]):
+        """Close the frames queue and notify the endpoint callback"""
+        if frames_queue is not None:
+            frames_queue.put(None)
+        if self.on_endpoint:
+            try:
+                self.on_endpoint()
+            except Exception as e:
+                logger.error(f"Error in endpoint callback: {e}")
     
-    def _save_audio(self, frames: list, output_file: Path):
-        """Save recorded audio frames to WAV file"""
+    def _append_samples(self, offset: int, data: bytes) -> np.ndarray:
+        """
+        Copy a captured chunk into the capture buffer at offset
+        
+        Returns:
+            View of the chunk's samples inside the buffer
+        """
+        samples = np.frombuffer(data, dtype=np.int16)
+        end = offset + samples.size
+        if end > self._pcm.size:
+            grown = np.empty(max(end, 2 * self._pcm.size), dtype=np.int16)
+            grown[:offset] = self._pcm[:offset]
+            self._pcm = grown
+        self._pcm[offset:end] = samples
+        return self._pcm[offset:end]
+    
+    def _save_audio(self, samples: np.ndarray, output_file: Path):
+        """Save recorded samples to WAV file (written straight from the buffer, no copy)"""
         try:
             with wave.open(str(output_file), 'wb') as wf:
                 wf.setnchannels(AUDIO_CONFIG['channels'])
                 wf.setsampwidth(self.audio.get_sample_size(pyaudio.paInt16))
                 wf.setframerate(AUDIO_CONFIG['sample_rate'])
-                wf.writeframes(b''.join(frames))
+                wf.writeframes(samples)
         except Exception as e:
             logger.error(f"Error saving audio file: {e}")
     
@@ -153,6 +224,29 @@ class AudioRecorder:
         """Check if currently recording"""
         return self.recording
     
+    def get_pcm(self) -> np.ndarray:
+        """
+        Get the samples of the last recording without reading its WAV back
+        
+        Returns:
+            Int16 PCM view of the capture buffer (valid until the next recording starts)
+        """
+        return self._pcm[:self._recorded]
+    
+    def wait_until_done(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Block until the current recording has finished and been saved
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            
+        Returns:
+            Path to the recorded audio file, or None if the wait timed out
+        """
+        if not self._done.wait(timeout):
+            return None
+        return self.audio_file
+    
     def cleanup(self):
         """Clean up audio resources"""
         if self.recording:
@@ -167,8 +261,8 @@ class SilenceDetector:
     def __init__(self, threshold: float = None):
         self.threshold = threshold or AUDIO_CONFIG['silence_threshold']
         self.silence_frames = 0
-        # Require 1 second of silence before stopping
-        self.min_silence_frames = int(1.0 * AUDIO_CONFIG['sample_rate'] / AUDIO_CONFIG['chunk_size'])
+        # Require end_silence_secs of silence before stopping
+        self.min_silence_frames = int(AUDIO_CONFIG['end_silence_secs'] * AUDIO_CONFIG['sample_rate'] / AUDIO_CONFIG['chunk_size'])
         self.last_audio_level = 0
     
     def is_silence(self, audio_chunk: np.ndarray) -> bool:
@@ -181,8 +275,13 @@ class SilenceDetector:
         Returns:
             True if silence detected, False otherwise
         """
-        # Calculate RMS (Root Mean Square) of audio chunk
-        rms = np.sqrt(np.mean(audio_chunk.astype(np.float32) ** 2))
+        if audio_chunk.size == 0:
+            return self.silence_frames >= self.min_silence_frames
+        
+        # Calculate RMS (Root Mean Square) of audio chunk; the dot product
+        # sums the squares without a second temporary array
+        samples = audio_chunk.astype(np.float32)
+        rms = math.sqrt(float(np.dot(samples, samples)) / samples.size)
         
         # Normalize RMS to 0-1 range
         normalized_rms = rms / 32768.0  # Max value for int16
@@ -366,6 +465,87 @@ class AudioPlayer:
             import traceback
             logger.error(traceback.format_exc())
     
+    def play_audio_mmap(self, audio_file: str):
+        """
+        Play a PCM WAV file straight from a memory map
+        
+        Avoids the read() copy of play_audio(); intended for freshly
+        generated files on the local filesystem.
+        
+        Args:
+            audio_file: Path to the WAV file to play
+        """
+        try:
+            logger.info(f"Attempting to play audio (mmap): {audio_file}")
+            
+            with open(audio_file, 'rb') as f, \
+                 mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                fmt, data_start, data_end = self._parse_wav_header(mm)
+                channels, rate, sampwidth = fmt
+                logger.info(f"Audio file info: {channels} channels, {rate} Hz, {sampwidth} bytes")
+                
+                try:
+                    stream = self.audio.open(
+                        format=self.audio.get_format_from_width(sampwidth),
+                        channels=channels,
+                        rate=rate,
+                        output=True,
+                        output_device_index=self.preferred_device
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to open audio output stream: {e}")
+                    return
+                
+                # Keep every chunk frame-aligned
+                frame_bytes = channels * sampwidth
+                chunk = max(frame_bytes, MMAP_CHUNK_BYTES - MMAP_CHUNK_BYTES % frame_bytes)
+                view = memoryview(mm)
+                try:
+                    for offset in range(data_start, data_end, chunk):
+                        stream.write(view[offset:min(offset + chunk, data_end)])
+                    logger.info(f"Audio playback completed: {data_end - data_start} bytes played")
+                except Exception as e:
+                    logger.error(f"Error during audio playback: {e}")
+                finally:
+                    view.release()
+                    stream.stop_stream()
+                    stream.close()
+                    logger.info("Audio stream closed")
+                
+        except FileNotFoundError:
+            logger.error(f"Audio file not found: {audio_file}")
+        except Exception as e:
+            logger.error(f"Error playing audio: {e}")
+    
+    @staticmethod
+    def _parse_wav_header(mm) -> tuple:
+        """
+        Locate the fmt and data chunks of a RIFF/WAVE buffer
+        
+        Returns:
+            ((channels, rate, sampwidth), data_start, data_end)
+        """
+        if mm[:4] != b'RIFF' or mm[8:12] != b'WAVE':
+            raise ValueError("Not a RIFF/WAVE file")
+        
+        fmt = None
+        pos = 12
+        while pos + 8 <= len(mm):
+            chunk_id = mm[pos:pos + 4]
+            chunk_size = struct.unpack_from('<I', mm, pos + 4)[0]
+            body = pos + 8
+            if chunk_id == b'fmt ':
+                _, channels, rate, _, _, bits = struct.unpack_from('<HHIIHH', mm, body)
+                fmt = (channels, rate, bits // 8)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    raise ValueError("WAV data chunk precedes fmt chunk")
+                return fmt, body, min(body + chunk_size, len(mm))
+            # Chunks are word-aligned
+            pos = body + chunk_size + (chunk_size & 1)
+        
+        raise ValueError("WAV file has no data chunk")
+    
     def cleanup(self):
         """Clean up audio player resources"""
         try:
@@ -385,8 +565,8 @@ if __name__ == "__main__":
     
     try:
         print("Starting 5-second recording test...")
-        audio_file = recorder.start_recording(duration=5)
-        time.sleep(6)  # Wait for recording to complete
+        recorder.start_recording(duration=5)
+        audio_file = recorder.wait_until_done()
         
         print(f"Recording saved to: {audio_file}")
         print("Playing back recording...")
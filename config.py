@@ -3,7 +3,10 @@ Configuration file for Voice-Activated Task Manager
 """
 
 import os
+import functools
+import platform
 from pathlib import Path
+from typing import Tuple
 
 # Hotkey Configuration
 HOTKEY_COMBO = {
@@ -11,6 +14,55 @@ HOTKEY_COMBO = {
     'macos': ['cmd', 'shift', 'v']
 }
 
+@functools.lru_cache(maxsize=None)
+def current_hotkey() -> Tuple[str, ...]:
+    """Hotkey combo for the running OS (resolved once per process)"""
+    return tuple(HOTKEY_COMBO.get(platform.system().lower(), HOTKEY_COMBO['windows']))
+
+# Speak "Analyzing..."/"Adding..." progress prompts between processing steps
+# (the listening cue and the final confirmation are always spoken)
+STATUS_PROMPTS = False
+
+# Spoken Prompts
+STARTUP_MESSAGE = "Voice Task Manager is now active. Press the hotkey to add a new task."
+LISTENING_PROMPT = "Listening for your task. Please speak now."
+KEYBOARD_STARTUP_MESSAGE = "Voice Task Manager is now active. Press Ctrl+Shift+V to add a new task. When recording, press '2' to stop."
+GREETING_PROMPT = "Hi Ankit, what task would you like to add?"
+# Spoken once a task is saved; rendered with format_map(task_data). The fixed
+# first sentence is synthesized (and cached) separately from the variable rest
+TASK_CONFIRMATION_PREFIX = "Task added successfully!"
+TASK_CONFIRMATION_TEMPLATE = (
+    TASK_CONFIRMATION_PREFIX
+    + " Your {priority} priority task '{task}' has been recorded and is due on {expected_date}."
+)
+PROGRESS_PROMPTS = (
+    "Processing your voice input...",
+    "Analyzing your task...",
+    "Adding your task to the system..."
+)
+
+# Follow-up question for each required field the parser couldn't find
+MISSING_FIELD_PROMPTS = {
+    'task': "I couldn't identify the task description. Please repeat the task more clearly.",
+    'assigned_by': "Who assigned this task? Please specify the person's name.",
+    'priority': "What priority level should this task have? Please say urgent, high, medium, or low.",
+    'expected_date': "When is this task due? Please specify the completion date."
+}
+
+# Fixed responses kept in the TTS cache (filled at startup or by prebake_prompts.py)
+CACHED_PROMPTS = (
+    STARTUP_MESSAGE,
+    LISTENING_PROMPT,
+    KEYBOARD_STARTUP_MESSAGE,
+    GREETING_PROMPT,
+    TASK_CONFIRMATION_PREFIX,
+    *PROGRESS_PROMPTS,
+    "Sorry, I couldn't understand what you said. Please try again.",
+    "I didn't hear anything. Please try again.",
+    "Sorry, there was an error processing your task. Please try again.",
+    *MISSING_FIELD_PROMPTS.values()
+)
+
 # Audio Configuration
 AUDIO_CONFIG = {
     'sample_rate': 16000,
@@ -18,7 +70,8 @@ AUDIO_CONFIG = {
     'channels': 1,
     'format': 'int16',
     'recording_duration': 10,  # seconds
-    'silence_threshold': 0.005  # Lower threshold for better silence detection
+    'silence_threshold': 0.005,  # Lower threshold for better silence detection
+    'end_silence_secs': 0.7  # Silence that ends a silence-based recording
 }
 
 # Speech-to-Text Configuration
@@ -26,14 +79,19 @@ STT_CONFIG = {
     'model_size': 'base',  # tiny, base, small, medium, large
     'device': 'cpu',  # cpu or cuda
     'compute_type': 'int8',
-    'language': 'en'
+    'language': 'en',
+    'beam_size': 1,  # Greedy decoding for the voice path (short, single-speaker commands)
+    'vad_filter': True  # Skip silent stretches before decoding
 }
 
 # Text-to-Speech Configuration
 TTS_CONFIG = {
     'model': 'KittenML/kitten-tts-nano-0.1',
     'voice': 'expr-voice-2-f',  # Available: expr-voice-2-m, expr-voice-2-f, expr-voice-3-m, expr-voice-3-f, expr-voice-4-m, expr-voice-4-f, expr-voice-5-m, expr-voice-5-f
-    'sample_rate': 24000
+    'sample_rate': 24000,
+    'warmup': True,  # Run one dummy generation at load so the first reply isn't slow
+    'onnx_model_path': None,  # Optional replacement ONNX file, e.g. from quantize_tts_model.py
+    'onnx_threads': None  # ONNX Runtime intra-op threads (None = half the CPU cores)
 }
 
 # Ollama Configuration
@@ -100,6 +158,34 @@ If validation passes, respond with: {{"valid": true}}
 If validation fails, respond with: {{"valid": false, "errors": ["error1", "error2"]}}
 """
 
+# Combined Parsing + Validation Prompt (one round-trip instead of two)
+TASK_PARSE_AND_VALIDATE_PROMPT = """
+You are a task management assistant. Parse the following user input to extract task information, then validate it.
+
+Required fields:
+- task: The main task description
+- assigned_by: Person who assigned the task
+- priority: Priority level (urgent/high/medium/low)
+- expected_date: Expected completion date (YYYY-MM-DD format)
+
+Optional fields:
+- notes: Any additional context or notes
+
+Validation rules:
+1. task: Must be a clear, actionable description
+2. assigned_by: Must be a valid name or identifier
+3. priority: Must be one of: urgent, high, medium, low
+4. expected_date: Must be in YYYY-MM-DD format and a valid future date
+
+User input: "{user_input}"
+
+Respond with ONLY valid JSON. If any required field is missing or unclear, respond with:
+{{"error": "missing_field", "field": "field_name", "message": "description of what's needed"}}
+
+Otherwise return JSON {{"parsed_data": {{...}}, "validation": {{"valid": bool, "errors": [...]}}}}, for example:
+{{"parsed_data": {{"task": "build dashboard project", "assigned_by": "sunny", "priority": "high", "expected_date": "2024-07-04", "notes": "Dashboard for project management"}}, "validation": {{"valid": true, "errors": []}}}}
+"""
+
 # Priority Management Prompt
 PRIORITY_MANAGEMENT_PROMPT = """
 You are a priority management assistant. Analyze the current task list and suggest priority adjustments based on:
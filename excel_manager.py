@@ -3,12 +3,18 @@ Excel task manager module for Voice-Activated Task Manager
 """
 
 import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, date
+from concurrent.futures import Future
 import json
 
 from config import EXCEL_CONFIG
@@ -18,6 +24,12 @@ logger = logging.getLogger(__name__)
 class ExcelTaskManager:
     """Manages task storage and retrieval in Excel files"""
     
+    # Minimum time between saves of the workbook by the enqueue_task writer
+    SAVE_INTERVAL_SECS = 1.0
+    
+    # Startups on which a journaled task is retried before it is given up
+    MAX_REPLAY_ATTEMPTS = 5
+    
     def __init__(self, file_path: str = None, sheet_name: str = None):
         """
         Initialize Excel task manager
@@ -32,9 +44,30 @@ class ExcelTaskManager:
         self.priority_levels = EXCEL_CONFIG['priority_levels']
         self.status_levels = EXCEL_CONFIG['status_levels']
         
-        # Ensure file exists and is properly formatted
+        # Parsed rows, valid while the file's (mtime, size) still matches the stamp
+        self._tasks_cache = None
+        self._tasks_stamp = None
+        self._cache_lock = threading.Lock()
+        
+        # Write-behind queue for enqueue_task, served by one worker thread
+        self._write_q = None
+        self._write_lock = threading.Lock()
+        
+        # Workbook kept open between operations; re-read only if the file changes on disk
+        self._workbook = None
+        self._workbook_stamp = None
+        self._workbook_lock = threading.RLock()
+        
+        # Ensure file exists and is properly formatted (this also opens the workbook)
         self._ensure_file_exists()
         self._format_worksheet()
+        
+        # Tasks queued by enqueue_task but not saved yet survive a crash here
+        self.journal_path = str(Path(self.file_path).with_suffix('.pending.db'))
+        self._journal = None
+        self._journal_lock = threading.Lock()
+        self._open_journal()
+        self._replay_journal()
     
     def _ensure_file_exists(self):
         """Ensure Excel file exists and create if necessary"""
@@ -92,21 +125,47 @@ class ExcelTaskManager:
     def _format_worksheet(self):
         """Format the worksheet with proper styling"""
         try:
-            workbook = openpyxl.load_workbook(self.file_path)
-            worksheet = workbook[self.sheet_name]
-            
-            # Apply conditional formatting for priorities
-            self._apply_priority_formatting(worksheet)
-            
-            # Apply conditional formatting for status
-            self._apply_status_formatting(worksheet)
-            
-            # Save formatting
-            workbook.save(self.file_path)
-            workbook.close()
+            with self._workbook_lock:
+                worksheet = self._live_worksheet()
+                
+                # Apply conditional formatting for priorities
+                self._apply_priority_formatting(worksheet)
+                
+                # Apply conditional formatting for status
+                self._apply_status_formatting(worksheet)
+                
+                # Save formatting
+                self._save_workbook()
             
         except Exception as e:
             logger.error(f"Error formatting worksheet: {e}")
+            self._discard_workbook()
+    
+    def _live_worksheet(self):
+        """
+        Get the task worksheet of the open workbook
+        
+        The workbook is parsed once and kept; it is only loaded again when the
+        file was changed outside this process. Callers hold _workbook_lock.
+        """
+        if self._workbook is None or self._file_stamp() != self._workbook_stamp:
+            self._discard_workbook()
+            self._workbook = openpyxl.load_workbook(self.file_path, keep_links=False)
+            self._workbook_stamp = self._file_stamp()
+        return self._workbook[self.sheet_name]
+    
+    def _save_workbook(self):
+        """Write the open workbook to disk. Callers hold _workbook_lock."""
+        self._workbook.save(self.file_path)
+        self._workbook_stamp = self._file_stamp()
+    
+    def _discard_workbook(self):
+        """Close the open workbook, e.g. after a failed edit left it half-modified"""
+        with self._workbook_lock:
+            if self._workbook is not None:
+                self._workbook.close()
+            self._workbook = None
+            self._workbook_stamp = None
     
     def _apply_priority_formatting(self, worksheet):
         """Apply color coding for priority levels"""
@@ -170,46 +229,222 @@ class ExcelTaskManager:
         Returns:
             Result of the operation
         """
-        try:
-            workbook = openpyxl.load_workbook(self.file_path)
-            worksheet = workbook[self.sheet_name]
-            
-            # Find next empty row
-            next_row = worksheet.max_row + 1
-            
-            # Prepare task data
-            task_row = self._prepare_task_row(task_data)
+        return self._add_tasks([task_data])[0]
+    
+    def _add_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Append tasks to the open workbook and save it once
+        
+        Args:
+            tasks: Task data dictionaries
             
-            # Add task to worksheet
-            for col, value in enumerate(task_row, 1):
-                cell = worksheet.cell(row=next_row, column=col, value=value)
+        Returns:
+            One add_task result per task
+        """
+        try:
+            with self._workbook_lock:
+                worksheet = self._live_worksheet()
+                stamp_before = self._workbook_stamp
+                added_rows = []
                 
-                # Apply special formatting for priority and status
-                if self.columns[col-1] == 'priority' and value in self.priority_levels:
-                    self._format_priority_cell(cell, value)
-                elif self.columns[col-1] == 'status' and value in self.status_levels:
-                    self._format_status_cell(cell, value)
-            
-            # Save workbook
-            workbook.save(self.file_path)
-            workbook.close()
-            
-            logger.info(f"Task added successfully at row {next_row}")
-            
-            return {
-                'success': True,
-                'row': next_row,
-                'task_id': f"TASK_{next_row:04d}",
-                'message': 'Task added successfully'
-            }
+                for task_data in tasks:
+                    # Find next empty row
+                    next_row = worksheet.max_row + 1
+                    
+                    # Prepare task data
+                    task_row = self._prepare_task_row(task_data)
+                    
+                    # Add task to worksheet
+                    for col, value in enumerate(task_row, 1):
+                        cell = worksheet.cell(row=next_row, column=col, value=value)
+                        
+                        # Apply special formatting for priority and status
+                        if self.columns[col-1] == 'priority' and value in self.priority_levels:
+                            self._format_priority_cell(cell, value)
+                        elif self.columns[col-1] == 'status' and value in self.status_levels:
+                            self._format_status_cell(cell, value)
+                    
+                    added_rows.append((next_row, task_row))
+                
+                # Save workbook
+                self._save_workbook()
+            
+            self._append_to_tasks_cache(stamp_before, added_rows)
+            
+            results = []
+            for row, _ in added_rows:
+                logger.info(f"Task added successfully at row {row}")
+                results.append({
+                    'success': True,
+                    'row': row,
+                    'task_id': f"TASK_{row:04d}",
+                    'message': 'Task added successfully'
+                })
+            return results
             
         except Exception as e:
             logger.error(f"Error adding task: {e}")
-            return {
+            self._discard_workbook()
+            return [{
                 'success': False,
                 'error': str(e),
                 'message': 'Failed to add task'
-            }
+            } for _ in tasks]
+    
+    def enqueue_task(self, task_data: Dict[str, Any]) -> Future:
+        """
+        Add a task in the background
+        
+        Writes are applied in order by a single worker thread, so the caller
+        doesn't wait for the workbook to be rewritten. Tasks arriving within
+        SAVE_INTERVAL_SECS of the previous save share one save. Until its
+        save has been attempted, the task is kept in the SQLite journal and is
+        written on the next start if the process dies first.
+        
+        Args:
+            task_data: Task data dictionary
+            
+        Returns:
+            Future resolving to the add_task result
+        """
+        with self._write_lock:
+            if self._write_q is None:
+                self._write_q = queue.Queue()
+                threading.Thread(target=self._writer, args=(self._write_q,), daemon=True).start()
+            
+            future = Future()
+            self._write_q.put((task_data, future, self._journal_task(task_data)))
+        return future
+    
+    def _writer(self, write_q: queue.Queue):
+        """Serve queued enqueue_task requests until a None sentinel"""
+        last_save = 0.0
+        while True:
+            jobs = [write_q.get()]
+            
+            # Batch whatever else arrives before the next save is due
+            save_due = last_save + self.SAVE_INTERVAL_SECS
+            while jobs[-1] is not None:
+                timeout = save_due - time.monotonic()
+                try:
+                    jobs.append(write_q.get(timeout=timeout) if timeout > 0 else write_q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                batch, cancelled = [], []
+                for job in jobs:
+                    if job is not None:
+                        (batch if job[1].set_running_or_notify_cancel() else cancelled).append(job)
+                self._forget_journaled([journal_id for _, _, journal_id in cancelled])
+                
+                if batch:
+                    results = self._add_tasks([task_data for task_data, _, _ in batch])
+                    last_save = time.monotonic()
+                    # A failed save is reported through its future (and to the user), so
+                    # replaying it on the next start would only duplicate their retry
+                    self._forget_journaled([journal_id for _, _, journal_id in batch])
+                    for (_, future, _), result in zip(batch, results):
+                        future.set_result(result)
+            finally:
+                # After the save, so flush() returns only once the tasks are on disk
+                for _ in jobs:
+                    write_q.task_done()
+            
+            if jobs[-1] is None:
+                break
+    
+    def flush(self):
+        """Block until every enqueued task has been written"""
+        with self._write_lock:
+            write_q = self._write_q
+        if write_q is not None:
+            write_q.join()
+    
+    def _open_journal(self):
+        """Open the SQLite journal of unsaved tasks (writes stay in memory only if it fails)"""
+        try:
+            conn = sqlite3.connect(self.journal_path, isolation_level=None, check_same_thread=False)
+            # WAL + NORMAL: each insert is a short append, durable across process crashes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pending_tasks "
+                "(id INTEGER PRIMARY KEY, task_json TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0)"
+            )
+            # Journals written before replay attempts were counted
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(pending_tasks)")]
+            if 'attempts' not in columns:
+                conn.execute("ALTER TABLE pending_tasks ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            self._journal = conn
+        except sqlite3.Error as e:
+            logger.warning(f"Task journal unavailable, queued tasks won't survive a crash: {e}")
+    
+    def _journal_task(self, task_data: Dict[str, Any]) -> Optional[int]:
+        """Record a queued task in the journal; returns its journal id"""
+        if self._journal is None:
+            return None
+        try:
+            with self._journal_lock:
+                cursor = self._journal.execute(
+                    "INSERT INTO pending_tasks (task_json) VALUES (?)",
+                    (json.dumps(task_data, default=str),)
+                )
+            return cursor.lastrowid
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to journal task: {e}")
+            return None
+    
+    def _forget_journaled(self, journal_ids: List[int]):
+        """Remove tasks from the journal once they are saved in the workbook"""
+        journal_ids = [journal_id for journal_id in journal_ids if journal_id is not None]
+        if self._journal is None or not journal_ids:
+            return
+        try:
+            with self._journal_lock:
+                self._journal.executemany("DELETE FROM pending_tasks WHERE id = ?", [(i,) for i in journal_ids])
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to clear saved tasks from the journal: {e}")
+    
+    def _replay_journal(self):
+        """Save tasks left in the journal by a previous run that exited before writing them"""
+        if self._journal is None:
+            return
+        try:
+            with self._journal_lock:
+                rows = self._journal.execute("SELECT id, task_json, attempts FROM pending_tasks ORDER BY id").fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read the task journal: {e}")
+            return
+        
+        if not rows:
+            return
+        
+        logger.info(f"Recovering {len(rows)} unsaved task(s) from the journal")
+        results = self._add_tasks([json.loads(task_json) for _, task_json, _ in rows])
+        
+        # Failed tasks stay for the next start (e.g. the workbook was open in
+        # Excel), until they have failed MAX_REPLAY_ATTEMPTS times
+        done, retry = [], []
+        for (journal_id, task_json, attempts), result in zip(rows, results):
+            if result['success']:
+                done.append(journal_id)
+            elif attempts + 1 >= self.MAX_REPLAY_ATTEMPTS:
+                logger.error(f"Giving up on journaled task after {attempts + 1} attempts: {task_json}")
+                done.append(journal_id)
+            else:
+                logger.error(f"Could not recover journaled task, will retry on next start: {result['error']}")
+                retry.append(journal_id)
+        
+        self._forget_journaled(done)
+        if retry:
+            try:
+                with self._journal_lock:
+                    self._journal.executemany(
+                        "UPDATE pending_tasks SET attempts = attempts + 1 WHERE id = ?", [(i,) for i in retry]
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to record journal replay attempts: {e}")
     
     def _prepare_task_row(self, task_data: Dict[str, Any]) -> List[Any]:
         """Prepare task data for Excel row insertion"""
@@ -256,32 +491,78 @@ class ExcelTaskManager:
             cell.font = Font(bold=True, color="FFFFFF")
     
     def get_all_tasks(self) -> List[Dict[str, Any]]:
-        """Get all tasks from the Excel file"""
+        """
+        Get all tasks from the Excel file
+        
+        The workbook is only parsed again when the file has changed since the
+        last read (including edits made outside this process). Pending
+        enqueue_task writes are applied first.
+        """
+        self.flush()
         try:
-            workbook = openpyxl.load_workbook(self.file_path)
-            worksheet = workbook[self.sheet_name]
-            
-            tasks = []
+            with self._cache_lock:
+                stamp = self._file_stamp()
+                if self._tasks_cache is None or stamp != self._tasks_stamp:
+                    self._tasks_cache = self._read_all_tasks()
+                    self._tasks_stamp = stamp
+                    logger.info(f"Retrieved {len(self._tasks_cache)} tasks")
+                
+                # Copies, so callers can't modify the cached rows
+                return [dict(task) for task in self._tasks_cache]
             
+        except Exception as e:
+            logger.error(f"Error retrieving tasks: {e}")
+            return []
+    
+    def warm_up(self):
+        """Parse the workbook into the task cache ahead of the first query"""
+        self.get_all_tasks()
+    
+    def _read_all_tasks(self) -> List[Dict[str, Any]]:
+        """Read every task row from the workbook"""
+        tasks = []
+        
+        with self._workbook_lock:
+            worksheet = self._live_worksheet()
             for row in range(2, worksheet.max_row + 1):  # Skip header row
                 task = {}
                 for col, header in enumerate(self.columns, 1):
                     cell_value = worksheet.cell(row=row, column=col).value
                     task[header] = cell_value
                 
-                # Add row number as task ID
-                task['row'] = row
-                task['task_id'] = f"TASK_{row:04d}"
-                
-                tasks.append(task)
-            
-            workbook.close()
-            logger.info(f"Retrieved {len(tasks)} tasks")
-            return tasks
-            
-        except Exception as e:
-            logger.error(f"Error retrieving tasks: {e}")
-            return []
+                tasks.append(self._with_task_id(task, row))
+        
+        return tasks
+    
+    @staticmethod
+    def _with_task_id(task: Dict[str, Any], row: int) -> Dict[str, Any]:
+        """Add row number as task ID"""
+        task['row'] = row
+        task['task_id'] = f"TASK_{row:04d}"
+        return task
+    
+    def _file_stamp(self) -> Tuple[int, int]:
+        """Modification time and size of the Excel file"""
+        stat = os.stat(self.file_path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _append_to_tasks_cache(self, stamp_before: Tuple[int, int], added_rows: List[Tuple[int, List[Any]]]):
+        """Extend the cache with (row, values) pairs this process just wrote, if the cache was current before the write"""
+        with self._cache_lock:
+            if self._tasks_cache is None or self._tasks_stamp != stamp_before:
+                self._tasks_cache = None
+                return
+            
+            for row, task_row in added_rows:
+                # Empty cells read back as None
+                task = {header: (None if value == '' else value) for header, value in zip(self.columns, task_row)}
+                self._tasks_cache.append(self._with_task_id(task, row))
+            self._tasks_stamp = self._file_stamp()
+    
+    def _invalidate_tasks_cache(self):
+        """Force the next get_all_tasks() to re-read the workbook"""
+        with self._cache_lock:
+            self._tasks_cache = None
     
     def get_tasks_by_priority(self, priority: str) -> List[Dict[str, Any]]:
         """Get tasks filtered by priority"""
@@ -344,55 +625,56 @@ class ExcelTaskManager:
                     'message': f'Status must be one of: {", ".join(self.status_levels)}'
                 }
             
-            workbook = openpyxl.load_workbook(self.file_path)
-            worksheet = workbook[self.sheet_name]
-            
-            # Parse task ID to get row number
-            try:
-                row_num = int(task_id.split('_')[1])
-            except (IndexError, ValueError):
-                return {
-                    'success': False,
-                    'error': f'Invalid task ID format: {task_id}',
-                    'message': 'Task ID must be in format TASK_XXXX'
-                }
-            
-            # Find status column
-            status_col = None
-            for col, header in enumerate(self.columns, 1):
-                if header == 'status':
-                    status_col = col
-                    break
-            
-            if not status_col:
-                return {
-                    'success': False,
-                    'error': 'Status column not found',
-                    'message': 'Worksheet format error'
-                }
-            
-            # Update status
-            status_cell = worksheet.cell(row=row_num, column=status_col)
-            status_cell.value = new_status
-            
-            # Apply formatting
-            self._format_status_cell(status_cell, new_status)
-            
-            # Update completed date if status is 'done'
-            if new_status == 'done':
-                completed_date_col = None
+            with self._workbook_lock:
+                worksheet = self._live_worksheet()
+                
+                # Parse task ID to get row number
+                try:
+                    row_num = int(task_id.split('_')[1])
+                except (IndexError, ValueError):
+                    return {
+                        'success': False,
+                        'error': f'Invalid task ID format: {task_id}',
+                        'message': 'Task ID must be in format TASK_XXXX'
+                    }
+                
+                # Find status column
+                status_col = None
                 for col, header in enumerate(self.columns, 1):
-                    if header == 'completed_date':
-                        completed_date_col = col
+                    if header == 'status':
+                        status_col = col
                         break
                 
-                if completed_date_col:
-                    completed_cell = worksheet.cell(row=row_num, column=completed_date_col)
-                    completed_cell.value = datetime.now().strftime('%Y-%m-%d')
+                if not status_col:
+                    return {
+                        'success': False,
+                        'error': 'Status column not found',
+                        'message': 'Worksheet format error'
+                    }
+                
+                # Update status
+                status_cell = worksheet.cell(row=row_num, column=status_col)
+                status_cell.value = new_status
+                
+                # Apply formatting
+                self._format_status_cell(status_cell, new_status)
+                
+                # Update completed date if status is 'done'
+                if new_status == 'done':
+                    completed_date_col = None
+                    for col, header in enumerate(self.columns, 1):
+                        if header == 'completed_date':
+                            completed_date_col = col
+                            break
+                    
+                    if completed_date_col:
+                        completed_cell = worksheet.cell(row=row_num, column=completed_date_col)
+                        completed_cell.value = datetime.now().strftime('%Y-%m-%d')
+                
+                # Save workbook
+                self._save_workbook()
             
-            # Save workbook
-            workbook.save(self.file_path)
-            workbook.close()
+            self._invalidate_tasks_cache()
             
             logger.info(f"Task {task_id} status updated to {new_status}")
             
@@ -405,6 +687,7 @@ class ExcelTaskManager:
             
         except Exception as e:
             logger.error(f"Error updating task status: {e}")
+            self._discard_workbook()
             return {
                 'success': False,
                 'error': str(e),
@@ -422,25 +705,26 @@ class ExcelTaskManager:
             Result of the operation
         """
         try:
-            workbook = openpyxl.load_workbook(self.file_path)
-            worksheet = workbook[self.sheet_name]
-            
-            # Parse task ID to get row number
-            try:
-                row_num = int(task_id.split('_')[1])
-            except (IndexError, ValueError):
-                return {
-                    'success': False,
-                    'error': f'Invalid task ID format: {task_id}',
-                    'message': 'Task ID must be in format TASK_XXXX'
-                }
-            
-            # Delete the row
-            worksheet.delete_rows(row_num)
+            with self._workbook_lock:
+                worksheet = self._live_worksheet()
+                
+                # Parse task ID to get row number
+                try:
+                    row_num = int(task_id.split('_')[1])
+                except (IndexError, ValueError):
+                    return {
+                        'success': False,
+                        'error': f'Invalid task ID format: {task_id}',
+                        'message': 'Task ID must be in format TASK_XXXX'
+                    }
+                
+                # Delete the row
+                worksheet.delete_rows(row_num)
+                
+                # Save workbook
+                self._save_workbook()
             
-            # Save workbook
-            workbook.save(self.file_path)
-            workbook.close()
+            self._invalidate_tasks_cache()
             
             logger.info(f"Task {task_id} deleted successfully")
             
@@ -452,6 +736,7 @@ class ExcelTaskManager:
             
         except Exception as e:
             logger.error(f"Error deleting task: {e}")
+            self._discard_workbook()
             return {
                 'success': False,
                 'error': str(e),
@@ -507,7 +792,17 @@ class ExcelTaskManager:
     
     def cleanup(self):
         """Clean up resources"""
-        # No specific cleanup needed for openpyxl
+        # Stop the writer once it has drained pending tasks
+        with self._write_lock:
+            write_q, self._write_q = self._write_q, None
+        if write_q is not None:
+            write_q.put(None)
+            write_q.join()
+        self._discard_workbook()
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
         logger.info("Excel task manager cleaned up")
 
 
@@ -546,11 +841,13 @@ if __name__ == "__main__":
         stats = manager.get_task_statistics()
         print(f"Task statistics: {stats}")
         
-        # Clean up test file
-        Path(test_file).unlink(missing_ok=True)
+        manager.cleanup()
         
     except Exception as e:
         print(f"Error during testing: {e}")
-        # Clean up test file on error
-        Path(test_file).unlink(missing_ok=True)
+    
+    finally:
+        # Clean up test file and its task journal
+        for path in Path(test_file).parent.glob(Path(test_file).stem + '.*'):
+            path.unlink(missing_ok=True)
 
@@ -28,7 +28,21 @@ except ImportError:
     print("Warning: openai not installed. Install with: pip install openai")
     openai_available = False
 
-from config import TASK_PARSING_PROMPT, TASK_VALIDATION_PROMPT, PRIORITY_MANAGEMENT_PROMPT, QUERY_RESPONSE_PROMPT
+try:
+    import httpx  # Installed with openai>=1.0.0
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    http2_available = True
+except ImportError:
+    http2_available = False
+
+from config import (
+    TASK_PARSING_PROMPT, TASK_VALIDATION_PROMPT, TASK_PARSE_AND_VALIDATE_PROMPT,
+    PRIORITY_MANAGEMENT_PROMPT, QUERY_RESPONSE_PROMPT
+)
 
 logger = logging.getLogger(__name__)
 
@@ -50,8 +64,10 @@ class OpenAIClient:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
         
         # Configure OpenAI client
+        self._http_client = None
         if openai_available:
-            self.client = openai.OpenAI(api_key=self.api_key)
+            self._http_client = self._make_http_client()
+            self.client = openai.OpenAI(api_key=self.api_key, http_client=self._http_client)
             self.connected = True
         else:
             self.client = None
@@ -59,10 +75,43 @@ class OpenAIClient:
         
         logger.info(f"OpenAI client initialized with model: {self.model}")
     
+    @staticmethod
+    def _make_http_client() -> Optional['httpx.Client']:
+        """
+        Build the long-lived HTTP client shared by every request
+        
+        Returns:
+            httpx.Client with keep-alive (and HTTP/2 when h2 is installed),
+            or None to let the openai package use its default client
+        """
+        if httpx is None:
+            return None
+        return httpx.Client(
+            http2=http2_available,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=10, keepalive_expiry=60.0)
+        )
+    
     def is_connected(self) -> bool:
         """Check if connected to OpenAI API"""
         return self.connected and self.client is not None
     
+    def warm_up(self, timeout: float = 5.0):
+        """
+        Open the HTTPS connection ahead of the first real request
+        
+        Args:
+            timeout: Seconds to wait for the API before giving up
+        """
+        if not self.is_connected():
+            return
+        try:
+            # Cheap metadata call; the kept-alive connection is reused by later requests
+            self.client.with_options(timeout=timeout).models.retrieve(self.model)
+            logger.info("OpenAI connection warmed up")
+        except Exception as e:
+            logger.warning(f"OpenAI warm-up failed: {e}")
+    
     def generate_response(self, prompt: str, system_prompt: str = None, temperature: float = 0.1) -> Dict[str, Any]:
         """
         Generate response from OpenAI
@@ -131,6 +180,9 @@ class OpenAIClient:
         """
         Parse user input to extract task information
         
+        Deprecated: prefer parse_and_validate(), which does this and
+        validate_task() in a single request.
+        
         Args:
             user_input: Raw user input text
             
@@ -198,6 +250,8 @@ class OpenAIClient:
         """
         Validate parsed task data
         
+        Deprecated: prefer parse_and_validate().
+        
         Args:
             task_data: Parsed task data to validate
             
@@ -238,6 +292,75 @@ class OpenAIClient:
                 'raw_response': result['response']
             }
     
+    def parse_and_validate(self, user_input: str) -> Dict[str, Any]:
+        """
+        Parse and validate user input in a single LLM call
+        
+        Args:
+            user_input: Raw user input text
+            
+        Returns:
+            Same shape as parse_task(), plus 'validation_result' on success
+        """
+        prompt = TASK_PARSE_AND_VALIDATE_PROMPT.format(user_input=user_input)
+        
+        logger.info("Parsing and validating task input with OpenAI")
+        result = self.generate_response(prompt)
+        
+        if not result['success']:
+            return result
+        
+        try:
+            response_text = result['response'].strip()
+            
+            # Remove markdown code blocks if present
+            if response_text.startswith('```json'):
+                response_text = response_text[7:]
+            if response_text.endswith('```'):
+                response_text = response_text[:-3]
+            
+            response_data = json.loads(response_text)
+            
+            # Check if it's an error response
+            if 'error' in response_data:
+                return {
+                    'success': False,
+                    'error': response_data['error'],
+                    'field': response_data.get('field', ''),
+                    'message': response_data.get('message', ''),
+                    'parsed_data': response_data
+                }
+            
+            parsed_data = response_data.get('parsed_data', {})
+            
+            # Validate required fields
+            required_fields = ['task', 'assigned_by', 'priority', 'expected_date']
+            missing_fields = [field for field in required_fields if field not in parsed_data]
+            
+            if missing_fields:
+                return {
+                    'success': False,
+                    'error': 'missing_fields',
+                    'missing_fields': missing_fields,
+                    'parsed_data': parsed_data
+                }
+            
+            return {
+                'success': True,
+                'parsed_data': parsed_data,
+                'validation_result': response_data.get('validation', {'valid': False, 'errors': ['No validation returned']}),
+                'model': result['model']
+            }
+            
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            return {
+                'success': False,
+                'error': 'json_parse_error',
+                'message': f"Failed to parse response: {e}",
+                'raw_response': result['response']
+            }
+    
     def manage_priorities(self, current_tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Get priority management suggestions
@@ -323,7 +446,9 @@ class OpenAIClient:
     
     def cleanup(self):
         """Clean up client resources"""
-        # No specific cleanup needed for OpenAI client
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
         logger.info("OpenAI client cleaned up")
 
 
@@ -368,6 +493,13 @@ class MockOpenAIClient:
             'model': self.model
         }
     
+    def parse_and_validate(self, user_input: str) -> Dict[str, Any]:
+        """Mock combined parsing and validation"""
+        result = self.parse_task(user_input)
+        if result['success']:
+            result['validation_result'] = {'valid': True}
+        return result
+    
     def answer_query(self, user_query: str, available_tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Mock query response"""
         if "next priority" in user_query.lower():
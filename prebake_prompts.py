@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Pre-generate the fixed voice prompts
+Fills the TTS disk cache so the startup message and other fixed prompts play without synthesis
+"""
+
+import sys
+
+from config import CACHED_PROMPTS
+from text_to_speech import TTSManager
+
+def prebake_prompts() -> bool:
+    """Synthesize every fixed prompt, sentence by sentence, into the TTS cache"""
+    print("🔧 Pre-generating voice prompts")
+    print("=" * 40)
+    
+    tts = TTSManager()
+    try:
+        if not tts.is_available():
+            print("❌ KittenTTS is not available")
+            return False
+        
+        failed = 0
+        for prompt in CACHED_PROMPTS:
+            # Same per-sentence split the app uses when speaking
+            for result in tts.stream(prompt):
+                if result['success']:
+                    print(f"✅ {result['text']}")
+                else:
+                    failed += 1
+                    print(f"❌ {result.get('text', prompt)}: {result.get('error', 'Unknown error')}")
+        
+        print(f"\n📁 Cache directory: {tts.cache_dir}")
+        return failed == 0
+        
+    finally:
+        tts.cleanup()
+
+if __name__ == "__main__":
+    sys.exit(0 if prebake_prompts() else 1)
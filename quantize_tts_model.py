@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Quantize the KittenTTS ONNX model to int8
+Writes a dynamically quantized copy of the model for TTS_CONFIG['onnx_model_path']
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from config import TTS_CONFIG, TEMP_DIR
+
+def quantize_model(output_file: Path) -> bool:
+    """Download the fp32 KittenTTS model and write an int8 copy"""
+    print("🔧 Quantizing KittenTTS model to int8")
+    print("=" * 40)
+    
+    try:
+        from huggingface_hub import hf_hub_download
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+    except ImportError as e:
+        print(f"❌ Missing dependency: {e}")
+        print("💡 Install KittenTTS first (it brings onnxruntime and huggingface_hub)")
+        return False
+    
+    try:
+        # The model repo's config.json names the ONNX file
+        repo_id = TTS_CONFIG['model']
+        with open(hf_hub_download(repo_id, "config.json"), encoding='utf-8') as f:
+            model_file = json.load(f)['model_file']
+        model_fp32 = hf_hub_download(repo_id, model_file)
+        print(f"📥 Source model: {model_fp32}")
+        
+        quantize_dynamic(model_fp32, str(output_file), weight_type=QuantType.QInt8)
+        
+        fp32_size = Path(model_fp32).stat().st_size
+        int8_size = output_file.stat().st_size
+        print(f"✅ Quantized model saved: {output_file}")
+        print(f"📊 Size: {fp32_size / 1e6:.1f} MB → {int8_size / 1e6:.1f} MB")
+        print("\n💡 To use it, set in config.py:")
+        print(f"   TTS_CONFIG['onnx_model_path'] = r'{output_file}'")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Quantization failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    output = Path(sys.argv[1]) if len(sys.argv) > 1 else TEMP_DIR.parent / 'kitten_tts_int8.onnx'
+    sys.exit(0 if quantize_model(output) else 1)
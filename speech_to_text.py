@@ -2,18 +2,23 @@
 Speech-to-Text module using Faster-Whisper for Voice-Activated Task Manager
 """
 
+import itertools
 import logging
+import math
+import queue
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 import time
 
+import numpy as np
+
 try:
     from faster_whisper import WhisperModel
 except ImportError:
     print("Warning: faster-whisper not installed. Install with: pip install faster-whisper")
     WhisperModel = None
 
-from config import STT_CONFIG
+from config import STT_CONFIG, AUDIO_CONFIG
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +36,8 @@ class SpeechToText:
         self.model_size = model_size or STT_CONFIG['model_size']
         self.device = device or STT_CONFIG['device']
         self.compute_type = STT_CONFIG['compute_type']
+        self.beam_size = STT_CONFIG['beam_size']
+        self.vad_filter = STT_CONFIG['vad_filter']
         self.language = STT_CONFIG['language']
         
         self.model = None
@@ -80,16 +87,135 @@ class SpeechToText:
                 'confidence': 0.0
             }
         
+        logger.info(f"Transcribing audio file: {audio_file}")
+        return self._transcribe(audio_file)
+    
+    def transcribe_stream(self, frames_queue: queue.Queue, partials: Optional[queue.Queue] = None) -> Dict[str, Any]:
+        """
+        Transcribe audio as it is being recorded
+        
+        Consumes raw Int16 PCM chunks (at the recorder's sample rate) until a
+        None sentinel arrives, then transcribes the in-memory audio directly,
+        skipping the WAV write/read round trip.
+        
+        Args:
+            frames_queue: Queue of PCM byte chunks, ended by None; an empty
+                chunk marks a pause in speech
+            partials: If given, receives the transcript of everything heard so
+                far at each pause, then None once recording has ended
+            
+        Returns:
+            Dictionary containing transcription results
+        """
+        # Collect chunks as they are captured; the sentinel arrives when recording stops
+        chunks = []
+        # Decode of the audio up to the last pause, kept while only silence follows it
+        pause_result = None
+        try:
+            for data in iter(frames_queue.get, None):
+                if data:
+                    chunk = np.frombuffer(data, dtype=np.int16)
+                    chunks.append(chunk)
+                    if pause_result is not None and not self._is_silent(chunk):
+                        pause_result = None
+                elif partials is not None and chunks and self.model:
+                    partial = self._transcribe(self._to_float(chunks))
+                    pause_result = partial if partial['success'] else None
+                    if partial['success'] and partial['text']:
+                        partials.put(partial['text'])
+        finally:
+            if partials is not None:
+                partials.put(None)
+        
+        # Recording ended on the closing silence: the pause decode already has
+        # every word, so don't queue a second full decode behind it
+        if pause_result is not None:
+            logger.info("Only silence since the last pause, reusing its transcript")
+            return pause_result
+        
+        if not self.model:
+            return {
+                'success': False,
+                'error': 'Whisper model not loaded',
+                'text': '',
+                'confidence': 0.0
+            }
+        
+        if not chunks:
+            return {
+                'success': False,
+                'error': 'No audio recorded',
+                'text': '',
+                'confidence': 0.0
+            }
+        
+        audio = self._to_float(chunks)
+        logger.info(f"Transcribing {len(audio) / AUDIO_CONFIG['sample_rate']:.1f}s of streamed audio")
+        return self._transcribe(audio)
+    
+    def transcribe_pcm(self, pcm: np.ndarray, sample_rate: int = AUDIO_CONFIG['sample_rate']) -> Dict[str, Any]:
+        """
+        Transcribe an in-memory recording
+        
+        Args:
+            pcm: Int16 PCM samples, e.g. from AudioRecorder.get_pcm()
+            sample_rate: Sample rate of pcm (Whisper expects 16 kHz)
+            
+        Returns:
+            Dictionary containing transcription results
+        """
+        if not self.model:
+            return {
+                'success': False,
+                'error': 'Whisper model not loaded',
+                'text': '',
+                'confidence': 0.0
+            }
+        
+        if sample_rate != 16000:
+            return {
+                'success': False,
+                'error': f'Unsupported sample rate: {sample_rate} (expected 16000)',
+                'text': '',
+                'confidence': 0.0
+            }
+        
+        if pcm.size == 0:
+            return {
+                'success': False,
+                'error': 'No audio recorded',
+                'text': '',
+                'confidence': 0.0
+            }
+        
+        return self._transcribe(self._to_float([pcm]))
+    
+    @staticmethod
+    def _is_silent(chunk: np.ndarray) -> bool:
+        """Whether an Int16 PCM chunk is below the silence threshold (same RMS test as the recorder)"""
+        samples = chunk.astype(np.float32)
+        rms = math.sqrt(float(np.dot(samples, samples)) / samples.size)
+        return rms / 32768.0 < AUDIO_CONFIG['silence_threshold']
+    
+    @staticmethod
+    def _to_float(chunks: List[np.ndarray]) -> np.ndarray:
+        """Join Int16 PCM chunks into the float32 samples Whisper expects"""
+        audio = np.concatenate(chunks).astype(np.float32)
+        audio *= 1.0 / 32768.0
+        return audio
+    
+    def _transcribe(self, audio: Union[str, np.ndarray]) -> Dict[str, Any]:
+        """Run the model on a file path or 16 kHz float32 samples and build the result"""
         try:
-            logger.info(f"Transcribing audio file: {audio_file}")
             start_time = time.time()
             
             # Transcribe audio
             segments, info = self.model.transcribe(
-                audio_file,
+                audio,
                 language=self.language,
-                beam_size=5,
-                best_of=5
+                beam_size=self.beam_size,
+                best_of=5,
+                vad_filter=self.vad_filter
             )
             
             # Collect all segments
@@ -135,6 +261,27 @@ class SpeechToText:
                 'confidence': 0.0
             }
     
+    def warm_up(self):
+        """Run one transcription of silence so the first real request doesn't pay start-up cost"""
+        if not self.model:
+            return
+        start_time = time.time()
+        self._transcribe(np.zeros(AUDIO_CONFIG['sample_rate'], dtype=np.float32))
+        logger.info(f"Whisper model warmed up in {time.time() - start_time:.2f}s")
+    
+    def transcribe_batch(self, audio_files: List[str]) -> List[Dict[str, Any]]:
+        """
+        Transcribe several audio files with the already-loaded model
+        
+        Args:
+            audio_files: Paths to the audio files
+            
+        Returns:
+            List of transcription results in input order
+        """
+        logger.info(f"Transcribing batch of {len(audio_files)} audio files")
+        return [self.transcribe_audio(audio_file) for audio_file in audio_files]
+    
     def transcribe_with_timestamps(self, audio_file: str) -> Dict[str, Any]:
         """
         Transcribe audio with detailed timestamps
@@ -243,13 +390,15 @@ class MockSTT:
             "mark task number 3 as completed",
             "show me all urgent tasks"
         ]
-        self.current_response = 0
+        # Round-robin over the canned responses
+        self._responses = itertools.cycle(self.mock_responses)
     
     def transcribe_audio(self, audio_file: str) -> Dict[str, Any]:
         """Return mock transcription"""
-        response = self.mock_responses[self.current_response % len(self.mock_responses)]
-        self.current_response += 1
-        
+        return self._mock_result(next(self._responses))
+    
+    def _mock_result(self, response: str) -> Dict[str, Any]:
+        """Build a mock transcription result for the given text"""
         return {
             'success': True,
             'text': response,
@@ -260,6 +409,23 @@ class MockSTT:
             'segment_count': 1
         }
     
+    def transcribe_stream(self, frames_queue: queue.Queue, partials: Optional[queue.Queue] = None) -> Dict[str, Any]:
+        """Drain the recorder's frames and return a mock transcription"""
+        for _ in iter(frames_queue.get, None):
+            pass
+        if partials is not None:
+            partials.put(None)
+        return self._mock_result(next(self._responses))
+    
+    def transcribe_pcm(self, pcm: np.ndarray, sample_rate: int = AUDIO_CONFIG['sample_rate']) -> Dict[str, Any]:
+        """Return mock transcription for an in-memory recording"""
+        return self._mock_result(next(self._responses))
+    
+    def transcribe_batch(self, audio_files: List[str]) -> List[Dict[str, Any]]:
+        """Return mock transcriptions for several files"""
+        return [self._mock_result(response)
+                for response in itertools.islice(self._responses, len(audio_files))]
+    
     def is_available(self) -> bool:
         return True
     
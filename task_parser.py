@@ -0,0 +1,98 @@
+"""
+Deterministic task parser for Voice-Activated Task Manager
+
+Handles fully specified commands such as "Add a high priority task from
+Sunny to build the dashboard by Friday" without an LLM round-trip.
+Anything it doesn't recognise is left to OpenAIClient.parse_and_validate().
+"""
+
+import logging
+import re
+from datetime import date, timedelta
+from typing import Dict, Any, Optional
+
+from config import EXCEL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_PRIORITIES = '|'.join(EXCEL_CONFIG['priority_levels'])
+
+_WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+class FastTaskParser:
+    """Regex-based parser for the common, fully specified task phrasing"""
+    
+    TASK_PATTERN = re.compile(
+        r'^(?:add|create)\s+(?:an?\s+)?'
+        r'(?P<priority>' + _PRIORITIES + r')\s+(?:priority\s+)?task\s+'
+        r'(?:from|assigned by)\s+(?P<assigned_by>.+?)\s+to\s+'
+        r'(?P<task>.+?)\s+(?:by|due(?:\s+on)?)\s+(?P<due>.+)$',
+        re.IGNORECASE
+    )
+    
+    ISO_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+    
+    def parse(self, text: str, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """
+        Parse a transcribed command
+        
+        Args:
+            text: Transcribed user input
+            today: Reference date for relative due dates (defaults to today)
+        
+        Returns:
+            Same shape as OpenAIClient.parse_and_validate() on success,
+            or None when the text needs the LLM
+        """
+        match = self.TASK_PATTERN.match(text.strip().rstrip('.!?'))
+        if not match:
+            return None
+        
+        expected_date = self._parse_due_date(match.group('due'), today or date.today())
+        if expected_date is None:
+            return None
+        
+        parsed_data = {
+            'task': match.group('task').strip(),
+            'assigned_by': match.group('assigned_by').strip(),
+            'priority': match.group('priority').lower(),
+            'expected_date': expected_date.isoformat(),
+            'notes': ''
+        }
+        logger.info("Task parsed without OpenAI: %s", parsed_data['task'])
+        
+        return {
+            'success': True,
+            'parsed_data': parsed_data,
+            'validation_result': {'valid': True, 'errors': []},
+            'model': 'fast-path'
+        }
+    
+    def _parse_due_date(self, due: str, today: date) -> Optional[date]:
+        """
+        Resolve 'today', 'tomorrow', '<weekday>' or an ISO date
+        
+        Returns None for anything else, including dates before today (the
+        LLM path rejects those) and "next <weekday>", whose meaning varies
+        between speakers.
+        """
+        due = due.strip().lower()
+        
+        if due == 'today':
+            return today
+        if due == 'tomorrow':
+            return today + timedelta(days=1)
+        
+        if due in _WEEKDAYS:
+            # Always a future day: "friday" said on a Friday means next week
+            days_ahead = (_WEEKDAYS.index(due) - today.weekday() - 1) % 7 + 1
+            return today + timedelta(days=days_ahead)
+        
+        if self.ISO_DATE_PATTERN.match(due):
+            try:
+                expected_date = date.fromisoformat(due)
+            except ValueError:
+                return None
+            return expected_date if expected_date >= today else None
+        
+        return None
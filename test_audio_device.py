@@ -43,8 +43,12 @@ def test_audio_devices():
         duration = 1.0
         frequency = 440  # A4 note
         
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        test_audio = np.sin(2 * np.pi * frequency * t) * 0.3
+        # Build the tone directly in a single float32 buffer (no float64 temporaries)
+        n_samples = int(sample_rate * duration)
+        test_audio = np.arange(n_samples, dtype=np.float32)
+        test_audio *= np.float32(2 * np.pi * frequency / sample_rate)
+        np.sin(test_audio, out=test_audio)
+        test_audio *= np.float32(0.3)
         
         # Save test audio
         test_file = "test_audio.wav"
@@ -71,7 +75,7 @@ def test_audio_devices():
                 print(f"  📊 Playing 1-second beep at {frequency}Hz...")
                 
                 # Play the audio
-                stream.write(test_audio.astype(np.float32).tobytes())
+                stream.write(test_audio.tobytes())
                 time.sleep(1.1)  # Wait for audio to finish
                 
                 stream.stop_stream()
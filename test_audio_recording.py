@@ -24,7 +24,7 @@ def test_audio_recording():
     try:
         print("\n🎤 Starting voice recording test...")
         print("📝 Speak something, then stay quiet for 1 second to stop recording")
-        print("⏹️  Recording will stop automatically after 1 second of silence")
+        print("⏹️  Recording will stop automatically after a short silence")
         print("⏱️  Or press Ctrl+C to stop manually")
         
         # Start recording (no duration - will use silence detection)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the test scripts
+"""
+
+import atexit
+import functools
+import traceback
+from contextlib import contextmanager
+
+
+@contextmanager
+def test_section(name: str):
+    """
+    Run a block of a test script, reporting (not raising) any failure
+    
+    Args:
+        name: Label used in the failure message
+    """
+    try:
+        yield
+    except Exception as e:
+        print(f"❌ {name} failed: {e}")
+        traceback.print_exc()
+
+# Not a test itself (keeps pytest from collecting it)
+test_section.__test__ = False
+
+
+@functools.lru_cache(maxsize=1)
+def shared_player() -> 'AudioPlayer':
+    """
+    Get the process-wide AudioPlayer
+
+    Device enumeration and PortAudio setup happen once; the player is
+    cleaned up automatically when the interpreter exits.
+    """
+    from audio_recorder import AudioPlayer
+    
+    player = AudioPlayer()
+    atexit.register(player.cleanup)
+    return player
@@ -5,6 +5,10 @@ Tests the new TTS implementation without Hugging Face dependencies
 """
 
 import logging
+import os
+import queue
+import sys
+import threading
 import time
 from pathlib import Path
 
@@ -14,6 +18,27 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+TEMP_DIR = Path.home() / '.voice_task_manager' / 'temp'
+# Generated file paths, one per line, so playback can find the newest in O(1)
+MANIFEST_FILE = TEMP_DIR / '.manifest'
+
+def _append_to_manifest(output_file: str):
+    """Record a generated file at the end of the manifest"""
+    with open(MANIFEST_FILE, 'a', encoding='utf-8') as f:
+        f.write(f"{output_file}\n")
+
+def _last_manifest_entry():
+    """Return the most recently recorded file, reading only the manifest tail"""
+    try:
+        with open(MANIFEST_FILE, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 4096))
+            tail = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+    return tail[-1].decode('utf-8') if tail else None
+
 def test_pyttsx3_tts():
     """Test the PyTTSX3 TTS system"""
     print("🎤 Testing PyTTSX3 TTS System")
@@ -40,8 +65,8 @@ def test_pyttsx3_tts():
         voices = tts.list_voices()
         if voices:
             print(f"Found {len(voices)} available voices:")
-            for i, voice in enumerate(voices):
-                print(f"  {i+1}. {voice['name']} ({voice.get('gender', 'unknown')})")
+            lines = [f"  {i}. {v['name']} ({v.get('gender', 'unknown')})" for i, v in enumerate(voices, 1)]
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("⚠️  No voices found or voice listing not supported")
         
@@ -53,26 +78,31 @@ def test_pyttsx3_tts():
             "Press the hotkey to add a new task."
         ]
         
-        for i, text in enumerate(test_texts, 1):
-            print(f"\n  Generating speech {i}/{len(test_texts)}: '{text[:50]}...'")
-            
-            start_time = time.time()
-            result = tts.generate_speech(text)
-            generation_time = time.time() - start_time
+        print(f"\n  Generating speech for {len(test_texts)} texts in one batch...")
+        t0 = time.perf_counter_ns()
+        results = tts.generate_speech_batch(test_texts)
+        generation_time = (time.perf_counter_ns() - t0) / 1e9
+        print(f"  📊 Batch time: {generation_time:.2f}s")
+        
+        # Collect the report and write it in one go
+        lines = []
+        for i, (text, result) in enumerate(zip(test_texts, results), 1):
+            lines.append(f"\n  Speech {i}/{len(test_texts)}: '{text[:50]}...'")
             
             if result['success']:
-                print(f"    ✅ Success: {result['output_file']}")
-                print(f"    📊 Duration: {result['audio_duration']:.1f}s, Time: {generation_time:.2f}s")
+                lines.append(f"    ✅ Success: {result['output_file']}")
+                lines.append(f"    📊 Duration: {result['audio_duration']:.1f}s")
+                _append_to_manifest(result['output_file'])
                 
-                # Check if file exists and has content
-                file_path = Path(result['output_file'])
-                if file_path.exists():
-                    file_size = file_path.stat().st_size
-                    print(f"    📁 File size: {file_size} bytes")
-                else:
-                    print(f"    ⚠️  File not found: {result['output_file']}")
+                # Check if file exists and has content (single stat call)
+                try:
+                    file_size = os.stat(result['output_file']).st_size
+                    lines.append(f"    📁 File size: {file_size} bytes")
+                except FileNotFoundError:
+                    lines.append(f"    ⚠️  File not found: {result['output_file']}")
             else:
-                print(f"    ❌ Failed: {result.get('error')}")
+                lines.append(f"    ❌ Failed: {result.get('error')}")
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # Test 4: Voice selection (if multiple voices available)
         if len(voices) > 1:
@@ -107,32 +137,82 @@ def test_audio_playback():
     print("=" * 30)
     
     try:
-        from audio_recorder import AudioPlayer
-        
-        # Find the most recent TTS file
-        temp_dir = Path.home() / '.voice_task_manager' / 'temp'
-        if temp_dir.exists():
-            tts_files = list(temp_dir.glob("pyttsx3_tts_*.wav"))
-            if tts_files:
-                # Get the most recent file
-                latest_file = max(tts_files, key=lambda x: x.stat().st_mtime)
-                print(f"🎵 Found TTS file: {latest_file.name}")
-                
-                # Test playback
-                print("🔊 Testing audio playback...")
-                player = AudioPlayer()
-                player.play_audio(str(latest_file))
-                
-                print("✅ Audio playback test completed")
-                player.cleanup()
-            else:
-                print("⚠️  No TTS files found to test playback")
+        from test_helpers import shared_player
+        
+        # Find the most recent TTS file from the generation manifest
+        latest_file = _last_manifest_entry()
+        if latest_file:
+            print(f"🎵 Found TTS file: {Path(latest_file).name}")
+            
+            # Test playback
+            print("🔊 Testing audio playback...")
+            t0 = time.perf_counter_ns()
+            shared_player().play_audio_mmap(latest_file)
+            playback_time = (time.perf_counter_ns() - t0) / 1e9
+            
+            print(f"✅ Audio playback test completed ({playback_time:.2f}s)")
         else:
-            print("⚠️  Temp directory not found")
+            print("⚠️  No TTS files found to test playback")
             
     except Exception as e:
         print(f"❌ Audio playback test failed: {e}")
 
+def test_streaming_playback():
+    """Test sentence-by-sentence synthesis overlapped with playback"""
+    print("\n🌊 Testing Streaming Playback")
+    print("=" * 30)
+    
+    try:
+        from text_to_speech_pyttsx3 import TextToSpeech
+        from test_helpers import shared_player
+        
+        tts = TextToSpeech()
+        if not tts.is_available():
+            print("⚠️  TTS system is not available")
+            return
+        
+        text = ("Hello! This is a test of streaming playback. "
+                "The first sentence plays while the next one is generated. "
+                "Press the hotkey to add a new task.")
+        
+        player = shared_player()
+        chunks = queue.Queue(maxsize=2)
+        
+        def consume():
+            while True:
+                output_file = chunks.get()
+                if output_file is None:
+                    break
+                player.play_audio_mmap(output_file)
+        
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        
+        t0 = time.perf_counter_ns()
+        first_audio_time = None
+        try:
+            for i, result in enumerate(tts.generate_speech_stream(text), 1):
+                if result['success']:
+                    if first_audio_time is None:
+                        first_audio_time = (time.perf_counter_ns() - t0) / 1e9
+                    print(f"  ✅ Sentence {i} ready: {result['output_file']}")
+                    chunks.put(result['output_file'])
+                else:
+                    print(f"  ❌ Sentence {i} failed: {result.get('error')}")
+        finally:
+            chunks.put(None)
+            consumer.join()
+        total_time = (time.perf_counter_ns() - t0) / 1e9
+        
+        if first_audio_time is not None:
+            print(f"📊 First audio after {first_audio_time:.2f}s, total {total_time:.2f}s")
+        print("✅ Streaming playback test completed")
+        
+        tts.cleanup()
+        
+    except Exception as e:
+        print(f"❌ Streaming playback test failed: {e}")
+
 if __name__ == "__main__":
     # Test the TTS system
     test_pyttsx3_tts()
@@ -140,5 +220,8 @@ if __name__ == "__main__":
     # Test audio playback
     test_audio_playback()
     
+    # Test streaming playback
+    test_streaming_playback()
+    
     print("\n🚀 PyTTSX3 TTS testing completed!")
     print("💡 If all tests pass, you can now use the new TTS system without Hugging Face dependencies!")
@@ -5,7 +5,19 @@ Simple hotkey test script
 
 import time
 import platform
-from config import HOTKEY_COMBO
+from config import current_hotkey
+
+try:
+    from pynput import keyboard
+    # Modifier names -> pynput keys; anything else (e.g. 'cmd', 'v') stays a string
+    _KEY_MAP = {
+        'ctrl': keyboard.Key.ctrl,
+        'control': keyboard.Key.ctrl,
+        'shift': keyboard.Key.shift,
+        'alt': keyboard.Key.alt,
+    }
+except ImportError:
+    keyboard = None
 
 def test_hotkey():
     """Test hotkey functionality"""
@@ -14,29 +26,17 @@ def test_hotkey():
     print("="*50)
     
     try:
-        from pynput import keyboard
+        if keyboard is None:
+            raise ImportError("pynput not available")
         
         # Get hotkey for current OS
-        os_name = platform.system().lower()
-        hotkey_combo = HOTKEY_COMBO.get(os_name, HOTKEY_COMBO['windows'])
+        hotkey_combo = current_hotkey()
         
         print(f"OS: {platform.system()}")
         print(f"Hotkey combo: {hotkey_combo}")
         
         # Convert string keys to Key objects for pynput
-        key_objects = []
-        for key_str in hotkey_combo:
-            if key_str.lower() in ['ctrl', 'control']:
-                key_objects.append(keyboard.Key.ctrl)
-            elif key_str.lower() in ['shift']:
-                key_objects.append(keyboard.Key.shift)
-            elif key_str.lower() in ['alt']:
-                key_objects.append(keyboard.Key.alt)
-            elif key_str.lower() in ['cmd', 'command']:
-                key_objects.append(key_str)  # Keep as string for macOS
-            else:
-                # Single character key
-                key_objects.append(key_str)
+        key_objects = [_KEY_MAP.get(key_str.lower(), key_str) for key_str in hotkey_combo]
         
         print(f"Key objects: {key_objects}")
         
@@ -5,6 +5,7 @@ Test script to verify STT fallback mechanism
 
 import logging
 from speech_to_text import SpeechToText, MockSTT
+from test_helpers import test_section
 
 # Configure logging
 logging.basicConfig(
@@ -18,7 +19,7 @@ def test_stt_fallback():
     print("STT Fallback Test")
     print("="*50)
     
-    try:
+    with test_section("Test"):
         # Test 1: Try to create real STT
         print("\n🔤 Test 1: Creating Real STT...")
         try:
@@ -54,18 +55,13 @@ def test_stt_fallback():
         
         # Test 4: Test multiple transcriptions
         print("\n🔄 Test 4: Testing Multiple MockSTT Calls...")
-        for i in range(3):
-            result = mock_stt.transcribe_audio("fake_audio.wav")
-            print(f"Call {i+1}: '{result['text']}'")
+        results = mock_stt.transcribe_batch(["fake_audio.wav"] * 3)
+        for i, result in enumerate(results, 1):
+            print(f"Call {i}: '{result['text']}'")
         
         # Cleanup
         mock_stt.cleanup()
         print("\n🧹 MockSTT cleanup completed")
-        
-    except Exception as e:
-        print(f"❌ Test failed with error: {e}")
-        import traceback
-        traceback.print_exc()
 
 if __name__ == "__main__":
     test_stt_fallback()
@@ -2,10 +2,17 @@
 Test script for Voice-Activated Task Manager
 """
 
+import asyncio
+import functools
+import importlib
 import logging
 import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Tuple
+from uuid import uuid4
 
 # Configure logging
 logging.basicConfig(
@@ -15,209 +22,248 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def test_components():
-    """Test all system components"""
-    logger.info("="*50)
-    logger.info("Testing Voice Task Manager Components")
-    logger.info("="*50)
-    
-    # Test 1: Configuration
-    logger.info("\n1. Testing Configuration...")
-    try:
-        from config import HOTKEY_COMBO, AUDIO_CONFIG, STT_CONFIG, TTS_CONFIG, EXCEL_CONFIG
-        logger.info("✓ Configuration loaded successfully")
-        logger.info(f"  - Hotkey: {HOTKEY_COMBO}")
-        logger.info(f"  - Audio config: {AUDIO_CONFIG}")
-        logger.info(f"  - STT config: {STT_CONFIG}")
-        logger.info(f"  - TTS config: {TTS_CONFIG}")
-        logger.info(f"  - Excel config: {EXCEL_CONFIG}")
-    except Exception as e:
-        logger.error(f"✗ Configuration test failed: {e}")
-        return False
-    
-    # Test 2: Audio Recorder
-    logger.info("\n2. Testing Audio Recorder...")
-    try:
-        from audio_recorder import AudioRecorder, AudioPlayer
-        recorder = AudioRecorder()
-        player = AudioPlayer()
-        logger.info("✓ Audio components initialized successfully")
-        recorder.cleanup()
-        player.cleanup()
-    except Exception as e:
-        logger.error(f"✗ Audio recorder test failed: {e}")
-        return False
-    
-    # Test 3: Speech-to-Text
-    logger.info("\n3. Testing Speech-to-Text...")
+@functools.lru_cache(maxsize=None)
+def _get(module_name: str):
+    """Import a project module once and reuse it across tests"""
+    return importlib.import_module(module_name)
+
+# Scratch directory for test workbooks: RAM-backed /dev/shm when available
+SCRATCH_DIR = Path("/dev/shm") if Path("/dev/shm").is_dir() else Path(tempfile.gettempdir())
+
+def _scratch_file(prefix: str) -> str:
+    """Return a unique scratch workbook path"""
+    return str(SCRATCH_DIR / f"{prefix}_{uuid4().hex}.xlsx")
+
+def _test_configuration():
+    """Test 1: Configuration"""
+    config = _get("config")
+    logger.info("✓ Configuration loaded successfully")
+    logger.info(f"  - Hotkey: {config.HOTKEY_COMBO}")
+    logger.info(f"  - Current hotkey: {'+'.join(config.current_hotkey())}")
+    logger.info(f"  - Audio config: {config.AUDIO_CONFIG}")
+    logger.info(f"  - STT config: {config.STT_CONFIG}")
+    logger.info(f"  - TTS config: {config.TTS_CONFIG}")
+    logger.info(f"  - Excel config: {config.EXCEL_CONFIG}")
+    return "configuration loaded"
+
+def _test_audio_recorder():
+    """Test 2: Audio Recorder"""
+    audio_recorder = _get("audio_recorder")
+    recorder = audio_recorder.AudioRecorder()
+    player = audio_recorder.AudioPlayer()
+    logger.info("✓ Audio components initialized successfully")
+    recorder.cleanup()
+    player.cleanup()
+    return "audio components initialized"
+
+def _test_speech_to_text():
+    """Test 3: Speech-to-Text"""
+    speech_to_text = _get("speech_to_text")
+    # Try real STT first, fallback to mock
     try:
-        from speech_to_text import SpeechToText, MockSTT
-        # Try real STT first, fallback to mock
-        try:
-            stt = SpeechToText()
-            if stt.is_available():
-                logger.info("✓ Real STT (Faster-Whisper) initialized successfully")
-            else:
-                logger.info("✓ Mock STT initialized successfully")
-        except:
-            stt = MockSTT()
+        stt = speech_to_text.SpeechToText()
+        if stt.is_available():
+            logger.info("✓ Real STT (Faster-Whisper) initialized successfully")
+        else:
             logger.info("✓ Mock STT initialized successfully")
-        
-        # Test transcription
-        result = stt.transcribe_audio("nonexistent_file.wav")
-        logger.info(f"  - STT test result: {result['success']}")
-        stt.cleanup()
-    except Exception as e:
-        logger.error(f"✗ STT test failed: {e}")
-        return False
+    except:
+        stt = speech_to_text.MockSTT()
+        logger.info("✓ Mock STT initialized successfully")
     
-    # Test 4: Text-to-Speech
-    logger.info("\n4. Testing Text-to-Speech...")
+    # Test transcription
+    result = stt.transcribe_audio("nonexistent_file.wav")
+    logger.info(f"  - STT test result: {result['success']}")
+    stt.cleanup()
+    return f"transcription success={result['success']}"
+
+def _test_text_to_speech():
+    """Test 4: Text-to-Speech"""
+    text_to_speech = _get("text_to_speech")
+    # Try real TTS first, fallback to mock
     try:
-        from text_to_speech import TextToSpeech, MockTTS, TTSManager
-        # Try real TTS first, fallback to mock
-        try:
-            tts = TTSManager()
-            if tts.tts.is_available():
-                logger.info("✓ Real TTS (KittenTTS) initialized successfully")
-            else:
-                logger.info("✓ Mock TTS initialized successfully")
-        except:
-            tts = MockTTS()
+        tts = text_to_speech.TTSManager()
+        if tts.tts.is_available():
+            logger.info("✓ Real TTS (KittenTTS) initialized successfully")
+        else:
             logger.info("✓ Mock TTS initialized successfully")
-        
-        # Test speech generation
-        result = tts.generate_speech("Test message")
-        logger.info(f"  - TTS test result: {result['success']}")
-        tts.cleanup()
-    except Exception as e:
-        logger.error(f"✗ TTS test failed: {e}")
-        return False
+    except:
+        tts = text_to_speech.MockTTS()
+        logger.info("✓ Mock TTS initialized successfully")
     
-    # Test 5: OpenAI Client
-    logger.info("\n5. Testing OpenAI Client...")
+    # Test speech generation
+    result = tts.generate_speech("Test message")
+    logger.info(f"  - TTS test result: {result['success']}")
+    tts.cleanup()
+    return f"speech generation success={result['success']}"
+
+def _test_openai_client():
+    """Test 5: OpenAI Client"""
+    openai_client = _get("openai_client")
+    # Try real OpenAI first, fallback to mock
     try:
-        from openai_client import OpenAIClient, MockOpenAIClient
-        # Try real OpenAI first, fallback to mock
-        try:
-            client = OpenAIClient()
-            if client.is_connected():
-                logger.info("✓ Real OpenAI client initialized successfully")
-            else:
-                logger.info("✓ Mock OpenAI client initialized successfully")
-        except:
-            client = MockOpenAIClient()
+        client = openai_client.OpenAIClient()
+        if client.is_connected():
+            logger.info("✓ Real OpenAI client initialized successfully")
+        else:
             logger.info("✓ Mock OpenAI client initialized successfully")
-        
-        # Test task parsing
-        test_input = "please add a high priority task build a dashboard project given by sunny expected completed date 4 july"
-        result = client.parse_task(test_input)
-        logger.info(f"  - Task parsing test result: {result['success']}")
-        client.cleanup()
-    except Exception as e:
-        logger.error(f"✗ OpenAI client test failed: {e}")
-        return False
+    except:
+        client = openai_client.MockOpenAIClient()
+        logger.info("✓ Mock OpenAI client initialized successfully")
+    
+    # Test task parsing
+    test_input = "please add a high priority task build a dashboard project given by sunny expected completed date 4 july"
+    result = client.parse_task(test_input)
+    logger.info(f"  - Task parsing test result: {result['success']}")
+    client.cleanup()
+    return f"task parsing success={result['success']}"
+
+def _test_excel_manager(manager):
+    """Test 6: Excel Manager"""
+    logger.info("✓ Excel manager initialized successfully")
+    
+    # Test adding a task
+    test_task = {
+        'task': 'Test dashboard project',
+        'assigned_by': 'Test User',
+        'priority': 'high',
+        'expected_date': '2024-07-04',
+        'notes': 'This is a test task'
+    }
     
-    # Test 6: Excel Manager
-    logger.info("\n6. Testing Excel Manager...")
+    result = manager.add_task(test_task)
+    logger.info(f"  - Task addition test result: {result['success']}")
+    
+    # Test getting tasks
+    tasks = manager.get_all_tasks()
+    logger.info(f"  - Retrieved {len(tasks)} tasks")
+    return f"retrieved {len(tasks)} tasks"
+
+def _test_integration(excel):
+    """Test 7: Component Integration"""
+    # Test the complete workflow (modules already loaded by earlier tests)
+    client = _get("openai_client").MockOpenAIClient()
+    tts = _get("text_to_speech").MockTTS()
+    
+    # Simulate voice input processing
+    test_input = "please add a high priority task build a dashboard project given by sunny expected completed date 4 july"
+    
+    # Parse task
+    parse_result = client.parse_task(test_input)
+    if not parse_result['success']:
+        raise Exception("Task parsing failed")
+    
+    # Add to Excel
+    add_result = excel.add_task(parse_result['parsed_data'])
+    if not add_result['success']:
+        raise Exception("Task addition failed")
+    
+    # Generate confirmation
+    confirmation = f"Task added successfully! Your {parse_result['parsed_data']['priority']} priority task has been recorded."
+    tts_result = tts.generate_speech(confirmation)
+    
+    logger.info("✓ Integration test completed successfully")
+    logger.info(f"  - Task parsed: {parse_result['success']}")
+    logger.info(f"  - Task added: {add_result['success']}")
+    logger.info(f"  - TTS generated: {tts_result['success']}")
+    
+    # Clean up
+    client.cleanup()
+    tts.cleanup()
+    return "workflow completed"
+
+# Independent component tests; these have no data dependencies on each other
+COMPONENT_TESTS = [
+    ("Configuration", _test_configuration),
+    ("Audio Recorder", _test_audio_recorder),
+    ("Speech-to-Text", _test_speech_to_text),
+    ("Text-to-Speech", _test_text_to_speech),
+    ("OpenAI Client", _test_openai_client),
+]
+
+def _run_test(name: str, test_func) -> Tuple[str, bool, str]:
+    """Run a single test and return (name, ok, detail)"""
+    logger.info(f"\nTesting {name}...")
     try:
-        from excel_manager import ExcelTaskManager
-        # Create a test file
-        test_file = "test_tasks.xlsx"
-        manager = ExcelTaskManager(test_file)
-        logger.info("✓ Excel manager initialized successfully")
-        
-        # Test adding a task
-        test_task = {
-            'task': 'Test dashboard project',
-            'assigned_by': 'Test User',
-            'priority': 'high',
-            'expected_date': '2024-07-04',
-            'notes': 'This is a test task'
-        }
-        
-        result = manager.add_task(test_task)
-        logger.info(f"  - Task addition test result: {result['success']}")
-        
-        # Test getting tasks
-        tasks = manager.get_all_tasks()
-        logger.info(f"  - Retrieved {len(tasks)} tasks")
-        
-        # Clean up test file
-        Path(test_file).unlink(missing_ok=True)
-        manager.cleanup()
+        return name, True, test_func()
     except Exception as e:
-        logger.error(f"✗ Excel manager test failed: {e}")
-        return False
+        logger.error(f"✗ {name} test failed: {e}")
+        return name, False, str(e)
+
+def test_components():
+    """Test all system components"""
+    logger.info("="*50)
+    logger.info("Testing Voice Task Manager Components")
+    logger.info("="*50)
     
-    # Test 7: Integration Test
-    logger.info("\n7. Testing Component Integration...")
+    # Tests 6 and 7 share one uniquely named workbook (created once) so
+    # concurrent runs don't collide
+    test_file = _scratch_file("test_tasks")
     try:
-        # Test the complete workflow
-        from openai_client import MockOpenAIClient
-        from excel_manager import ExcelTaskManager
-        from text_to_speech import MockTTS
-        
-        # Initialize components
-        client = MockOpenAIClient()
-        tts = MockTTS()
-        excel = ExcelTaskManager("integration_test.xlsx")
-        
-        # Simulate voice input processing
-        test_input = "please add a high priority task build a dashboard project given by sunny expected completed date 4 july"
-        
-        # Parse task
-        parse_result = client.parse_task(test_input)
-        if not parse_result['success']:
-            raise Exception("Task parsing failed")
-        
-        # Add to Excel
-        add_result = excel.add_task(parse_result['parsed_data'])
-        if not add_result['success']:
-            raise Exception("Task addition failed")
-        
-        # Generate confirmation
-        confirmation = f"Task added successfully! Your {parse_result['parsed_data']['priority']} priority task has been recorded."
-        tts_result = tts.generate_speech(confirmation)
+        try:
+            manager = _get("excel_manager").ExcelTaskManager(test_file)
+        except Exception as e:
+            logger.error(f"✗ Excel Manager test failed: {e}")
+            return False
         
-        logger.info("✓ Integration test completed successfully")
-        logger.info(f"  - Task parsed: {parse_result['success']}")
-        logger.info(f"  - Task added: {add_result['success']}")
-        logger.info(f"  - TTS generated: {tts_result['success']}")
+        # Tests 1-6 are independent, so run them concurrently to overlap model
+        # loading and file I/O; wall time becomes the slowest test, not the sum
+        tests = COMPONENT_TESTS + [("Excel Manager", functools.partial(_test_excel_manager, manager))]
+        all_ok = True
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(_run_test, name, func) for name, func in tests]
+            for future in as_completed(futures):
+                name, ok, detail = future.result()
+                logger.info(f"  {'✓' if ok else '✗'} {name}: {detail}")
+                all_ok &= ok
         
-        # Clean up
-        client.cleanup()
-        tts.cleanup()
-        excel.cleanup()
-        Path("integration_test.xlsx").unlink(missing_ok=True)
+        if not all_ok:
+            return False
         
-    except Exception as e:
-        logger.error(f"✗ Integration test failed: {e}")
-        return False
+        # Test 7 runs last since it exercises the components together
+        name, ok, detail = _run_test("Component Integration", functools.partial(_test_integration, manager))
+        manager.cleanup()
+        if not ok:
+            return False
+    finally:
+        # The workbook plus its task journal (and the journal's WAL files)
+        for path in SCRATCH_DIR.glob(Path(test_file).stem + '.*'):
+            path.unlink(missing_ok=True)
     
     logger.info("\n" + "="*50)
     logger.info("All component tests completed successfully!")
     logger.info("="*50)
     return True
 
-def test_voice_workflow():
-    """Test the complete voice workflow"""
+async def _voice_workflow_async():
+    """Test the voice workflow components running concurrently"""
     logger.info("\n" + "="*50)
     logger.info("Testing Complete Voice Workflow")
     logger.info("="*50)
     
     try:
-        # This would test the actual voice recording and processing
-        # For now, we'll just simulate the workflow
-        logger.info("✓ Voice workflow simulation completed")
-        logger.info("  - Hotkey detection: Ready")
-        logger.info("  - Audio recording: Ready")
-        logger.info("  - Speech-to-text: Ready")
-        logger.info("  - Task parsing: Ready")
-        logger.info("  - Excel integration: Ready")
-        logger.info("  - Text-to-speech: Ready")
+        # Mocks stand in for the microphone/model-backed components; each
+        # blocking call runs on the default executor so the stages overlap
+        stt = _get("speech_to_text").MockSTT()
+        client = _get("openai_client").MockOpenAIClient()
+        tts = _get("text_to_speech").MockTTS()
+        loop = asyncio.get_running_loop()
+        
+        test_input = "please add a high priority task build a dashboard project given by sunny expected completed date 4 july"
+        stt_result, parse_result, tts_result = await asyncio.gather(
+            loop.run_in_executor(None, stt.transcribe_audio, "fake_audio.wav"),
+            loop.run_in_executor(None, client.parse_task, test_input),
+            loop.run_in_executor(None, tts.generate_speech, "Task added successfully!"),
+        )
+        
+        logger.info("✓ Voice workflow completed")
+        logger.info(f"  - Speech-to-text: {stt_result['success']}")
+        logger.info(f"  - Task parsing: {parse_result['success']}")
+        logger.info(f"  - Text-to-speech: {tts_result['success']}")
         
-        return True
+        stt.cleanup()
+        client.cleanup()
+        tts.cleanup()
+        return all(r['success'] for r in (stt_result, parse_result, tts_result))
         
     except Exception as e:
         logger.error(f"✗ Voice workflow test failed: {e}")
@@ -233,7 +279,7 @@ def main():
         sys.exit(1)
     
     # Test voice workflow
-    if not test_voice_workflow():
+    if not asyncio.run(_voice_workflow_async()):
         logger.error("Voice workflow test failed. Please check the errors above.")
         sys.exit(1)
     
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the regex fast path for task parsing
+"""
+
+import sys
+from datetime import date
+
+from task_parser import FastTaskParser
+
+# A Wednesday, so weekday arithmetic crosses into the following week
+TODAY = date(2026, 10, 14)
+
+def _check(label: str, actual, expected) -> bool:
+    """Print a pass/fail line for one expectation"""
+    if actual == expected:
+        print(f"✅ {label}: {actual}")
+        return True
+    print(f"❌ {label}: expected {expected}, got {actual}")
+    return False
+
+def _due(parser: FastTaskParser, when: str):
+    """Expected date parsed from a full command ending in 'by <when>', or None"""
+    result = parser.parse(f"Add a high priority task from Sunny to build the dashboard by {when}", TODAY)
+    return result['parsed_data']['expected_date'] if result else None
+
+def run_checks() -> bool:
+    """
+    Check FastTaskParser matches, fallbacks and due dates
+    
+    Exceptions propagate, so a crashing parser fails the run as well.
+    
+    Returns:
+        True if every check passed
+    """
+    print("="*50)
+    print("Fast Task Parser Test")
+    print("="*50)
+    
+    parser = FastTaskParser()
+    results = []
+    
+    print("\n📝 Test 1: Fully specified command...")
+    result = parser.parse("Add a high priority task from Sunny to build the dashboard by Friday.", TODAY)
+    results.append(_check("success", bool(result and result['success']), True))
+    if result:
+        results.append(_check("parsed data", result['parsed_data'], {
+            'task': 'build the dashboard',
+            'assigned_by': 'Sunny',
+            'priority': 'high',
+            'expected_date': '2026-10-16',
+            'notes': ''
+        }))
+    
+    print("\n🔁 Test 2: Commands left to OpenAI...")
+    results.append(_check("missing fields", parser.parse("add task buy milk", TODAY), None))
+    results.append(_check("no priority", parser.parse("Add a task from Sunny to call Joe by Friday", TODAY), None))
+    results.append(_check("unknown due date", _due(parser, "the end of the month"), None))
+    results.append(_check("next weekday", _due(parser, "next Friday"), None))
+    
+    print("\n📅 Test 3: Due date resolution...")
+    results.append(_check("today", _due(parser, "today"), '2026-10-14'))
+    results.append(_check("tomorrow", _due(parser, "tomorrow"), '2026-10-15'))
+    results.append(_check("later this week", _due(parser, "Saturday"), '2026-10-17'))
+    results.append(_check("across the week boundary", _due(parser, "Monday"), '2026-10-19'))
+    results.append(_check("same weekday means next week", _due(parser, "Wednesday"), '2026-10-21'))
+    results.append(_check("future ISO date", _due(parser, "2026-12-01"), '2026-12-01'))
+    results.append(_check("past ISO date", _due(parser, "2020-01-01"), None))
+    results.append(_check("invalid ISO date", _due(parser, "2026-13-01"), None))
+    
+    print(f"\n{'🎉 All' if all(results) else '⚠️  Not all'} {len(results)} checks passed")
+    return all(results)
+
+def test_task_parser():
+    """pytest entry point"""
+    assert run_checks(), "FastTaskParser checks failed"
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
@@ -5,7 +5,7 @@ Simple TTS test script
 
 import logging
 from text_to_speech import TTSManager, MockTTS
-from audio_recorder import AudioPlayer
+from test_helpers import shared_player, test_section
 
 # Configure logging
 logging.basicConfig(
@@ -18,10 +18,10 @@ def test_tts():
     print("🔊 TTS Test")
     print("=" * 30)
     
-    try:
+    with test_section("Test"):
         # Test 1: Try TTSManager
         print("\n🎯 Test 1: TTSManager")
-        try:
+        with test_section("TTSManager"):
             tts = TTSManager()
             print(f"TTSManager created: {type(tts).__name__}")
             print(f"TTS available: {tts.is_available()}")
@@ -37,22 +37,15 @@ def test_tts():
                     
                     # Try to play it
                     print("\n🎵 Testing audio playback...")
-                    player = AudioPlayer()
-                    player.play_audio(result['output_file'])
-                    player.cleanup()
+                    shared_player().play_audio_mmap(result['output_file'])
                 else:
                     print(f"❌ TTS failed: {result.get('error')}")
             else:
                 print("⚠️  TTSManager not available")
-                
-        except Exception as e:
-            print(f"❌ TTSManager failed: {e}")
-            import traceback
-            traceback.print_exc()
         
         # Test 2: MockTTS
         print("\n🎭 Test 2: MockTTS")
-        try:
+        with test_section("MockTTS"):
             mock_tts = MockTTS()
             print(f"MockTTS created: {type(mock_tts).__name__}")
             print(f"MockTTS available: {mock_tts.is_available()}")
@@ -66,21 +59,9 @@ def test_tts():
                 
                 # Try to play it
                 print("\n🎵 Testing mock audio playback...")
-                player = AudioPlayer()
-                player.play_audio(result['output_file'])
-                player.cleanup()
+                shared_player().play_audio_mmap(result['output_file'])
             else:
                 print(f"❌ MockTTS failed: {result.get('error')}")
-                
-        except Exception as e:
-            print(f"❌ MockTTS failed: {e}")
-            import traceback
-            traceback.print_exc()
-            
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
 
 if __name__ == "__main__":
     test_tts()
@@ -3,13 +3,13 @@
 Test script to debug voice processing step by step
 """
 
-import time
 import logging
-from pathlib import Path
+import os
 from audio_recorder import AudioRecorder
 from speech_to_text import SpeechToText, MockSTT
 from openai_client import OpenAIClient, MockOpenAIClient
 from excel_manager import ExcelTaskManager
+from test_helpers import test_section
 
 # Configure logging
 logging.basicConfig(
@@ -17,13 +17,16 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Upper bound on how long to wait for silence detection to end the recording
+MAX_RECORD_SEC = 30
+
 def test_voice_processing():
     """Test voice processing step by step"""
     print("="*50)
     print("Voice Processing Debug Test")
     print("="*50)
     
-    try:
+    with test_section("Test"):
         # Step 1: Test audio recording
         print("\n🎤 Step 1: Testing Audio Recording...")
         recorder = AudioRecorder()
@@ -34,24 +37,25 @@ def test_voice_processing():
             print("🗣️  Speak something now...")
             
             # Wait for recording to complete
-            while recorder.is_recording():
-                time.sleep(0.1)
+            if recorder.wait_until_done(timeout=MAX_RECORD_SEC) is None:
+                print(f"⏰ No silence after {MAX_RECORD_SEC}s - stopping recording")
+                recorder.stop_recording()
             
             print("✅ Recording completed!")
             print(f"📁 Audio saved to: {audio_file}")
             
-            # Check if file exists and has content
-            if Path(audio_file).exists():
-                file_size = Path(audio_file).stat().st_size
-                print(f"📊 Audio file size: {file_size} bytes")
-                if file_size > 0:
-                    print("✅ Audio file is valid")
-                else:
-                    print("❌ Audio file is empty!")
-                    return
-            else:
+            # Check if file exists and has content (single stat call)
+            try:
+                file_size = os.stat(audio_file).st_size
+            except FileNotFoundError:
                 print("❌ Audio file not found!")
                 return
+            print(f"📊 Audio file size: {file_size} bytes")
+            if file_size > 0:
+                print("✅ Audio file is valid")
+            else:
+                print("❌ Audio file is empty!")
+                return
         else:
             print("❌ Failed to start recording")
             return
@@ -127,11 +131,6 @@ def test_voice_processing():
         # Cleanup
         recorder.cleanup()
         print("\n🧹 Cleanup completed")
-        
-    except Exception as e:
-        print(f"❌ Test failed with error: {e}")
-        import traceback
-        traceback.print_exc()
 
 if __name__ == "__main__":
     test_voice_processing()
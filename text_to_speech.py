@@ -2,12 +2,24 @@
 Text-to-Speech module using KittenTTS for Voice-Activated Task Manager
 """
 
+import asyncio
+import functools
+import hashlib
+import itertools
 import logging
+import os
+import re
+import numpy as np
 import soundfile as sf
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Iterator, List, Mapping, Tuple
 import time
 import threading
+import queue
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from uuid import uuid4
 
 try:
     from kittentts import KittenTTS
@@ -19,6 +31,19 @@ from config import TTS_CONFIG, TEMP_DIR
 
 logger = logging.getLogger(__name__)
 
+# Frames converted and written per step when saving generated audio
+WRITE_CHUNK_FRAMES = 16384
+
+# Sentence boundary used to split text for streaming synthesis
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Per-process sequence for output file names (unique even within one second)
+_output_seq = itertools.count()
+
+def _output_path(prefix: str) -> str:
+    """Return a fresh output WAV path under TEMP_DIR"""
+    return str(TEMP_DIR / f"{prefix}_{os.getpid()}_{next(_output_seq)}.wav")
+
 class TextToSpeech:
     """Handles text-to-speech conversion using KittenTTS"""
     
@@ -42,6 +67,11 @@ class TextToSpeech:
             'expr-voice-5-m', 'expr-voice-5-f'
         ]
         
+        # Background generation queue, served by one worker started on first use
+        self._job_q = None
+        self._worker_thread = None
+        self._worker_lock = threading.Lock()
+        
         self._load_model()
     
     def _load_model(self):
@@ -54,10 +84,56 @@ class TextToSpeech:
             self.model = KittenTTS(self.model_name)
             logger.info("KittenTTS model loaded successfully")
             
+            if TTS_CONFIG.get('onnx_model_path'):
+                self._load_onnx_session(TTS_CONFIG['onnx_model_path'])
+            
+            if TTS_CONFIG.get('warmup', True):
+                self._warm_up()
+            
         except Exception as e:
             logger.error(f"Failed to load KittenTTS model: {e}")
             self.model = None
     
+    def _load_onnx_session(self, model_path: str):
+        """
+        Swap the model's ONNX Runtime session for one built from model_path
+        
+        Used to run an int8-quantized export with full graph optimization and
+        a fixed intra-op thread count. Keeps the stock session if the
+        KittenTTS build doesn't expose one.
+        
+        Args:
+            model_path: Path to the replacement ONNX model
+        """
+        try:
+            import onnxruntime as ort
+            
+            # KittenTTS 0.1 keeps the session on an inner ONNX wrapper
+            owner = getattr(self.model, 'model', self.model)
+            attr = next((name for name in ('session', '_session') if hasattr(owner, name)), None)
+            if attr is None:
+                logger.warning("KittenTTS does not expose its ONNX session, keeping the default model")
+                return
+            
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.intra_op_num_threads = TTS_CONFIG.get('onnx_threads') or max(1, (os.cpu_count() or 2) // 2)
+            session = ort.InferenceSession(str(model_path), options, providers=['CPUExecutionProvider'])
+            setattr(owner, attr, session)
+            logger.info(f"Using ONNX model: {model_path} ({options.intra_op_num_threads} threads)")
+            
+        except Exception as e:
+            logger.error(f"Failed to load ONNX model {model_path}: {e}")
+    
+    def _warm_up(self):
+        """Run one throwaway generation so the first real request is fast"""
+        try:
+            start_time = time.time()
+            self.model.generate("hello", voice=self.voice)
+            logger.info(f"TTS warmed up in {time.time() - start_time:.2f}s")
+        except Exception as e:
+            logger.warning(f"TTS warm-up failed: {e}")
+    
     def generate_speech(self, text: str, voice: str = None, output_file: str = None) -> Dict[str, Any]:
         """
         Generate speech from text
@@ -70,19 +146,50 @@ class TextToSpeech:
         Returns:
             Dictionary containing generation results
         """
+        result, audio = self._synthesize(text, voice, output_file)
+        if audio is None:
+            return result
+        
+        try:
+            self._save(audio, result['output_file'])
+        except Exception as e:
+            logger.error(f"Error saving speech: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'output_file': None
+            }
+        
+        logger.info(f"Speech generated in {result['generation_time']:.2f}s, saved to: {result['output_file']}")
+        return result
+    
+    def _save(self, audio, output_file: str):
+        """Write generated (mono) audio to a 16-bit PCM WAV file, one chunk at a time"""
+        audio = np.asarray(audio)
+        with sf.SoundFile(output_file, 'w', self.sample_rate, 1, subtype='PCM_16') as f:
+            for i in range(0, len(audio), WRITE_CHUNK_FRAMES):
+                f.write(audio[i:i + WRITE_CHUNK_FRAMES].astype(np.float32, copy=False))
+    
+    def _synthesize(self, text: str, voice: str = None, output_file: str = None) -> Tuple[Dict[str, Any], Any]:
+        """
+        Run the model without writing the audio file
+        
+        Returns:
+            (result, audio) - audio is None on failure, with the error in result
+        """
         if not self.model:
             return {
                 'success': False,
                 'error': 'KittenTTS model not loaded',
                 'output_file': None
-            }
+            }, None
         
         if not text or not text.strip():
             return {
                 'success': False,
                 'error': 'No text provided',
                 'output_file': None
-            }
+            }, None
         
         # Use specified voice or default
         selected_voice = voice or self.voice
@@ -101,11 +208,7 @@ class TextToSpeech:
             
             # Generate output filename if not provided
             if not output_file:
-                timestamp = int(time.time())
-                output_file = str(TEMP_DIR / f"tts_output_{timestamp}.wav")
-            
-            # Save audio to file
-            sf.write(output_file, audio, self.sample_rate)
+                output_file = _output_path("tts_output")
             
             generation_time = time.time() - start_time
             
@@ -118,9 +221,7 @@ class TextToSpeech:
                 'generation_time': generation_time,
                 'audio_duration': len(audio) / self.sample_rate
             }
-            
-            logger.info(f"Speech generated in {generation_time:.2f}s, saved to: {output_file}")
-            return result
+            return result, audio
             
         except Exception as e:
             logger.error(f"Error generating speech: {e}")
@@ -128,28 +229,67 @@ class TextToSpeech:
                 'success': False,
                 'error': str(e),
                 'output_file': None
-            }
+            }, None
     
-    def generate_speech_async(self, text: str, voice: str = None, callback: callable = None) -> threading.Thread:
+    def generate_speech_async(self, text: str, voice: str = None, callback: callable = None) -> Future:
         """
         Generate speech asynchronously
         
+        Requests are handled in order by a single worker thread, so the
+        model is never driven from two threads at once.
+        
         Args:
             text: Text to convert to speech
             voice: Voice to use
             callback: Function to call when generation is complete
             
         Returns:
-            Thread object running the generation
+            Future resolving to the generation result
+        """
+        with self._worker_lock:
+            if self._job_q is None:
+                self._job_q = queue.Queue()
+                self._worker_thread = threading.Thread(target=self._worker, args=(self._job_q,), daemon=True)
+                self._worker_thread.start()
+            
+            future = Future()
+            self._job_q.put((text, voice, callback, future))
+        return future
+    
+    async def agenerate_speech(self, text: str, voice: str = None) -> Dict[str, Any]:
         """
-        def _generate():
-            result = self.generate_speech(text, voice)
-            if callback:
-                callback(result)
+        Generate speech from a coroutine
         
-        thread = threading.Thread(target=_generate)
-        thread.start()
-        return thread
+        Runs on the same single worker as generate_speech_async, so awaiting
+        callers are serialized on the model without blocking the event loop.
+        
+        Args:
+            text: Text to convert to speech
+            voice: Voice to use
+            
+        Returns:
+            Dictionary containing generation results
+        """
+        return await asyncio.wrap_future(self.generate_speech_async(text, voice))
+    
+    def _worker(self, job_q: queue.Queue):
+        """Serve queued generate_speech_async requests until a None sentinel"""
+        while True:
+            job = job_q.get()
+            if job is None:
+                break
+            
+            text, voice, callback, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = self.generate_speech(text, voice)
+                if callback:
+                    callback(result)
+                future.set_result(result)
+            except Exception as e:
+                logger.error(f"Error in async speech generation: {e}")
+                future.set_exception(e)
     
     def batch_generate(self, texts: List[str], voice: str = None) -> List[Dict[str, Any]]:
         """
@@ -162,16 +302,33 @@ class TextToSpeech:
         Returns:
             List of generation results
         """
-        results = []
+        # Synthesis stays sequential (the model takes one utterance per call)
+        # while the WAV writes run in the background, overlapping the next item;
+        # one write is in flight per synthesis, so two workers are plenty
+        pending = []
+        with ThreadPoolExecutor(max_workers=2) as writer:
+            for i, text in enumerate(texts):
+                logger.info(f"Generating speech {i+1}/{len(texts)}")
+                output_file = _output_path("tts_output")
+                result, audio = self._synthesize(text, voice, output_file)
+                future = None
+                if audio is not None:
+                    future = writer.submit(self._save, audio, output_file)
+                pending.append((result, future))
         
-        for i, text in enumerate(texts):
-            logger.info(f"Generating speech {i+1}/{len(texts)}")
-            result = self.generate_speech(text, voice)
+        results = []
+        for result, future in pending:
+            if future is not None:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Error saving speech: {e}")
+                    result = {
+                        'success': False,
+                        'error': str(e),
+                        'output_file': None
+                    }
             results.append(result)
-            
-            # Small delay between generations to avoid overwhelming the system
-            if i < len(texts) - 1:
-                time.sleep(0.1)
         
         return results
     
@@ -216,46 +373,64 @@ class TextToSpeech:
     
     def cleanup(self):
         """Clean up resources"""
+        # Stop the async worker once it has drained pending requests
+        with self._worker_lock:
+            worker_thread, self._worker_thread = self._worker_thread, None
+            if self._job_q is not None:
+                self._job_q.put(None)
+                self._job_q = None
+        
+        # Pending requests still need the model (unless called from one of their callbacks)
+        if worker_thread is not None and worker_thread is not threading.current_thread():
+            worker_thread.join()
+        
         # KittenTTS models are automatically cleaned up
         self.model = None
         logger.info("TTS model cleaned up")
 
 
+# Mock audio: 3 seconds at 24kHz
+MOCK_SAMPLE_RATE = 24000
+MOCK_DURATION = 3.0
+
+@functools.lru_cache(maxsize=1)
+def _mock_audio():
+    """Build the LOUD mock tone once (multiple frequencies, higher volume)"""
+    # Sample times, built in float32 directly (linspace would go through a
+    # float64 temporary)
+    t = np.arange(int(MOCK_SAMPLE_RATE * MOCK_DURATION), dtype=np.float32)
+    t /= np.float32(MOCK_SAMPLE_RATE)
+    
+    # Multiple frequencies for better audibility: A4, A5 and A6 with their
+    # gains, all scaled by 0.9 to make it very loud. Accumulated in place so
+    # only one scratch buffer is needed besides the output
+    tones = ((440, 0.6), (880, 0.4), (1760, 0.3))
+    mock_audio = np.zeros_like(t)
+    scratch = np.empty_like(t)
+    for freq, gain in tones:
+        np.multiply(t, np.float32(2 * np.pi * freq), out=scratch)
+        np.sin(scratch, out=scratch)
+        scratch *= np.float32(gain * 0.9)
+        mock_audio += scratch
+    # Shared between calls, so keep it read-only
+    mock_audio.flags.writeable = False
+    return mock_audio
+
 class MockTTS:
     """Mock TTS for testing without actual model"""
     
-    def __init__(self):
-        self.mock_audio = None
-    
     def generate_speech(self, text: str, voice: str = None, output_file: str = None) -> Dict[str, Any]:
         """Return mock TTS result"""
         if not output_file:
-            timestamp = int(time.time())
-            output_file = str(TEMP_DIR / f"mock_tts_{timestamp}.wav")
-        
-        # Create a LOUD mock audio file (multiple frequencies, higher volume)
-        import numpy as np
+            output_file = _output_path("mock_tts")
         
-        # Generate 3 seconds of audio at 24kHz
-        sample_rate = 24000
-        duration = 3.0
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        
-        # Create multiple frequencies for better audibility
-        freq1 = 440   # A4 note
-        freq2 = 880   # A5 note
-        freq3 = 1760  # A6 note
-        
-        # Generate tones and make them LOUD
-        audio1 = np.sin(2 * np.pi * freq1 * t) * 0.6
-        audio2 = np.sin(2 * np.pi * freq2 * t) * 0.4
-        audio3 = np.sin(2 * np.pi * freq3 * t) * 0.3
-        
-        # Combine and make it very loud
-        mock_audio = (audio1 + audio2 + audio3) * 0.9  # High volume
+        # The mock audio never depends on the text, so reuse the shared buffer
+        sample_rate = MOCK_SAMPLE_RATE
+        duration = MOCK_DURATION
+        mock_audio = _mock_audio()
         
         try:
-            sf.write(output_file, mock_audio, sample_rate)
+            sf.write(output_file, mock_audio, sample_rate, subtype='PCM_16')
             return {
                 'success': True,
                 'output_file': output_file,
@@ -279,6 +454,43 @@ class MockTTS:
         pass
 
 
+# TextToSpeech instances shared by TTSManagers: (model, voice) -> [tts, refcount]
+_MODEL_LOCK = threading.Lock()
+_SHARED_MODELS: Dict[Tuple[str, str], list] = {}
+
+
+def _acquire_tts(key: Tuple[str, str]) -> 'TextToSpeech':
+    """Get the shared TextToSpeech for key, loading it on first use"""
+    with _MODEL_LOCK:
+        entry = _SHARED_MODELS.get(key)
+        if entry is None:
+            entry = _SHARED_MODELS[key] = [TextToSpeech(*key), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def _release_tts(key: Tuple[str, str]):
+    """Drop one reference to a shared TextToSpeech, cleaning it up after the last"""
+    with _MODEL_LOCK:
+        entry = _SHARED_MODELS.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _SHARED_MODELS[key]
+            entry[0].cleanup()
+
+
+def _cache_key(text: str, voice: str) -> bytes:
+    """16-byte digest of text and voice, so prompts aren't kept (or rehashed) as dict keys"""
+    return hashlib.blake2b(f"{text}|{voice}".encode('utf-8'), digest_size=16).digest()
+
+
+def _disk_cache_key(text: str, voice: str) -> str:
+    """File name stem for the persistent TTS cache"""
+    return _cache_key(text, voice).hex()
+
+
 class TTSManager:
     """High-level TTS manager with caching and optimization"""
     
@@ -290,11 +502,24 @@ class TTSManager:
             model: KittenTTS model to use
             voice: Default voice to use
         """
-        self.tts = TextToSpeech(model, voice)
-        self.cache = {}
+        # The model is loaded once per (model, voice) and shared between managers;
+        # caches stay per manager
+        self._model_key = (model or TTS_CONFIG['model'], voice or TTS_CONFIG['voice'])
+        self.tts = _acquire_tts(self._model_key)
+        self._released = False
+        self.cache = OrderedDict()  # LRU order: least recently used first
         self.cache_size = 100  # Maximum number of cached items
-        
-    def speak(self, text: str, voice: str = None, cache: bool = True) -> Dict[str, Any]:
+        self.max_bytes = 100 * 1024 * 1024  # Budget for cached text + audio files
+        self._bytes = 0
+        self._entry_bytes = {}
+        # Generated WAVs persist here across restarts, keyed by text and voice;
+        # least recently used files are deleted once the directory exceeds its budget
+        self.cache_dir = TEMP_DIR / 'tts_cache'
+        self.cache_dir.mkdir(exist_ok=True)
+        self.max_disk_bytes = 200 * 1024 * 1024
+        self._disk_bytes = None  # Measured on the first write
+        
+    def speak(self, text: str, voice: str = None, cache: bool = True) -> Mapping[str, Any]:
         """
         Convert text to speech with optional caching
         
@@ -304,27 +529,94 @@ class TTSManager:
             cache: Whether to cache the result
             
         Returns:
-            Generation result
+            Generation result (read-only when cached, since it is shared)
         """
+        if not cache:
+            return self.tts.generate_speech(text, voice)
+        
         # Check cache first
-        cache_key = f"{text}_{voice or self.tts.voice}"
-        if cache and cache_key in self.cache:
-            logger.info(f"Using cached TTS for: {text[:30]}...")
-            return self.cache[cache_key]
+        selected_voice = voice or self.tts.voice
+        cache_key = _cache_key(text, selected_voice)
+        if cache_key in self.cache:
+            try:
+                # Refresh the file's LRU position (it may have been pruned by another manager)
+                os.utime(self.cache[cache_key]['output_file'])
+                logger.debug("Using cached TTS for: %s...", text[:30])
+                self.cache.move_to_end(cache_key)
+                return self.cache[cache_key]
+            except OSError:
+                self._bytes -= self._entry_bytes.pop(cache_key)
+                del self.cache[cache_key]
+        
+        # Then the on-disk cache from earlier runs
+        cache_path = self.cache_dir / f"{_disk_cache_key(text, selected_voice)}.wav"
+        if cache_path.exists():
+            logger.info(f"Using cached TTS file for: {text[:30]}...")
+            os.utime(cache_path)
+            info = sf.info(str(cache_path))
+            result = {
+                'success': True,
+                'output_file': str(cache_path),
+                'text': text,
+                'voice': selected_voice,
+                'sample_rate': info.samplerate,
+                'generation_time': 0.0,
+                'audio_duration': info.duration
+            }
+        else:
+            # Generate speech into a private file, then publish it atomically
+            tmp_path = self.cache_dir / f"{cache_path.stem}.{uuid4().hex}.tmp.wav"
+            result = self.tts.generate_speech(text, voice, output_file=str(tmp_path))
+            if not result['success']:
+                return result
+            os.replace(tmp_path, cache_path)
+            result['output_file'] = str(cache_path)
+            self._account_disk_write(cache_path)
+        
+        result = MappingProxyType(result)
+        self._add_to_cache(cache_key, result)
+        return result
+    
+    def is_cached(self, text: str, voice: str = None, sentences: bool = False) -> bool:
+        """
+        Check whether speaking text would be served from the cache
         
-        # Generate speech
-        result = self.tts.generate_speech(text, voice)
+        Args:
+            text: Text to check
+            voice: Voice to use
+            sentences: Check each sentence separately, as stream() caches them
+            
+        Returns:
+            True if no synthesis would be needed
+        """
+        if sentences:
+            return all(self.is_cached(sentence, voice) for sentence in SENTENCE_SPLIT.split(text.strip()) if sentence)
         
-        # Cache result if successful
-        if cache and result['success']:
-            self._add_to_cache(cache_key, result)
+        selected_voice = voice or self.tts.voice
+        if _cache_key(text, selected_voice) in self.cache:
+            return True
+        return (self.cache_dir / f"{_disk_cache_key(text, selected_voice)}.wav").exists()
+    
+    def stream(self, text: str, voice: str = None) -> Iterator[Mapping[str, Any]]:
+        """
+        Speak text one sentence at a time
         
-        return result
+        Yields each sentence's result as soon as it is ready, so playback of
+        the first sentence can start while the rest synthesize. Sentences are
+        cached individually.
+        """
+        for sentence in SENTENCE_SPLIT.split(text.strip()):
+            if sentence:
+                yield self.speak(sentence, voice)
     
     def speak_async(self, text: str, voice: str = None, callback: callable = None):
         """Speak text asynchronously"""
         return self.tts.generate_speech_async(text, voice, callback)
     
+    async def aspeak(self, text: str, voice: str = None) -> Dict[str, Any]:
+        """Speak text from a coroutine"""
+        return await self.tts.agenerate_speech(text, voice)
+    
     def generate_speech(self, text: str, voice: str = None, output_file: str = None) -> Dict[str, Any]:
         """
         Generate speech (alias for speak method for compatibility)
@@ -339,18 +631,70 @@ class TTSManager:
         """
         return self.speak(text, voice)
     
-    def _add_to_cache(self, key: str, result: Dict[str, Any]):
-        """Add result to cache with size management"""
-        if len(self.cache) >= self.cache_size:
-            # Remove oldest item
-            oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
+    def _add_to_cache(self, key: bytes, result: Mapping[str, Any]):
+        """Add result to cache, evicting least recently used items to stay within both limits"""
+        try:
+            size = len(result['text']) + os.path.getsize(result['output_file'])
+        except OSError:
+            size = len(result['text'])
+        
+        while self.cache and (len(self.cache) >= self.cache_size or self._bytes + size > self.max_bytes):
+            old_key, _ = self.cache.popitem(last=False)
+            self._bytes -= self._entry_bytes.pop(old_key)
         
         self.cache[key] = result
+        self._entry_bytes[key] = size
+        self._bytes += size
+    
+    def _account_disk_write(self, cache_path: Path):
+        """Count a newly written WAV against the disk budget, pruning when it is exceeded"""
+        if self._disk_bytes is None:
+            self._prune_disk_cache()
+            return
+        try:
+            self._disk_bytes += cache_path.stat().st_size
+        except OSError:
+            return
+        if self._disk_bytes > self.max_disk_bytes:
+            self._prune_disk_cache()
+    
+    def _prune_disk_cache(self):
+        """Delete the least recently used WAVs until the cache directory fits max_disk_bytes"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            # Skip files still being written by generate_speech
+            if entry.name.endswith('.wav') and not entry.name.endswith('.tmp.wav'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        
+        total = sum(size for _, size, _ in files)
+        # Results held in memory may be playing or be returned again
+        in_use = {result['output_file'] for result in self.cache.values()}
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            if path in in_use:
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        
+        if removed:
+            logger.info(f"Pruned {removed} old TTS cache files")
+        self._disk_bytes = total
     
     def clear_cache(self):
         """Clear the TTS cache"""
         self.cache.clear()
+        self._entry_bytes.clear()
+        self._bytes = 0
         logger.info("TTS cache cleared")
     
     def get_cache_info(self) -> Dict[str, Any]:
@@ -358,7 +702,8 @@ class TTSManager:
         return {
             'size': len(self.cache),
             'max_size': self.cache_size,
-            'keys': list(self.cache.keys())
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes
         }
     
     def is_available(self) -> bool:
@@ -366,8 +711,10 @@ class TTSManager:
         return self.tts.is_available()
     
     def cleanup(self):
-        """Clean up TTS manager"""
-        self.tts.cleanup()
+        """Clean up TTS manager (the shared model is released by its last manager)"""
+        if not self._released:
+            self._released = True
+            _release_tts(self._model_key)
         self.clear_cache()
 
 
@@ -5,11 +5,20 @@ Cross-platform TTS with system voices
 """
 
 import os
-import time
+import functools
+import hashlib
+import itertools
+import re
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Iterator, List, Mapping
 import tempfile
+import wave
+import numpy as np
+import soundfile as sf
+from collections import OrderedDict
+from uuid import uuid4
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +26,24 @@ logger = logging.getLogger(__name__)
 TEMP_DIR = Path.home() / '.voice_task_manager' / 'temp'
 TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
+# Sentence boundary used to split text for streaming synthesis
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Per-process sequence for output file names (unique even within one second)
+_output_seq = itertools.count()
+
+def _output_path(prefix: str) -> str:
+    """Return a fresh output WAV path under TEMP_DIR"""
+    return str(TEMP_DIR / f"{prefix}_{os.getpid()}_{next(_output_seq)}.wav")
+
 class PyTTSX3TTS:
     """Text-to-Speech using pyttsx3 (system voices)"""
     
     def __init__(self):
+        # System voices, queried once in _configure_engine
+        self._voices = []
+        self._voice_by_name = {}
+        self._current_voice_id = None
         try:
             import pyttsx3
             self.engine = pyttsx3.init()
@@ -41,9 +64,16 @@ class PyTTSX3TTS:
             voices = self.engine.getProperty('voices')
             logger.info(f"Found {len(voices)} available voices")
             
+            # Cache the list; on SAPI5 each getProperty('voices') is a COM query
+            self._voices = list(voices)
+            self._voice_by_name = {}
+            for voice in self._voices:
+                self._voice_by_name.setdefault(voice.name.lower(), voice)
+            
             # Set default voice (usually the first one)
             if voices:
                 self.engine.setProperty('voice', voices[0].id)
+                self._current_voice_id = voices[0].id
                 logger.info(f"Using voice: {voices[0].name}")
             
             # Set speech rate (words per minute)
@@ -66,8 +96,7 @@ class PyTTSX3TTS:
         try:
             # Create output file path
             if not output_file:
-                timestamp = int(time.time())
-                output_file = str(TEMP_DIR / f"pyttsx3_tts_{timestamp}.wav")
+                output_file = _output_path("pyttsx3_tts")
             
             # Set voice if specified
             if voice:
@@ -77,25 +106,7 @@ class PyTTSX3TTS:
             self.engine.save_to_file(text, output_file)
             self.engine.runAndWait()
             
-            # Check if file was created
-            if Path(output_file).exists():
-                file_size = Path(output_file).stat().st_size
-                logger.info(f"Speech generated: {output_file} ({file_size} bytes)")
-                
-                return {
-                    'success': True,
-                    'output_file': output_file,
-                    'text': text,
-                    'voice': voice or 'system-default',
-                    'sample_rate': 22050,  # pyttsx3 default
-                    'generation_time': 0.1,
-                    'audio_duration': len(text.split()) / 2.5  # Rough estimate
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': 'Failed to create audio file'
-                }
+            return self._build_result(text, voice, output_file)
                 
         except Exception as e:
             logger.error(f"Error generating speech: {e}")
@@ -104,15 +115,95 @@ class PyTTSX3TTS:
                 'error': str(e)
             }
     
+    def generate_speech_batch(self, texts: List[str], voice: str = None,
+                              voices: List[Optional[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Generate speech for several texts with a single engine run
+        
+        All utterances are queued with save_to_file() before one
+        runAndWait(), so the driver loop starts and stops once per batch
+        instead of once per text. Results are returned in input order.
+        
+        Args:
+            texts: Texts to convert
+            voice: Voice for the whole batch
+            voices: Optional per-text voices (None entries use `voice`)
+        """
+        if not self.available:
+            return [{'success': False, 'error': 'PyTTSX3 not available'} for _ in texts]
+        
+        try:
+            output_files = [_output_path("pyttsx3_tts") for _ in texts]
+            text_voices = [v or voice for v in voices] if voices else [voice] * len(texts)
+            
+            # Set voice if specified
+            if voice:
+                self._set_voice(voice)
+            
+            # Property changes are queued alongside the utterances, so each
+            # text is spoken with its own voice within the one run
+            current = voice
+            for text, text_voice, output_file in zip(texts, text_voices, output_files):
+                if text_voice and text_voice != current:
+                    self._set_voice(text_voice)
+                    current = text_voice
+                self.engine.save_to_file(text, output_file)
+            self.engine.runAndWait()
+            
+            return [self._build_result(text, text_voice, output_file)
+                    for text, text_voice, output_file in zip(texts, text_voices, output_files)]
+            
+        except Exception as e:
+            logger.error(f"Error generating speech batch: {e}")
+            return [{'success': False, 'error': str(e)} for _ in texts]
+    
+    def _build_result(self, text: str, voice: Optional[str], output_file: str) -> Dict[str, Any]:
+        """Build the result dict for a file written by the engine"""
+        # Check if file was created
+        if Path(output_file).exists():
+            file_size = Path(output_file).stat().st_size
+            logger.info(f"Speech generated: {output_file} ({file_size} bytes)")
+            
+            return {
+                'success': True,
+                'output_file': output_file,
+                'text': text,
+                'voice': voice or 'system-default',
+                'sample_rate': 22050,  # pyttsx3 default
+                'generation_time': 0.1,
+                'audio_duration': len(text.split()) / 2.5  # Rough estimate
+            }
+        else:
+            return {
+                'success': False,
+                'error': 'Failed to create audio file'
+            }
+    
+    def generate_speech_stream(self, text: str, voice: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        Generate speech one sentence at a time
+
+        Yields a result dict per sentence as soon as it has been written, so
+        playback of the first sentence can start while the rest synthesize.
+        """
+        for sentence in SENTENCE_SPLIT.split(text.strip()):
+            if sentence:
+                yield self.generate_speech(sentence, voice, _output_path("pyttsx3_tts"))
+    
     def _set_voice(self, voice_name: str):
-        """Set a specific voice by name"""
+        """Set a specific voice by name (exact match first, then substring)"""
         try:
-            voices = self.engine.getProperty('voices')
-            for voice in voices:
-                if voice_name.lower() in voice.name.lower():
+            wanted = voice_name.lower()
+            voice = self._voice_by_name.get(wanted)
+            if voice is None:
+                voice = next((v for name, v in self._voice_by_name.items() if wanted in name), None)
+            if voice is not None:
+                # setProperty re-initializes the voice on some drivers (SAPI5)
+                if voice.id != self._current_voice_id:
                     self.engine.setProperty('voice', voice.id)
+                    self._current_voice_id = voice.id
                     logger.info(f"Set voice to: {voice.name}")
-                    return True
+                return True
             
             logger.warning(f"Voice '{voice_name}' not found, using default")
             return False
@@ -135,9 +226,8 @@ class PyTTSX3TTS:
             return []
         
         try:
-            voices = self.engine.getProperty('voices')
             voice_list = []
-            for i, voice in enumerate(voices):
+            for i, voice in enumerate(self._voices):
                 voice_list.append({
                     'id': i,
                     'name': voice.name,
@@ -158,32 +248,140 @@ class PyTTSX3TTS:
         except Exception as e:
             logger.error(f"Error cleaning up PyTTSX3: {e}")
 
+def _cache_key(text: str, voice: Optional[str]) -> bytes:
+    """16-byte digest of text and voice, so prompts aren't kept (or rehashed) as dict keys"""
+    return hashlib.blake2b(f"{text}|{voice}".encode('utf-8'), digest_size=16).digest()
+
+def _disk_cache_key(text: str, voice: Optional[str]) -> str:
+    """File name stem for the persistent TTS cache"""
+    return _cache_key(text, voice).hex()
+
 class TTSManager:
     """TTS Manager with caching and fallback"""
     
     def __init__(self):
         self.tts = PyTTSX3TTS()
-        self.cache = {}
+        self.cache = OrderedDict()  # LRU order: least recently used first
+        self.cache_size = 100  # Maximum number of cached items
+        self.max_bytes = 100 * 1024 * 1024  # Budget for cached text + audio files
+        self._bytes = 0
+        self._entry_bytes = {}
+        # Shared with the KittenTTS manager; least recently used files are
+        # deleted once the directory exceeds its budget
         self.cache_dir = TEMP_DIR / 'tts_cache'
         self.cache_dir.mkdir(exist_ok=True)
+        self.max_disk_bytes = 200 * 1024 * 1024
+        self._disk_bytes = None  # Measured on the first write
     
-    def speak(self, text: str, voice: str = None) -> Dict[str, Any]:
-        """Generate speech with caching"""
+    def speak(self, text: str, voice: str = None, cache: bool = True) -> Mapping[str, Any]:
+        """Generate speech with caching (in memory, backed by WAVs in cache_dir)"""
+        if not cache:
+            return self.tts.generate_speech(text, voice)
+        
         # Check cache first
-        cache_key = f"{text}_{voice}"
+        cache_key = _cache_key(text, voice)
         if cache_key in self.cache:
-            logger.info("Using cached TTS result")
-            return self.cache[cache_key]
-        
-        # Generate new speech
-        result = self.tts.generate_speech(text, voice)
+            try:
+                # Refresh the file's LRU position (it may have been pruned by another manager)
+                os.utime(self.cache[cache_key]['output_file'])
+                logger.debug("Using cached TTS result")
+                self.cache.move_to_end(cache_key)
+                return self.cache[cache_key]
+            except OSError:
+                self._bytes -= self._entry_bytes.pop(cache_key)
+                del self.cache[cache_key]
         
-        # Cache the result
-        if result['success']:
-            self.cache[cache_key] = result
+        # Then the on-disk cache from earlier runs
+        cache_path = self.cache_dir / f"{_disk_cache_key(text, voice)}.wav"
+        if cache_path.exists():
+            logger.info("Using cached TTS file")
+            os.utime(cache_path)
+            with wave.open(str(cache_path), 'rb') as wf:
+                sample_rate = wf.getframerate()
+                audio_duration = wf.getnframes() / sample_rate
+            result = {
+                'success': True,
+                'output_file': str(cache_path),
+                'text': text,
+                'voice': voice or 'system-default',
+                'sample_rate': sample_rate,
+                'generation_time': 0.0,
+                'audio_duration': audio_duration
+            }
+        else:
+            # Generate new speech into a private file, then publish it atomically
+            tmp_path = self.cache_dir / f"{cache_path.stem}.{uuid4().hex}.tmp.wav"
+            result = self.tts.generate_speech(text, voice, str(tmp_path))
+            if not result['success']:
+                return result
+            os.replace(tmp_path, cache_path)
+            result['output_file'] = str(cache_path)
+            self._account_disk_write(cache_path)
         
+        # Cache the result (read-only, since later hits share it)
+        result = MappingProxyType(result)
+        self._add_to_cache(cache_key, result)
         return result
     
+    def _add_to_cache(self, key: bytes, result: Mapping[str, Any]):
+        """Add result to cache, evicting least recently used items to stay within both limits"""
+        try:
+            size = len(result['text']) + os.path.getsize(result['output_file'])
+        except OSError:
+            size = len(result['text'])
+        
+        while self.cache and (len(self.cache) >= self.cache_size or self._bytes + size > self.max_bytes):
+            old_key, _ = self.cache.popitem(last=False)
+            self._bytes -= self._entry_bytes.pop(old_key)
+        
+        self.cache[key] = result
+        self._entry_bytes[key] = size
+        self._bytes += size
+    
+    def _account_disk_write(self, cache_path: Path):
+        """Count a newly written WAV against the disk budget, pruning when it is exceeded"""
+        if self._disk_bytes is None:
+            self._prune_disk_cache()
+            return
+        try:
+            self._disk_bytes += cache_path.stat().st_size
+        except OSError:
+            return
+        if self._disk_bytes > self.max_disk_bytes:
+            self._prune_disk_cache()
+    
+    def _prune_disk_cache(self):
+        """Delete the least recently used WAVs until the cache directory fits max_disk_bytes"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            # Skip files still being written by generate_speech
+            if entry.name.endswith('.wav') and not entry.name.endswith('.tmp.wav'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        
+        total = sum(size for _, size, _ in files)
+        # Results held in memory may be playing or be returned again
+        in_use = {result['output_file'] for result in self.cache.values()}
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            if path in in_use:
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        
+        if removed:
+            logger.info(f"Pruned {removed} old TTS cache files")
+        self._disk_bytes = total
+    
     def generate_speech(self, text: str, voice: str = None) -> Dict[str, Any]:
         """Alias for speak method"""
         return self.speak(text, voice)
@@ -200,42 +398,48 @@ class TTSManager:
         """Clean up TTS resources"""
         self.tts.cleanup()
 
+# Mock audio: 3 seconds at 24kHz
+MOCK_SAMPLE_RATE = 24000
+MOCK_DURATION = 3.0
+
+@functools.lru_cache(maxsize=1)
+def _mock_audio():
+    """Build the LOUD mock tone once (multiple frequencies, higher volume)"""
+    # Sample times, built in float32 directly (linspace would go through a
+    # float64 temporary)
+    t = np.arange(int(MOCK_SAMPLE_RATE * MOCK_DURATION), dtype=np.float32)
+    t /= np.float32(MOCK_SAMPLE_RATE)
+    
+    # Multiple frequencies for better audibility: A4, A5 and A6 with their
+    # gains, all scaled by 0.9 to make it very loud. Accumulated in place so
+    # only one scratch buffer is needed besides the output
+    tones = ((440, 0.6), (880, 0.4), (1760, 0.3))
+    mock_audio = np.zeros_like(t)
+    scratch = np.empty_like(t)
+    for freq, gain in tones:
+        np.multiply(t, np.float32(2 * np.pi * freq), out=scratch)
+        np.sin(scratch, out=scratch)
+        scratch *= np.float32(gain * 0.9)
+        mock_audio += scratch
+    # Shared between calls, so keep it read-only
+    mock_audio.flags.writeable = False
+    return mock_audio
+
 class MockTTS:
     """Mock TTS for testing (keeps existing functionality)"""
     
-    def __init__(self):
-        self.mock_audio = None
-    
     def generate_speech(self, text: str, voice: str = None, output_file: str = None) -> Dict[str, Any]:
         """Return mock TTS result"""
         if not output_file:
-            timestamp = int(time.time())
-            output_file = str(TEMP_DIR / f"mock_tts_{timestamp}.wav")
+            output_file = _output_path("mock_pyttsx3_tts")
         
-        # Create a LOUD mock audio file (multiple frequencies, higher volume)
-        import numpy as np
-        
-        # Generate 3 seconds of audio at 24kHz
-        sample_rate = 24000
-        duration = 3.0
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        
-        # Create multiple frequencies for better audibility
-        freq1 = 440   # A4 note
-        freq2 = 880   # A5 note
-        freq3 = 1760  # A6 note
-        
-        # Generate tones and make them LOUD
-        audio1 = np.sin(2 * np.pi * freq1 * t) * 0.6
-        audio2 = np.sin(2 * np.pi * freq2 * t) * 0.4
-        audio3 = np.sin(2 * np.pi * freq3 * t) * 0.3
-        
-        # Combine and make it very loud
-        mock_audio = (audio1 + audio2 + audio3) * 0.9  # High volume
+        # The mock audio never depends on the text, so reuse the shared buffer
+        sample_rate = MOCK_SAMPLE_RATE
+        duration = MOCK_DURATION
+        mock_audio = _mock_audio()
         
         try:
-            import soundfile as sf
-            sf.write(output_file, mock_audio, sample_rate)
+            sf.write(output_file, mock_audio, sample_rate, subtype='PCM_16')
             return {
                 'success': True,
                 'output_file': output_file,
@@ -275,6 +479,23 @@ class TextToSpeech:
         """Generate speech using the best available TTS engine"""
         return self.tts.generate_speech(text, voice)
     
+    def generate_speech_batch(self, texts: List[str], voice: str = None) -> List[Dict[str, Any]]:
+        """Generate speech for several texts (batched when the engine supports it)"""
+        if hasattr(self.tts, 'generate_speech_batch'):
+            return self.tts.generate_speech_batch(texts, voice)
+        return [self.tts.generate_speech(text, voice) for text in texts]
+    
+    def batch_generate(self, texts: List[str], voice: str = None) -> List[Dict[str, Any]]:
+        """Alias for generate_speech_batch (matches the KittenTTS TextToSpeech API)"""
+        return self.generate_speech_batch(texts, voice)
+    
+    def generate_speech_stream(self, text: str, voice: str = None) -> Iterator[Dict[str, Any]]:
+        """Generate speech sentence by sentence (single chunk if unsupported)"""
+        if hasattr(self.tts, 'generate_speech_stream'):
+            yield from self.tts.generate_speech_stream(text, voice)
+        else:
+            yield self.tts.generate_speech(text, voice)
+    
     def speak(self, text: str, voice: str = None) -> Dict[str, Any]:
         """Alias for generate_speech"""
         return self.generate_speech(text, voice)
@@ -2,12 +2,16 @@
 Main Voice Task Manager - Integrates all components for voice-activated task management
 """
 
+import atexit
 import logging
+import logging.handlers
+import os
 import sys
-import time
 import threading
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Mapping, Optional, Tuple
 import platform
 
 # Import our modules
@@ -16,20 +20,53 @@ from speech_to_text import SpeechToText, MockSTT
 from text_to_speech import TextToSpeech, MockTTS, TTSManager
 from openai_client import OpenAIClient, MockOpenAIClient
 from excel_manager import ExcelTaskManager
-from config import HOTKEY_COMBO, LOG_FILE
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
+from config import (
+    HOTKEY_COMBO, LOG_FILE, STATUS_PROMPTS,
+    STARTUP_MESSAGE, LISTENING_PROMPT, TASK_CONFIRMATION_TEMPLATE,
+    MISSING_FIELD_PROMPTS, CACHED_PROMPTS
 )
 
+# Configure logging: callers only enqueue records, a background listener
+# formats them and does the file and console I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler(LOG_FILE), logging.StreamHandler(sys.stdout)]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)])
+
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+# Flushes whatever is still queued at exit
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on waiting for a recording to end on its own (silence or duration)
+MAX_RECORD_SECS = 30
+
+# Synthesized sentences allowed to wait for playback
+SPEECH_READAHEAD = 2
+
+# A partial transcript this long (or ending a sentence) is parsed speculatively
+SPECULATE_MIN_WORDS = 12
+
+# pynput names for the modifier keys used in HOTKEY_COMBO
+_PYNPUT_MODIFIERS = {
+    'ctrl': '<ctrl>', 'control': '<ctrl>',
+    'shift': '<shift>',
+    'alt': '<alt>',
+    'cmd': '<cmd>', 'command': '<cmd>'
+}
+
+def _pynput_hotkey(combo) -> str:
+    """Translate a HOTKEY_COMBO entry to pynput's hotkey string, e.g. '<ctrl>+<shift>+v'"""
+    return '+'.join(_PYNPUT_MODIFIERS.get(key.lower(), key.lower()) for key in combo)
+
+# Hotkey strings per OS, translated once at import
+_HOTKEY_STRINGS = {os_name: _pynput_hotkey(combo) for os_name, combo in HOTKEY_COMBO.items()}
+
 class VoiceTaskManager:
     """Main voice task management system"""
     
@@ -38,6 +75,21 @@ class VoiceTaskManager:
         self.running = False
         self.current_recording = None
         self.recording_file = None
+        self._status_tts_enabled = STATUS_PROMPTS
+        self._os_name = platform.system().lower()
+        self.hotkey_listener = None
+        # Set by stop(); the main thread waits on it
+        self._shutdown = threading.Event()
+        
+        # Single worker so spoken responses never overlap and play in order
+        self._speech_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speech")
+        # Transcribes the main recording while it is still being captured
+        self._stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
+        # Watches partial transcripts and parses them ahead of the final one
+        self._parse_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="parse")
+        # Runs one voice input at a time; the future is the in-progress turn
+        self._voice_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice")
+        self._voice_future = None
         
         # Initialize components
         self._initialize_components()
@@ -84,73 +136,75 @@ class VoiceTaskManager:
                 logger.warning(f"OpenAI initialization failed, using mock: {e}")
                 self.ollama = MockOpenAIClient()
             
+            # Bind the synthesis entry point once the TTS backend is settled:
+            # TTSManager streams cached sentences, direct TTS yields one clip
+            if hasattr(self.tts, 'stream'):
+                self._synthesize_response = self.tts.stream
+            else:
+                self._synthesize_response = self._synthesize_whole
+            
             # Initialize Excel manager
             self.excel_manager = ExcelTaskManager()
             
+            # Warm up in the background so it overlaps the startup message
+            threading.Thread(target=self._warm_up, daemon=True).start()
+            
             logger.info("All components initialized successfully")
             
         except Exception as e:
             logger.error(f"Error initializing components: {e}")
             raise
     
+    def _warm_up(self):
+        """Pay STT, LLM and Excel cold-start costs before the first voice input (TTS warms up on load)"""
+        for name, component in (('STT', self.stt), ('LLM', self.ollama), ('Excel', self.excel_manager)):
+            if hasattr(component, 'warm_up'):
+                try:
+                    component.warm_up()
+                except Exception as e:
+                    logger.warning(f"{name} warm-up failed: {e}")
+    
     def _setup_hotkey_listener(self):
-        """Setup global hotkey listener"""
+        """Setup global hotkey listener (once; later calls keep the running listener)"""
+        if self.hotkey_listener is not None:
+            return
+        
+        # Determine OS and set appropriate hotkey
+        self._hotkey = _HOTKEY_STRINGS.get(self._os_name, _HOTKEY_STRINGS['windows'])
+        
         try:
             from pynput import keyboard
             
-            # Determine OS and set appropriate hotkey
-            os_name = platform.system().lower()
-            hotkey_combo = HOTKEY_COMBO.get(os_name, HOTKEY_COMBO['windows'])
-            
-            # Convert string keys to Key objects for pynput
-            key_objects = []
-            for key_str in hotkey_combo:
-                if key_str.lower() in ['ctrl', 'control']:
-                    key_objects.append(keyboard.Key.ctrl)
-                elif key_str.lower() in ['shift']:
-                    key_objects.append(keyboard.Key.shift)
-                elif key_str.lower() in ['alt']:
-                    key_objects.append(keyboard.Key.alt)
-                elif key_str.lower() in ['cmd', 'command']:
-                    key_objects.append(key_str)  # Keep as string for macOS
-                else:
-                    # Single character key
-                    key_objects.append(key_str)
-            
             # Setup hotkey listener
             def on_hotkey():
                 logger.info("Hotkey pressed - starting voice input")
                 self._handle_hotkey_press()
             
-            # Create hotkey tuple - pynput expects a tuple of keys
-            hotkey_tuple = tuple(key_objects)
-            logger.info(f"Setting up hotkey: {hotkey_tuple}")
+            logger.info(f"Setting up hotkey: {self._hotkey}")
             
-            # Create the hotkey listener
-            self.hotkey_listener = keyboard.GlobalHotKeys({hotkey_tuple: on_hotkey})
+            # Create the hotkey listener (pynput parses the string form itself)
+            self.hotkey_listener = keyboard.GlobalHotKeys({self._hotkey: on_hotkey})
             self.hotkey_listener.start()
-            logger.info(f"Hotkey listener active: {hotkey_tuple}")
+            logger.info(f"Hotkey listener active: {self._hotkey}")
             
         except ImportError:
             logger.error("pynput not available - hotkey functionality disabled")
             logger.info("Install with: pip install pynput")
         except Exception as e:
             logger.error(f"Error setting up hotkey listener: {e}")
-            logger.error(f"Hotkey combo: {hotkey_combo}")
-            logger.error(f"OS detected: {platform.system()}")
+            logger.error(f"Hotkey combo: {self._hotkey}")
+            logger.error(f"OS detected: {self._os_name}")
             # Try to continue without hotkey functionality
             logger.info("Continuing without hotkey functionality - you can still use voice commands directly")
     
     def _handle_hotkey_press(self):
         """Handle hotkey press event"""
-        if self.current_recording:
-            logger.warning("Recording already in progress, ignoring hotkey")
+        if self._voice_future and not self._voice_future.done():
+            logger.warning("Voice input already in progress, ignoring hotkey")
             return
         
-        # Start recording in a separate thread
-        recording_thread = threading.Thread(target=self._start_voice_input)
-        recording_thread.daemon = True
-        recording_thread.start()
+        # Start recording on the voice worker
+        self._voice_future = self._voice_executor.submit(self._start_voice_input)
     
     def _start_voice_input(self):
         """Start voice input process"""
@@ -158,21 +212,28 @@ class VoiceTaskManager:
             logger.info("Starting voice input process")
             
             # Speak confirmation
-            self._speak_response("Listening for your task. Please speak now.")
+            self._speak_response(LISTENING_PROMPT)
             
             # Start recording
-            self.recording_file = self.audio_recorder.start_recording()
+            self.recording_file = self.audio_recorder.start_recording(stream=True)
             self.current_recording = True
             
-            # Wait for recording to complete
-            while self.audio_recorder.is_recording():
-                time.sleep(0.1)
+            if self.recording_file:
+                # Transcribe while the user is still speaking
+                partials = queue.Queue()
+                stt_future = self._stt_executor.submit(
+                    self.stt.transcribe_stream, self.audio_recorder.frames_queue, partials
+                )
+                speculation = self._parse_executor.submit(self._speculate_parse, partials)
+                
+                # Wait for recording to complete
+                self.recording_file = self._wait_for_recording()
             
             self.current_recording = False
             
             if self.recording_file:
                 # Process the recording
-                self._process_voice_input(self.recording_file)
+                self._process_voice_input(self.recording_file, stt_future.result(), speculation.result())
             else:
                 logger.error("No recording file generated")
                 self._speak_response("Sorry, there was an error recording your voice.")
@@ -182,14 +243,60 @@ class VoiceTaskManager:
             self._speak_response("Sorry, there was an error processing your voice input.")
             self.current_recording = False
     
-    def _process_voice_input(self, audio_file: str):
-        """Process recorded voice input"""
+    def _wait_for_recording(self) -> Optional[str]:
+        """
+        Block until the recorder signals the recording is saved (stopping it on timeout)
+        
+        Returns:
+            Path to the finalized recording, or None if it never finished
+        """
+        audio_file = self.audio_recorder.wait_until_done(timeout=MAX_RECORD_SECS)
+        if audio_file is None:
+            logger.warning(f"Recording still running after {MAX_RECORD_SECS}s, stopping it")
+            self.audio_recorder.stop_recording()
+            audio_file = self.audio_recorder.wait_until_done(timeout=0)
+        return audio_file
+    
+    def _speculate_parse(self, partials: queue.Queue) -> Optional[Tuple[str, Future]]:
+        """
+        Start parsing and validating partial transcripts before the final one is known
+        
+        Args:
+            partials: Partial transcripts from transcribe_stream, ended by None
+            
+        Returns:
+            The last speculatively parsed text and its parse_and_validate future, or None
+        """
+        speculation = None
+        for text in iter(partials.get, None):
+            text = text.strip()
+            if not (text.endswith(('.', '?', '!')) or len(text.split()) >= SPECULATE_MIN_WORDS):
+                continue
+            if speculation and speculation[0] == text:
+                continue
+            if speculation:
+                speculation[1].cancel()
+            logger.info(f"Speculatively parsing partial transcript: {text}")
+            speculation = (text, self._parse_executor.submit(self.ollama.parse_and_validate, text))
+        return speculation
+    
+    def _process_voice_input(self, audio_file: str, stt_result: Optional[Dict[str, Any]] = None,
+                             speculation: Optional[Tuple[str, Future]] = None):
+        """
+        Process recorded voice input
+        
+        Args:
+            audio_file: Path to the recording
+            stt_result: Transcription already made while recording (transcribes audio_file if None)
+            speculation: Partial transcript already being parsed, and its parse_and_validate future
+        """
         try:
             logger.info(f"Processing voice input: {audio_file}")
             
             # Step 1: Convert speech to text
-            self._speak_response("Processing your voice input...")
-            stt_result = self.stt.transcribe_audio(audio_file)
+            if stt_result is None:
+                stt_result = self.stt.transcribe_audio(audio_file)
+            self._discard_recording(audio_file)
             
             if not stt_result['success']:
                 logger.error(f"STT failed: {stt_result.get('error', 'Unknown error')}")
@@ -199,9 +306,15 @@ class VoiceTaskManager:
             transcribed_text = stt_result['text']
             logger.info(f"Transcribed text: {transcribed_text}")
             
-            # Step 2: Parse task using Ollama
-            self._speak_response("Analyzing your task...")
-            parse_result = self.ollama.parse_task(transcribed_text)
+            # Step 2: Parse and validate the task in one call (the prompt plays while the model works)
+            self._speak_status("Analyzing your task...")
+            if speculation and speculation[0] == transcribed_text.strip():
+                logger.info("Final transcript matches the speculative parse")
+                parse_result = speculation[1].result()
+            else:
+                if speculation:
+                    speculation[1].cancel()
+                parse_result = self.ollama.parse_and_validate(transcribed_text)
             
             if not parse_result['success']:
                 # Handle missing fields or parsing errors
@@ -211,40 +324,49 @@ class VoiceTaskManager:
             task_data = parse_result['parsed_data']
             logger.info(f"Parsed task data: {task_data}")
             
-            # Step 3: Validate task data
-            validation_result = self.ollama.validate_task(task_data)
-            
-            if not validation_result['success']:
-                logger.error(f"Task validation failed: {validation_result}")
-                self._speak_response("The task data couldn't be validated. Please try again.")
-                return
+            # Step 3: Check the validation returned alongside the parse
+            validation_result = parse_result['validation_result']
             
-            if not validation_result['validation_result'].get('valid', False):
-                errors = validation_result['validation_result'].get('errors', [])
+            if not validation_result.get('valid', False):
+                errors = validation_result.get('errors', [])
                 error_message = f"Task validation failed: {', '.join(errors)}"
                 logger.error(error_message)
                 self._speak_response(error_message)
                 return
             
-            # Step 4: Add task to Excel
-            self._speak_response("Adding your task to the system...")
-            add_result = self.excel_manager.add_task(task_data)
+            # Build the confirmation first: if the payload can't fill it, nothing
+            # has been saved yet, so the generic retry prompt is accurate
+            confirmation_message = TASK_CONFIRMATION_TEMPLATE.format_map(task_data)
             
-            if not add_result['success']:
-                logger.error(f"Failed to add task: {add_result}")
-                self._speak_response("Sorry, there was an error adding your task. Please try again.")
-                return
+            # Step 4: Add task to Excel (written in the background)
+            self._speak_status("Adding your task to the system...")
+            self.excel_manager.enqueue_task(task_data).add_done_callback(self._on_task_saved)
             
             # Step 5: Confirm task addition
-            confirmation_message = f"Task added successfully! Your {task_data['priority']} priority task '{task_data['task']}' has been recorded and is due on {task_data['expected_date']}."
             self._speak_response(confirmation_message)
             
-            logger.info(f"Task added successfully: {add_result}")
-            
         except Exception as e:
             logger.error(f"Error processing voice input: {e}")
             self._speak_response("Sorry, there was an error processing your task. Please try again.")
     
+    def _on_task_saved(self, add_future: Future):
+        """Report the outcome of a background Excel write"""
+        add_result = add_future.result()
+        if add_result['success']:
+            logger.info(f"Task added successfully: {add_result}")
+        else:
+            logger.error(f"Failed to add task: {add_result}")
+            self._speak_response("Sorry, there was an error adding your task. Please try again.", wait=False)
+    
+    def _discard_recording(self, audio_file: str):
+        """Delete a recording once it has been transcribed"""
+        if self.recording_file == audio_file:
+            self.recording_file = None
+        try:
+            os.unlink(audio_file)
+        except OSError as e:
+            logger.debug(f"Could not delete recording {audio_file}: {e}")
+    
     def _handle_parsing_error(self, parse_result: Dict[str, Any]):
         """Handle parsing errors and prompt for missing information"""
         error_type = parse_result.get('error')
@@ -253,16 +375,7 @@ class VoiceTaskManager:
             field = parse_result.get('field', '')
             message = parse_result.get('message', '')
             
-            if field == 'task':
-                prompt = "I couldn't identify the task description. Please repeat the task more clearly."
-            elif field == 'assigned_by':
-                prompt = "Who assigned this task? Please specify the person's name."
-            elif field == 'priority':
-                prompt = "What priority level should this task have? Please say urgent, high, medium, or low."
-            elif field == 'expected_date':
-                prompt = "When is this task due? Please specify the completion date."
-            else:
-                prompt = f"Please provide the {field} information: {message}"
+            prompt = MISSING_FIELD_PROMPTS.get(field, f"Please provide the {field} information: {message}")
             
             self._speak_response(prompt)
             
@@ -282,8 +395,8 @@ class VoiceTaskManager:
             self.current_recording = True
             
             # Wait for recording to complete
-            while self.audio_recorder.is_recording():
-                time.sleep(0.1)
+            if self.recording_file:
+                self.recording_file = self._wait_for_recording()
             
             self.current_recording = False
             
@@ -304,6 +417,7 @@ class VoiceTaskManager:
         try:
             # Convert speech to text
             stt_result = self.stt.transcribe_audio(audio_file)
+            self._discard_recording(audio_file)
             
             if not stt_result['success']:
                 self._speak_response("Sorry, I couldn't understand your response. Please try again.")
@@ -320,27 +434,86 @@ class VoiceTaskManager:
             logger.error(f"Error processing missing information: {e}")
             self._speak_response("Sorry, there was an error processing your response.")
     
-    def _speak_response(self, text: str):
-        """Convert text to speech and play it"""
+    def _speak_response(self, text: str, wait: bool = True) -> Future:
+        """
+        Queue text to be spoken after any responses already queued
+        
+        Args:
+            text: Text to speak
+            wait: Block until this response has finished playing
+            
+        Returns:
+            Future that completes once the response has been played
+        """
+        future = self._speech_executor.submit(self._play_response, text)
+        if wait:
+            future.result()
+        return future
+    
+    def _speak_status(self, text: str):
+        """Speak an optional progress prompt without waiting for it"""
+        if self._status_tts_enabled:
+            self._speak_response(text, wait=False)
+    
+    def _play_response(self, text: str):
+        """Convert text to speech and play it, starting as soon as the first sentence is ready"""
         try:
             logger.info(f"Speaking response: {text}")
             
-            if hasattr(self.tts, 'speak'):
-                # Using TTSManager
-                result = self.tts.speak(text)
-            else:
-                # Using direct TTS
-                result = self.tts.generate_speech(text)
+            # Synthesis runs ahead on its own thread while earlier sentences play
+            chunks = queue.Queue(maxsize=SPEECH_READAHEAD)
             
-            if result['success']:
-                # Play the audio
-                self.audio_player.play_audio(result['output_file'])
-            else:
-                logger.error(f"TTS failed: {result.get('error', 'Unknown error')}")
+            def produce():
+                try:
+                    for result in self._synthesize_response(text):
+                        chunks.put(result)
+                except Exception as e:
+                    logger.error(f"Error synthesizing speech: {e}")
+                finally:
+                    chunks.put(None)
+            
+            threading.Thread(target=produce, daemon=True).start()
+            
+            for result in iter(chunks.get, None):
+                if result['success']:
+                    # Play the audio
+                    self.audio_player.play_audio(result['output_file'])
+                else:
+                    logger.error(f"TTS failed: {result.get('error', 'Unknown error')}")
                 
         except Exception as e:
             logger.error(f"Error in speech response: {e}")
     
+    def _cache_prompts(self):
+        """Start synthesizing the fixed prompts missing from the TTS cache (runs on the speech worker)"""
+        if not hasattr(self.tts, 'stream'):
+            return
+        missing = [prompt for prompt in CACHED_PROMPTS if not self.tts.is_cached(prompt, sentences=True)]
+        logger.info(f"{len(CACHED_PROMPTS) - len(missing)} of {len(CACHED_PROMPTS)} fixed prompts already cached")
+        if missing:
+            self._cache_next_prompt(missing)
+    
+    def _cache_next_prompt(self, prompts: List[str]):
+        """
+        Synthesize one prompt into the TTS cache, then requeue the rest
+        
+        Speech queued in the meantime runs first, so a hotkey press waits for
+        at most one prompt's synthesis rather than the whole list.
+        """
+        for result in self._synthesize_response(prompts[0]):
+            if not result['success']:
+                logger.warning(f"Could not pre-generate prompt: {prompts[0]}")
+        if len(prompts) > 1:
+            try:
+                self._speech_executor.submit(self._cache_next_prompt, prompts[1:])
+            except RuntimeError:
+                # Shutting down; the rest are generated on the next start
+                pass
+    
+    def _synthesize_whole(self, text: str) -> Iterator[Mapping[str, Any]]:
+        """Yield a single TTS result for the whole text (TTS without stream())"""
+        yield self.tts.generate_speech(text)
+    
     def handle_voice_query(self, query: str):
         """Handle voice queries about tasks"""
         try:
@@ -374,11 +547,17 @@ class VoiceTaskManager:
             self.running = True
             
             # Speak startup message
-            startup_message = "Voice Task Manager is now active. Press the hotkey to add a new task."
-            self._speak_response(startup_message)
+            self._speak_response(STARTUP_MESSAGE)
             
-            # Start hotkey listener in main thread
-            self._setup_hotkey_listener()
+            # Fill the TTS cache behind the startup message, on the same worker
+            self._speech_executor.submit(self._cache_prompts)
+            
+            # The listener was started in __init__; keep running until it stops.
+            # Wake once a second rather than joining it outright, so Ctrl+C
+            # still gets through on Windows
+            while not self._shutdown.wait(timeout=1.0):
+                if not (self.hotkey_listener and self.hotkey_listener.is_alive()):
+                    break
             
         except KeyboardInterrupt:
             logger.info("Received interrupt signal, shutting down...")
@@ -391,19 +570,29 @@ class VoiceTaskManager:
         """Stop the voice task manager"""
         logger.info("Stopping Voice Task Manager...")
         self.running = False
+        self._shutdown.set()
         
         # Stop any ongoing recording
         if self.current_recording:
             self.audio_recorder.stop_recording()
         
         # Stop hotkey listener
-        if hasattr(self, 'hotkey_listener') and self.hotkey_listener:
+        if self.hotkey_listener:
             try:
                 self.hotkey_listener.stop()
                 logger.info("Hotkey listener stopped")
             except Exception as e:
                 logger.error(f"Error stopping hotkey listener: {e}")
         
+        # Finish pending task writes (their callbacks may still queue a response)
+        self.excel_manager.flush()
+        
+        # Let queued responses finish before tearing down audio
+        self._speech_executor.shutdown(wait=True)
+        self._stt_executor.shutdown(wait=False)
+        self._parse_executor.shutdown(wait=False)
+        self._voice_executor.shutdown(wait=False)
+        
         # Cleanup components
         try:
             self.audio_recorder.cleanup()
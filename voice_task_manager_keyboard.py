@@ -3,13 +3,20 @@
 Alternative Voice Task Manager using keyboard library (more reliable on Windows)
 """
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-import time
 import threading
-from pathlib import Path
-from typing import Dict, Any, Optional
-import platform
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Mapping, Optional
+
+try:
+    import keyboard
+except ImportError:
+    keyboard = None
 
 # Import our modules
 from audio_recorder import AudioRecorder, AudioPlayer
@@ -17,33 +24,72 @@ from speech_to_text import SpeechToText, MockSTT
 from text_to_speech import TextToSpeech, MockTTS, TTSManager
 from openai_client import OpenAIClient, MockOpenAIClient
 from excel_manager import ExcelTaskManager
-from config import HOTKEY_COMBO, LOG_FILE
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
+from config import (
+    LOG_FILE, current_hotkey,
+    KEYBOARD_STARTUP_MESSAGE, GREETING_PROMPT, TASK_CONFIRMATION_TEMPLATE,
+    MISSING_FIELD_PROMPTS, CACHED_PROMPTS
 )
 
+# Configure logging: callers only enqueue records, a background listener
+# formats them and does the file and console I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler(LOG_FILE), logging.StreamHandler(sys.stdout)]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)])
+
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+# Flushes whatever is still queued at exit
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
+# Maximum length of the main recording before it is stopped automatically
+MAX_RECORDING_SECS = 30
+
+# How long to wait for a stopped recording to be written to disk
+RECORDING_SAVE_SECS = 2.0
+
+# Key that ends the main recording
+STOP_KEY = '2'
+
+# Length of the follow-up recording for a missing field, and how long to wait for it
+MISSING_INFO_RECORD_SECS = 10
+MISSING_INFO_WAIT_SECS = 12
+
+# Hotkey for this OS in the keyboard library's format, e.g. 'ctrl+shift+v'
+_HOTKEY_STRING = '+'.join(current_hotkey())
+
 class VoiceTaskManagerKeyboard:
     """Main voice task management system using keyboard library"""
     
     def __init__(self):
         """Initialize the voice task manager"""
         self.running = False
+        # Set by stop(); the main thread sleeps on it instead of polling
+        self._shutdown = threading.Event()
         self.current_recording = None
         self.recording_file = None
         self.hotkey_registered = False
         self.processing_audio = False  # Flag to prevent cleanup during processing
+        # Set by the stop key or by the recorder ending on silence
+        self._stop_event = threading.Event()
+        # Set only by the stop key, to tell it apart from the recorder's endpoint
+        self._stop_key_pressed = threading.Event()
+        # Single worker so TTS use and playback never overlap and stay in order
+        self._speech_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speech")
+        # Transcribes the main recording while it is still being captured
+        self._stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
+        # Runs one voice input at a time; the future is the in-progress turn
+        self._voice_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice")
+        self._voice_future: Optional[Future] = None
         
         # Initialize components
         self._initialize_components()
+        self.audio_recorder.on_endpoint = self._stop_event.set
         
         # Setup hotkey listener
         self._setup_hotkey_listener()
@@ -53,53 +99,31 @@ class VoiceTaskManagerKeyboard:
     def _initialize_components(self):
         """Initialize all system components"""
         try:
-            # Initialize audio components
-            self.audio_recorder = AudioRecorder()
-            self.audio_player = AudioPlayer()
-            
-            # Initialize STT (with fallback to mock)
-            try:
-                self.stt = SpeechToText()
-                if not self.stt.is_available():
-                    logger.warning("STT not available, using mock")
-                    self.stt = MockSTT()
-                else:
-                    logger.info("STT component initialized successfully")
-            except Exception as e:
-                logger.warning(f"STT initialization failed, using mock: {e}")
-                self.stt = MockSTT()
-                logger.info("Using MockSTT for testing")
-            
-            # Initialize TTS (with fallback to mock)
-            try:
-                logger.info("Initializing TTS component...")
-                self.tts = TTSManager()
-                logger.info(f"TTSManager created, checking availability...")
+            # Load the models, connect the API client and open the workbook in
+            # parallel; startup then takes as long as the slowest of them
+            with ThreadPoolExecutor(max_workers=4, thread_name_prefix="init") as pool:
+                stt_future = pool.submit(self._make_stt)
+                tts_future = pool.submit(self._make_tts)
+                ollama_future = pool.submit(self._make_ollama)
+                excel_future = pool.submit(ExcelTaskManager)
                 
-                if not self.tts.is_available():
-                    logger.warning("TTS not available, using mock")
-                    self.tts = MockTTS()
-                    logger.info("MockTTS initialized successfully")
-                else:
-                    logger.info("TTS component initialized successfully")
-                    
-            except Exception as e:
-                logger.warning(f"TTS initialization failed, using mock: {e}")
-                self.tts = MockTTS()
-                logger.info("Using MockTTS for testing")
-            
-            # Initialize OpenAI client (with fallback to mock)
-            try:
-                self.ollama = OpenAIClient()
-                if not self.ollama.is_connected():
-                    logger.warning("OpenAI not available, using mock")
-                    self.ollama = MockOpenAIClient()
-            except Exception as e:
-                logger.warning(f"OpenAI initialization failed, using mock: {e}")
-                self.ollama = MockOpenAIClient()
-            
-            # Initialize Excel manager
-            self.excel_manager = ExcelTaskManager()
+                # Initialize audio components here meanwhile (PortAudio setup
+                # is kept to one thread)
+                self.audio_recorder = AudioRecorder()
+                self.audio_player = AudioPlayer()
+                
+                self.stt = stt_future.result()
+                self.tts = tts_future.result()
+                self.ollama = ollama_future.result()
+                self.excel_manager = excel_future.result()
+            
+            # Resolve the synthesis call once: TTSManager streams cached
+            # sentences, direct TTS yields one clip
+            if hasattr(self.tts, 'stream'):
+                self._synthesize_response = self.tts.stream
+            else:
+                self._synthesize_response = self._synthesize_whole
+            logger.info(f"TTS type: {type(self.tts).__name__} (using {self._synthesize_response.__name__})")
             
             logger.info("All components initialized successfully")
             
@@ -107,49 +131,87 @@ class VoiceTaskManagerKeyboard:
             logger.error(f"Error initializing components: {e}")
             raise
     
-    def _setup_hotkey_listener(self):
-        """Setup global hotkey listener using keyboard library"""
+    def _make_stt(self):
+        """Create the STT component (with fallback to mock)"""
         try:
-            import keyboard
-            
-            # Determine OS and set appropriate hotkey
-            os_name = platform.system().lower()
-            hotkey_combo = HOTKEY_COMBO.get(os_name, HOTKEY_COMBO['windows'])
+            stt = SpeechToText()
+            if not stt.is_available():
+                logger.warning("STT not available, using mock")
+                return MockSTT()
+            logger.info("STT component initialized successfully")
+            return stt
+        except Exception as e:
+            logger.warning(f"STT initialization failed, using mock: {e}")
+            logger.info("Using MockSTT for testing")
+            return MockSTT()
+    
+    def _make_tts(self):
+        """Create the TTS component (with fallback to mock)"""
+        try:
+            logger.info("Initializing TTS component...")
+            tts = TTSManager()
+            logger.info(f"TTSManager created, checking availability...")
             
-            # Convert to keyboard library format
-            hotkey_string = '+'.join(hotkey_combo)
-            logger.info(f"Setting up hotkey: {hotkey_string}")
+            if not tts.is_available():
+                logger.warning("TTS not available, using mock")
+                logger.info("MockTTS initialized successfully")
+                return MockTTS()
+            logger.info("TTS component initialized successfully")
+            return tts
             
-            # Setup hotkey listener
-            def on_hotkey():
-                logger.info("Hotkey pressed - starting voice input")
-                self._handle_hotkey_press()
+        except Exception as e:
+            logger.warning(f"TTS initialization failed, using mock: {e}")
+            logger.info("Using MockTTS for testing")
+            return MockTTS()
+    
+    def _make_ollama(self):
+        """Create the OpenAI client (with fallback to mock)"""
+        try:
+            client = OpenAIClient()
+            if not client.is_connected():
+                logger.warning("OpenAI not available, using mock")
+                return MockOpenAIClient()
+            return client
+        except Exception as e:
+            logger.warning(f"OpenAI initialization failed, using mock: {e}")
+            return MockOpenAIClient()
+    
+    def _setup_hotkey_listener(self):
+        """Setup global hotkey listener using keyboard library"""
+        if keyboard is None:
+            logger.error("keyboard library not available - hotkey functionality disabled")
+            logger.info("Install with: pip install keyboard")
+            return
+        
+        try:
+            logger.info(f"Setting up hotkey: {_HOTKEY_STRING}")
             
-            # Register the hotkey
-            keyboard.add_hotkey(hotkey_string, on_hotkey)
+            # Register the hotkey with the bound handler (no wrapper closure). It is
+            # not suppressed: Ctrl+Shift+V is also "paste as plain text" elsewhere
+            keyboard.add_hotkey(_HOTKEY_STRING, self._handle_hotkey_press)
             self.hotkey_registered = True
-            logger.info(f"Hotkey listener active: {hotkey_string}")
+            logger.info(f"Hotkey listener active: {_HOTKEY_STRING}")
             
-        except ImportError:
-            logger.error("keyboard library not available - hotkey functionality disabled")
-            logger.info("Install with: pip install keyboard")
         except Exception as e:
             logger.error(f"Error setting up hotkey listener: {e}")
-            logger.error(f"Hotkey combo: {hotkey_combo}")
-            logger.error(f"OS detected: {platform.system()}")
+            logger.error(f"Hotkey combo: {_HOTKEY_STRING}")
             # Try to continue without hotkey functionality
             logger.info("Continuing without hotkey functionality - you can still use voice commands directly")
     
     def _handle_hotkey_press(self):
         """Handle hotkey press event"""
-        if self.current_recording:
-            logger.warning("Recording already in progress, ignoring hotkey")
+        logger.info("Hotkey pressed - starting voice input")
+        if self._voice_future and not self._voice_future.done():
+            logger.warning("Voice input already in progress, ignoring hotkey")
             return
         
-        # Start recording in a separate thread
-        recording_thread = threading.Thread(target=self._start_voice_input)
-        recording_thread.daemon = True
-        recording_thread.start()
+        # Start recording on the voice worker
+        self._voice_future = self._voice_executor.submit(self._start_voice_input)
+    
+    def _on_stop_key(self, *_):
+        """Stop the current recording (stop-key callback)"""
+        self._stop_key_pressed.set()
+        self._stop_event.set()
     
     def _start_voice_input(self):
         """Start voice input process"""
@@ -158,154 +220,193 @@ class VoiceTaskManagerKeyboard:
             self.processing_audio = True  # Set processing flag
             
             # Personalized greeting
-            self._speak_response("Hi Ankit, what task would you like to add?")
+            self._speak_response(GREETING_PROMPT)
             
             # Start recording
             logger.info("Starting audio recording...")
-            self.recording_file = self.audio_recorder.start_recording()
+            self._stop_event.clear()
+            self._stop_key_pressed.clear()
+            self.recording_file = self.audio_recorder.start_recording(stream=True)
             self.current_recording = True
             
-            logger.info(f"Recording file: {self.recording_file}")
-            # Wait for recording to complete (either by key press or timeout)
+            # Transcribe while the user is still speaking
+            stt_future = None
+            if self.recording_file and hasattr(self.stt, 'transcribe_stream'):
+                stt_future = self._stt_executor.submit(
+                    self.stt.transcribe_stream, self.audio_recorder.frames_queue
+                )
+            
+            logger.debug("Recording file: %s", self.recording_file)
+            # Wait for recording to complete (key press, silence or timeout)
             logger.info("Waiting for recording to complete...")
-            recording_start_time = time.time()
-            max_recording_time = 30  # Maximum 30 seconds
             
             print("\n🎤 RECORDING - Speak your task now!")
-            print("   Press '2' key to stop recording...")
+            print(f"   Press '{STOP_KEY}' key to stop recording...")
             
-            while self.audio_recorder.is_recording():
-                # Check if '2' key is pressed to stop recording
+            stop_hook = None
+            if keyboard is not None:
                 try:
-                    import keyboard
-                    if keyboard.is_pressed('2'):
-                        logger.info("Stop key '2' pressed - stopping recording")
-                        print("\n⏹️  Stop key pressed - stopping recording...")
-                        self.audio_recorder.stop_recording()
-                        break
-                except:
-                    pass
-                
-                # Check for timeout
-                if time.time() - recording_start_time > max_recording_time:
-                    logger.info("Maximum recording time reached - stopping recording")
-                    print("\n⏰ Timeout reached - stopping recording...")
-                    self.audio_recorder.stop_recording()
-                    break
-                
-                time.sleep(0.1)
+                    stop_hook = keyboard.on_press_key(STOP_KEY, self._on_stop_key)
+                except Exception as e:
+                    logger.warning("Stop key unavailable, recording ends on silence or timeout: %s", e)
+            
+            try:
+                stopped = self._stop_event.wait(timeout=MAX_RECORDING_SECS)
+            finally:
+                if stop_hook is not None:
+                    keyboard.unhook_key(stop_hook)
+            
+            if not stopped:
+                logger.info("Maximum recording time reached - stopping recording")
+                print("\n⏰ Timeout reached - stopping recording...")
+                self.audio_recorder.stop_recording()
+            elif self._stop_key_pressed.is_set():
+                # (After a silence endpoint the recorder is still finishing the
+                # WAV, so is_recording() can't tell the two apart)
+                logger.info("Stop key '%s' pressed - stopping recording", STOP_KEY)
+                print("\n⏹️  Stop key pressed - stopping recording...")
+                self.audio_recorder.stop_recording()
             
             print("\n✅ Recording stopped - processing audio...")
             logger.info("Recording completed, processing audio...")
             self.current_recording = False
             
-            # Small delay to ensure recording is fully stopped
-            time.sleep(0.5)
-            
+            # Wait for the recorder to finish writing the file (no fixed delay)
             if self.recording_file:
-                # Check if file exists and has content
-                from pathlib import Path
-                if Path(self.recording_file).exists():
-                    file_size = Path(self.recording_file).stat().st_size
-                    logger.info(f"Audio file size: {file_size} bytes")
-                    if file_size > 0:
-                        logger.info("Audio file is valid, processing...")
-                        # Process the recording
-                        self._process_voice_input(self.recording_file)
-                    else:
-                        logger.error("Audio file is empty!")
-                        self._speak_response("Sorry, the recording was empty. Please try again.")
+                self.recording_file = self.audio_recorder.wait_until_done(timeout=RECORDING_SAVE_SECS)
+            
+            audio_file = self.recording_file
+            if audio_file:
+                # Work from the recorder's in-memory samples, not the WAV on disk
+                pcm = self.audio_recorder.get_pcm()
+                logger.debug("Recorded %d samples", pcm.size)
+                if pcm.size > 0:
+                    logger.info("Audio is valid, processing...")
+                    stt_result = stt_future.result() if stt_future else self.stt.transcribe_pcm(pcm)
+                    # Keep the WAV only for post-mortem debugging
+                    if not logger.isEnabledFor(logging.DEBUG):
+                        self._discard_recording(audio_file)
+                    # Process the recording
+                    self._process_voice_input(audio_file, stt_result)
                 else:
-                    logger.error("Audio file not found!")
-                    self._speak_response("Sorry, there was an error saving the recording.")
+                    logger.error("Recording is empty!")
+                    self._speak_response("Sorry, the recording was empty. Please try again.")
             else:
                 logger.error("No recording file generated")
                 self._speak_response("Sorry, there was an error recording your voice.")
                 
-        except Exception as e:
-            logger.error(f"Error in voice input process: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+        except Exception:
+            logger.exception("Error in voice input process")
             self._speak_response("Sorry, there was an error processing your voice input.")
             self.current_recording = False
         finally:
             self.processing_audio = False  # Clear processing flag
     
-    def _process_voice_input(self, audio_file: str):
-        """Process recorded voice input"""
+    def _await_recording_complete(self, max_seconds: float) -> Optional[str]:
+        """
+        Block until the recorder has saved the current recording (stopping it on timeout)
+        
+        Args:
+            max_seconds: How long to wait before stopping the recording
+            
+        Returns:
+            Path to the finalized recording, or None if it never finished
+        """
+        audio_file = self.audio_recorder.wait_until_done(timeout=max_seconds)
+        if audio_file is None:
+            logger.warning("Recording still running after %ss, stopping it", max_seconds)
+            self.audio_recorder.stop_recording()
+            audio_file = self.audio_recorder.wait_until_done(timeout=0)
+        return audio_file
+    
+    def _discard_recording(self, audio_file: str):
+        """Delete a recording once it has been transcribed"""
+        if self.recording_file == audio_file:
+            self.recording_file = None
+        try:
+            os.unlink(audio_file)
+        except OSError as e:
+            logger.debug(f"Could not delete recording {audio_file}: {e}")
+    
+    def _process_voice_input(self, audio_file: str, stt_result: Optional[Dict[str, Any]] = None):
+        """
+        Process recorded voice input
+        
+        Args:
+            audio_file: Path to the recording
+            stt_result: Transcription already made while recording (transcribes audio_file if None)
+        """
         try:
-            logger.info(f"Processing voice input: {audio_file}")
+            logger.info("Processing voice input: %s", audio_file)
             
-            # Step 1: Convert speech to text
-            self._speak_response("Processing your voice input...")
+            # Step 1: Convert speech to text (the prompt plays while STT runs)
+            self._speak_response("Processing your voice input...", wait=False)
             logger.info("Starting speech-to-text conversion...")
             
-            stt_result = self.stt.transcribe_audio(audio_file)
-            logger.info(f"STT result: {stt_result}")
+            if stt_result is None:
+                stt_result = self.stt.transcribe_audio(audio_file)
+            logger.debug("STT result: %s", stt_result)
             
             if not stt_result['success']:
-                logger.error(f"STT failed: {stt_result.get('error', 'Unknown error')}")
+                logger.error("STT failed: %s", stt_result.get('error', 'Unknown error'))
                 self._speak_response("Sorry, I couldn't understand what you said. Please try again.")
                 return
             
             transcribed_text = stt_result['text']
-            logger.info(f"Transcribed text: '{transcribed_text}'")
+            logger.info("Transcribed text: '%s'", transcribed_text)
             
-            # Step 2: Parse task using OpenAI
-            self._speak_response("Analyzing your task...")
-            logger.info("Starting task parsing...")
+            # Step 2: Parse and validate the task in one OpenAI call (the prompt plays while the model works)
+            self._speak_response("Analyzing your task...", wait=False)
+            logger.info("Starting task parsing and validation...")
             
-            parse_result = self.ollama.parse_task(transcribed_text)
-            logger.info(f"Parse result: {parse_result}")
+            parse_result = self.ollama.parse_and_validate(transcribed_text)
+            logger.debug("Parse result: %s", parse_result)
             
             if not parse_result['success']:
                 # Handle missing fields or parsing errors
-                logger.warning(f"Task parsing failed: {parse_result}")
+                logger.warning("Task parsing failed: %s", parse_result)
                 self._handle_parsing_error(parse_result)
                 return
             
             task_data = parse_result['parsed_data']
-            logger.info(f"Parsed task data: {task_data}")
+            logger.debug("Parsed task data: %s", task_data)
             
-            # Step 3: Validate task data
-            logger.info("Starting task validation...")
-            validation_result = self.ollama.validate_task(task_data)
-            logger.info(f"Validation result: {validation_result}")
+            # Step 3: Check the validation returned alongside the parse
+            validation_result = parse_result['validation_result']
+            logger.debug("Validation result: %s", validation_result)
             
-            if not validation_result['success']:
-                logger.error(f"Task validation failed: {validation_result}")
-                self._speak_response("The task data couldn't be validated. Please try again.")
-                return
-            
-            if not validation_result['validation_result'].get('valid', False):
-                errors = validation_result['validation_result'].get('errors', [])
+            if not validation_result.get('valid', False):
+                errors = validation_result.get('errors', [])
                 error_message = f"Task validation failed: {', '.join(errors)}"
                 logger.error(error_message)
                 self._speak_response(error_message)
                 return
             
             # Step 4: Add task to Excel
-            self._speak_response("Adding your task to the system...")
-            logger.info("Adding task to Excel...")
+            self._speak_response("Adding your task to the system...", wait=False)
             
+            # Synthesize the confirmation into the TTS cache while the workbook is saved
+            # (only its variable sentence is new; the fixed prefix is already cached)
+            confirmation_message = TASK_CONFIRMATION_TEMPLATE.format_map(task_data)
+            if hasattr(self.tts, 'stream'):
+                self._speech_executor.submit(self._prefetch_response, confirmation_message)
+            
+            logger.info("Adding task to Excel...")
             add_result = self.excel_manager.add_task(task_data)
-            logger.info(f"Excel add result: {add_result}")
+            logger.debug("Excel add result: %s", add_result)
             
             if not add_result['success']:
-                logger.error(f"Failed to add task: {add_result}")
+                logger.error("Failed to add task: %s", add_result)
                 self._speak_response("Sorry, there was an error adding your task. Please try again.")
                 return
             
             # Step 5: Confirm task addition
-            confirmation_message = f"Task added successfully! Your {task_data['priority']} priority task '{task_data['task']}' has been recorded and is due on {task_data['expected_date']}."
             self._speak_response(confirmation_message)
             
-            logger.info(f"Task added successfully: {add_result}")
+            logger.info("Task added successfully: %s", add_result)
             
-        except Exception as e:
-            logger.error(f"Error processing voice input: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+        except Exception:
+            logger.exception("Error processing voice input")
             self._speak_response("Sorry, there was an error processing your task. Please try again.")
     
     def _handle_parsing_error(self, parse_result: Dict[str, Any]):
@@ -316,16 +417,7 @@ class VoiceTaskManagerKeyboard:
             field = parse_result.get('field', '')
             message = parse_result.get('message', '')
             
-            if field == 'task':
-                prompt = "I couldn't identify the task description. Please repeat the task more clearly."
-            elif field == 'assigned_by':
-                prompt = "Who assigned this task? Please specify the person's name."
-            elif field == 'priority':
-                prompt = "What priority level should this task have? Please say urgent, high, medium, or low."
-            elif field == 'expected_date':
-                prompt = "When is this task due? Please specify the completion date."
-            else:
-                prompt = f"Please provide the {field} information: {message}"
+            prompt = MISSING_FIELD_PROMPTS.get(field, f"Please provide the {field} information: {message}")
             
             self._speak_response(prompt)
             
@@ -341,12 +433,12 @@ class VoiceTaskManagerKeyboard:
             logger.info(f"Recording missing information for field: {field}")
             
             # Start recording for missing information
-            self.recording_file = self.audio_recorder.start_recording(duration=10)
+            self.recording_file = self.audio_recorder.start_recording(duration=MISSING_INFO_RECORD_SECS)
             self.current_recording = True
             
             # Wait for recording to complete
-            while self.audio_recorder.is_recording():
-                time.sleep(0.1)
+            if self.recording_file:
+                self.recording_file = self._await_recording_complete(MISSING_INFO_WAIT_SECS)
             
             self.current_recording = False
             
@@ -383,35 +475,72 @@ class VoiceTaskManagerKeyboard:
             logger.error(f"Error processing missing information: {e}")
             self._speak_response("Sorry, there was an error processing your response.")
     
-    def _speak_response(self, text: str):
+    def _speak_response(self, text: str, wait: bool = True) -> Future:
+        """
+        Queue text to be spoken after any responses already queued
+        
+        Args:
+            text: Text to speak
+            wait: Block until this response has finished playing
+            
+        Returns:
+            Future that completes once the response has been played
+        """
+        future = self._speech_executor.submit(self._play_response, text)
+        if wait:
+            future.result()
+        return future
+    
+    def _play_response(self, text: str):
         """Convert text to speech and play it"""
         try:
-            logger.info(f"Speaking response: {text}")
-            logger.info(f"TTS type: {type(self.tts).__name__}")
-            logger.info(f"TTS available: {self.tts.is_available()}")
-            
-            if hasattr(self.tts, 'speak'):
-                # Using TTSManager
-                logger.info("Using TTSManager.speak method")
-                result = self.tts.speak(text)
-            else:
-                # Using direct TTS
-                logger.info("Using direct TTS.generate_speech method")
-                result = self.tts.generate_speech(text)
-            
-            logger.info(f"TTS result: {result}")
-            
-            if result['success']:
-                # Play the audio
-                logger.info(f"Playing audio file: {result['output_file']}")
-                self.audio_player.play_audio(result['output_file'])
-            else:
-                logger.error(f"TTS failed: {result.get('error', 'Unknown error')}")
+            logger.info("Speaking response: %s", text)
+            for result in self._synthesize_response(text):
+                logger.debug("TTS result: %s", result)
                 
-        except Exception as e:
-            logger.error(f"Error in speech response: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+                if result['success']:
+                    # Play the audio
+                    logger.debug("Playing audio file: %s", result['output_file'])
+                    self.audio_player.play_audio(result['output_file'])
+                else:
+                    logger.error(f"TTS failed: {result.get('error', 'Unknown error')}")
+                
+        except Exception:
+            logger.exception("Error in speech response")
+    
+    def _synthesize_whole(self, text: str) -> Iterator[Mapping[str, Any]]:
+        """Yield a single TTS result for the whole text (TTS without stream())"""
+        yield self.tts.generate_speech(text)
+    
+    def _prefetch_response(self, text: str):
+        """Synthesize text into the TTS cache without playing it (runs on the speech worker)"""
+        for result in self.tts.stream(text):
+            if not result['success']:
+                logger.warning(f"Could not pre-generate response: {text}")
+    
+    def _cache_prompts(self):
+        """Start synthesizing the fixed prompts missing from the TTS cache (runs on the speech worker)"""
+        if not hasattr(self.tts, 'stream'):
+            return
+        missing = [prompt for prompt in CACHED_PROMPTS if not self.tts.is_cached(prompt, sentences=True)]
+        logger.info("%d of %d fixed prompts already cached", len(CACHED_PROMPTS) - len(missing), len(CACHED_PROMPTS))
+        if missing:
+            self._cache_next_prompt(missing)
+    
+    def _cache_next_prompt(self, prompts: List[str]):
+        """
+        Synthesize one prompt into the TTS cache, then requeue the rest
+        
+        Speech queued in the meantime runs first, so a hotkey press waits for
+        at most one prompt's synthesis rather than the whole list.
+        """
+        self._prefetch_response(prompts[0])
+        if len(prompts) > 1:
+            try:
+                self._speech_executor.submit(self._cache_next_prompt, prompts[1:])
+            except RuntimeError:
+                # Shutting down; the rest are generated on the next start
+                pass
     
     def handle_voice_query(self, query: str):
         """Handle voice queries about tasks"""
@@ -446,21 +575,25 @@ class VoiceTaskManagerKeyboard:
             self.running = True
             
             # Speak startup message
-            startup_message = "Voice Task Manager is now active. Press Ctrl+Shift+V to add a new task. When recording, press '2' to stop."
-            self._speak_response(startup_message)
+            self._speak_response(KEYBOARD_STARTUP_MESSAGE)
+            
+            # Fill the TTS cache behind the startup message, on the same worker
+            self._speech_executor.submit(self._cache_prompts)
             
             # Keep the main thread running
             logger.info("Voice Task Manager is running. Press Ctrl+C to stop.")
             try:
-                while self.running:
-                    time.sleep(0.1)
+                # Wake once a second rather than blocking outright, so Ctrl+C
+                # still gets through on Windows
+                while not self._shutdown.wait(timeout=1.0):
+                    pass
             except KeyboardInterrupt:
                 logger.info("Received interrupt signal, shutting down...")
                 # Don't stop immediately if processing audio
-                if self.processing_audio:
+                voice_future = self._voice_future
+                if voice_future and not voice_future.done():
                     logger.info("Audio processing in progress, waiting for completion...")
-                    while self.processing_audio and self.running:
-                        time.sleep(0.1)
+                    voice_future.result()
                     logger.info("Audio processing completed, proceeding with shutdown")
                 
         except Exception as e:
@@ -472,22 +605,24 @@ class VoiceTaskManagerKeyboard:
         """Stop the voice task manager"""
         logger.info("Stopping Voice Task Manager...")
         self.running = False
+        self._shutdown.set()
         
         # Stop any ongoing recording
         if self.current_recording:
             self.audio_recorder.stop_recording()
         
-        # Wait for audio processing to complete
+        # Wait for the voice input in progress (if any) to complete
         if self.processing_audio:
             logger.info("Waiting for audio processing to complete...")
-            while self.processing_audio:
-                time.sleep(0.1)
-            logger.info("Audio processing completed")
+        self._voice_executor.shutdown(wait=True)
+        
+        # Let queued responses finish before tearing down audio
+        self._speech_executor.shutdown(wait=True)
+        self._stt_executor.shutdown(wait=False)
         
         # Unhook keyboard hotkeys
         if self.hotkey_registered:
             try:
-                import keyboard
                 keyboard.unhook_all()
                 logger.info("Keyboard hotkeys unhooked")
             except Exception as e:
@@ -4,48 +4,120 @@ Universal Voice Task Manager - Cross-platform (Windows, macOS, Linux)
 Automatically detects OS and uses appropriate hotkey library
 """
 
+import atexit
 import os
 import sys
-import time
 import logging
+import logging.handlers
+import platform
+import queue
 import threading
-import traceback
-from pathlib import Path
-from typing import Optional, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 
-# Add current directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent))
-
-from config import HOTKEY_COMBO, AUDIO_CONFIG, TEMP_DIR
-from audio_recorder import AudioRecorder
+from config import HOTKEY_COMBO, AUDIO_CONFIG, TEMP_DIR, LOG_FILE, STARTUP_MESSAGE, GREETING_PROMPT, CACHED_PROMPTS
+from audio_recorder import AudioRecorder, AudioPlayer
 from speech_to_text import SpeechToText
-from text_to_speech import TextToSpeech
+from text_to_speech import TTSManager
 from openai_client import OpenAIClient
+from task_parser import FastTaskParser
 from excel_manager import ExcelTaskManager
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(Path.home() / '.voice_task_manager' / 'logs' / 'voice_task_manager.log'),
-        logging.StreamHandler()
-    ]
-)
+# The OS doesn't change at runtime; detect it once
+_SYSTEM = platform.system().lower()
+
+# The keyboard library is only used on Windows (pynput everywhere else)
+keyboard = None
+if _SYSTEM == "windows":
+    try:
+        import keyboard
+    except ImportError:
+        pass
 
 logger = logging.getLogger(__name__)
 
+def _configure_logging():
+    """
+    Send log records through a queue to a background listener
+    
+    Callers only enqueue records; the listener formats them and does the
+    file and console I/O (the file opens on first write). Called from main()
+    so importing this module has no logging side effects.
+    """
+    log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    log_handlers = [logging.FileHandler(LOG_FILE, delay=True), logging.StreamHandler()]
+    for handler in log_handlers:
+        handler.setFormatter(log_formatter)
+    
+    log_queue = queue.Queue(-1)
+    logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)])
+    
+    log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+    log_listener.start()
+    # Flushes whatever is still queued at exit
+    atexit.register(log_listener.stop)
+
+# pynput names for the modifier keys used in HOTKEY_COMBO
+_PYNPUT_KEYNAMES = {
+    'ctrl': '<ctrl>',
+    'shift': '<shift>',
+    'alt': '<alt>',
+    'cmd': '<cmd>'
+}
+
+def _pynput_hotkey(combo) -> str:
+    """Translate a HOTKEY_COMBO entry to pynput's hotkey string, e.g. '<ctrl>+<shift>+v'"""
+    return '+'.join(_PYNPUT_KEYNAMES.get(key, key) for key in combo)
+
+# Maximum length of a recording before it is stopped automatically
+MAX_RECORDING_SECS = 30
+
+# How long to wait for a stopped recording to be written to disk
+RECORDING_SAVE_SECS = 2.0
+
+# Key that ends the recording
+STOP_KEY = '2'
+
+# Transcripts shorter than this can't describe a task
+MIN_TASK_WORDS = 3
+
 class UniversalVoiceTaskManager:
     """Cross-platform voice task management system"""
     
     def __init__(self):
+        # Components (set by _initialize_components / hotkey setup)
+        self.audio_recorder = self.audio_player = self.stt = self.tts = None
+        self.openai_client = self.excel_manager = self.hotkey_listener = None
         self.running = False
         self.current_recording = False
         self.recording_file = None
         self.processing_audio = False
+        # Set by stop(); the main thread sleeps on it instead of polling
+        self._shutdown_event = threading.Event()
+        # Cleared while a voice input is being processed
+        self._processing_done = threading.Event()
+        self._processing_done.set()
+        self._system = _SYSTEM
+        self._is_windows = self._system == "windows"
+        # Set by the stop key or by the recorder ending on silence
+        self._stop_event = threading.Event()
+        # Set only by the stop key, to tell it apart from the recorder's endpoint
+        self._stop_key_pressed = threading.Event()
+        # Single worker so TTS use and playback never overlap and stay in order
+        self._speech_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speech")
+        # Transcribes the recording while it is still being captured
+        self._stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
+        # Runs each voice turn, so hotkey callbacks return right away and the
+        # keyboard library's dispatch thread stays free to deliver the stop key
+        self._voice_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice")
+        self._voice_future: Optional[Future] = None
+        # Handles the common phrasing locally; everything else goes to OpenAI
+        self._fast_parser = FastTaskParser()
+        self._openai_fallback_count = 0
         
         # Initialize components
         self._initialize_components()
+        self.audio_recorder.on_endpoint = self._stop_event.set
         
         # Setup hotkey based on OS
         self._setup_cross_platform_hotkey()
@@ -58,319 +130,368 @@ class UniversalVoiceTaskManager:
             # Create temp directory
             TEMP_DIR.mkdir(parents=True, exist_ok=True)
             
-            # Initialize audio recorder
-            logger.info("Initializing audio recorder...")
-            self.audio_recorder = AudioRecorder()
-            logger.info("Audio recorder initialized successfully")
-            
-            # Initialize STT component
-            logger.info("Initializing STT component...")
-            self.stt = SpeechToText()
-            if self.stt.is_available():
-                logger.info("STT component initialized successfully")
-            else:
-                logger.warning("STT not available, using mock")
-                from speech_to_text import MockSTT
-                self.stt = MockSTT()
-                logger.info("MockSTT initialized successfully")
-            
-            # Initialize TTS component
-            logger.info("Initializing TTS component...")
-            self.tts = TextToSpeech()
-            if self.tts.is_available():
-                logger.info("TTS component initialized successfully")
-            else:
-                logger.warning("TTS not available, using mock")
-                from text_to_speech import MockTTS
-                self.tts = MockTTS()
-                logger.info("MockTTS initialized successfully")
-            
-            # Initialize OpenAI client
-            logger.info("Initializing OpenAI client...")
-            self.openai_client = OpenAIClient()
-            logger.info("OpenAI client initialized successfully")
+            # Load the models, create the API client and open the workbook in
+            # parallel; startup then takes as long as the slowest of them
+            with ThreadPoolExecutor(max_workers=4, thread_name_prefix="init") as pool:
+                stt_future = pool.submit(self._make_stt)
+                tts_future = pool.submit(self._make_tts)
+                openai_future = pool.submit(self._make_openai_client)
+                excel_future = pool.submit(self._make_excel_manager)
+                
+                # Initialize audio components on this thread meanwhile
+                logger.info("Initializing audio recorder...")
+                self.audio_recorder = AudioRecorder()
+                logger.info("Audio recorder initialized successfully")
+                self.audio_player = AudioPlayer()
+                
+                self.stt = stt_future.result()
+                self.tts = tts_future.result()
+                self.openai_client = openai_future.result()
+                self.excel_manager = excel_future.result()
             
-            # Initialize Excel manager
-            logger.info("Initializing Excel manager...")
-            self.excel_manager = ExcelTaskManager()
-            logger.info("Excel manager initialized successfully")
+            # Warm up in the background so it overlaps the startup message
+            threading.Thread(target=self._warm_up, daemon=True).start()
             
             logger.info("All components initialized successfully")
             
         except Exception as e:
-            logger.error(f"Error initializing components: {e}")
-            logger.error(traceback.format_exc())
+            logger.error("Error initializing components: %s", e, exc_info=True)
             raise
     
+    def _warm_up(self):
+        """Pay STT, LLM and Excel cold-start costs before the first voice input (TTS warms up on load)"""
+        for name, component in (('STT', self.stt), ('LLM', self.openai_client), ('Excel', self.excel_manager)):
+            if hasattr(component, 'warm_up'):
+                try:
+                    component.warm_up()
+                except Exception as e:
+                    logger.warning("%s warm-up failed: %s", name, e)
+    
+    def _make_stt(self):
+        """Create the STT component (with fallback to mock)"""
+        logger.info("Initializing STT component...")
+        stt = SpeechToText()
+        if stt.is_available():
+            logger.info("STT component initialized successfully")
+            return stt
+        logger.warning("STT not available, using mock")
+        from speech_to_text import MockSTT
+        logger.info("MockSTT initialized successfully")
+        return MockSTT()
+    
+    def _make_tts(self):
+        """Create the TTS component (with fallback to mock)"""
+        # Cached, so fixed prompts are synthesized once
+        logger.info("Initializing TTS component...")
+        tts = TTSManager()
+        if tts.is_available():
+            logger.info("TTS component initialized successfully")
+            return tts
+        logger.warning("TTS not available, using mock")
+        from text_to_speech import MockTTS
+        logger.info("MockTTS initialized successfully")
+        return MockTTS()
+    
+    def _make_openai_client(self):
+        """Create the OpenAI client"""
+        logger.info("Initializing OpenAI client...")
+        client = OpenAIClient()
+        logger.info("OpenAI client initialized successfully")
+        return client
+    
+    def _make_excel_manager(self):
+        """Create the Excel manager"""
+        logger.info("Initializing Excel manager...")
+        excel_manager = ExcelTaskManager()
+        logger.info("Excel manager initialized successfully")
+        return excel_manager
+    
     def _setup_cross_platform_hotkey(self):
         """Setup hotkey based on operating system"""
-        import platform
-        system = platform.system().lower()
+        logger.info("Detected operating system: %s", self._system)
         
-        logger.info(f"Detected operating system: {system}")
-        
-        if system == "darwin":  # macOS
-            self._setup_macos_hotkey()
-        elif system == "windows":
+        if self._system == "darwin":  # macOS
+            self._setup_pynput_hotkey('macos', "macOS")
+        elif self._is_windows:
             self._setup_windows_hotkey()
         else:  # Linux and others
-            self._setup_linux_hotkey()
+            self._setup_pynput_hotkey('linux', "Linux")
     
-    def _setup_macos_hotkey(self):
-        """Setup hotkey for macOS using pynput"""
+    def _setup_pynput_hotkey(self, os_key: str, os_label: str):
+        """
+        Setup hotkey using pynput (macOS and Linux)
+        
+        Args:
+            os_key: HOTKEY_COMBO entry to use (falls back to Ctrl+Shift+V)
+            os_label: OS name for log messages
+        """
         try:
             from pynput import keyboard
             
-            # Use macOS-specific hotkey (Cmd+Shift+V)
-            hotkey = HOTKEY_COMBO.get('macos', ['cmd', 'shift', 'v'])
-            logger.info(f"Setting up macOS hotkey: {'+'.join(hotkey)}")
-            
-            # Convert to pynput format
-            key_objects = []
-            for key_str in hotkey:
-                if key_str == 'cmd':
-                    key_objects.append(keyboard.Key.cmd)
-                elif key_str == 'ctrl':
-                    key_objects.append(keyboard.Key.ctrl)
-                elif key_str == 'shift':
-                    key_objects.append(keyboard.Key.shift)
-                elif key_str == 'alt':
-                    key_objects.append(keyboard.Key.alt)
-                else:
-                    key_objects.append(key_str)
+            hotkey = HOTKEY_COMBO.get(os_key, ['ctrl', 'shift', 'v'])
+            logger.info("Setting up %s hotkey: %s", os_label, '+'.join(hotkey))
             
-            hotkey_tuple = tuple(key_objects)
-            logger.info(f"Hotkey tuple: {hotkey_tuple}")
+            # Convert to pynput's hotkey format, e.g. '<ctrl>+<shift>+v'
+            hotkey_string = _pynput_hotkey(hotkey)
+            logger.info("Hotkey string: %s", hotkey_string)
             
             # Setup global hotkey listener
-            self.hotkey_listener = keyboard.GlobalHotKeys({hotkey_tuple: self._on_hotkey})
+            self.hotkey_listener = keyboard.GlobalHotKeys({hotkey_string: self._on_hotkey})
             self.hotkey_listener.start()
             
-            logger.info(f"macOS hotkey listener active: {'+'.join(hotkey)}")
+            logger.info("%s hotkey listener active: %s", os_label, '+'.join(hotkey))
             
         except ImportError:
-            logger.error("pynput not available for macOS hotkey - install with: pip install pynput")
+            logger.error("pynput not available for %s hotkey - install with: pip install pynput", os_label)
             self.hotkey_listener = None
         except Exception as e:
-            logger.error(f"Error setting up macOS hotkey: {e}")
-            logger.error(traceback.format_exc())
+            logger.error("Error setting up %s hotkey: %s", os_label, e, exc_info=True)
             self.hotkey_listener = None
     
     def _setup_windows_hotkey(self):
         """Setup hotkey for Windows using keyboard library"""
+        if keyboard is None:
+            logger.error("keyboard library not available for Windows hotkey - install with: pip install keyboard")
+            return
+        
         try:
-            import keyboard
-            
             # Use Windows-specific hotkey (Ctrl+Shift+V)
             hotkey = HOTKEY_COMBO.get('windows', ['ctrl', 'shift', 'v'])
-            logger.info(f"Setting up Windows hotkey: {'+'.join(hotkey)}")
+            logger.info("Setting up Windows hotkey: %s", '+'.join(hotkey))
             
             # Convert to keyboard library format
             hotkey_string = '+'.join(hotkey)
-            logger.info(f"Hotkey string: {hotkey_string}")
+            logger.info("Hotkey string: %s", hotkey_string)
             
             # Setup global hotkey listener
             keyboard.add_hotkey(hotkey_string, self._on_hotkey)
             
-            logger.info(f"Windows hotkey listener active: {hotkey_string}")
+            logger.info("Windows hotkey listener active: %s", hotkey_string)
             
-        except ImportError:
-            logger.error("keyboard library not available for Windows hotkey - install with: pip install keyboard")
         except Exception as e:
-            logger.error(f"Error setting up Windows hotkey: {e}")
-            logger.error(traceback.format_exc())
-    
-    def _setup_linux_hotkey(self):
-        """Setup hotkey for Linux using pynput"""
-        try:
-            from pynput import keyboard
-            
-            # Use Linux-specific hotkey (Ctrl+Shift+V)
-            hotkey = HOTKEY_COMBO.get('linux', ['ctrl', 'shift', 'v'])
-            logger.info(f"Setting up Linux hotkey: {'+'.join(hotkey)}")
-            
-            # Convert to pynput format
-            key_objects = []
-            for key_str in hotkey:
-                if key_str == 'ctrl':
-                    key_objects.append(keyboard.Key.ctrl)
-                elif key_str == 'shift':
-                    key_objects.append(keyboard.Key.shift)
-                elif key_str == 'alt':
-                    key_objects.append(keyboard.Key.alt)
-                else:
-                    key_objects.append(key_str)
-            
-            hotkey_tuple = tuple(key_objects)
-            logger.info(f"Hotkey tuple: {hotkey_tuple}")
-            
-            # Setup global hotkey listener
-            self.hotkey_listener = keyboard.GlobalHotKeys({hotkey_tuple: self._on_hotkey})
-            self.hotkey_listener.start()
-            
-            logger.info(f"Linux hotkey listener active: {'+'.join(hotkey)}")
-            
-        except ImportError:
-            logger.error("pynput not available for Linux hotkey - install with: pip install pynput")
-            self.hotkey_listener = None
-        except Exception as e:
-            logger.error(f"Error setting up Linux hotkey: {e}")
-            logger.error(traceback.format_exc())
-            self.hotkey_listener = None
+            logger.error("Error setting up Windows hotkey: %s", e, exc_info=True)
     
     def _on_hotkey(self):
         """Handle hotkey press"""
-        if self.current_recording:
-            logger.info("Hotkey pressed while already recording - ignoring")
+        if self._voice_future and not self._voice_future.done():
+            logger.info("Hotkey pressed while voice input is in progress - ignoring")
             return
         
         logger.info("Hotkey pressed - starting voice input")
-        self._start_voice_input()
+        # Start recording on the voice worker
+        self._voice_future = self._voice_executor.submit(self._start_voice_input)
     
     def _start_voice_input(self):
         """Start voice input process"""
         try:
             logger.info("Starting voice input process")
             self.processing_audio = True  # Set processing flag
+            self._processing_done.clear()
             
             # Personalized greeting
-            self._speak_response("Hi Ankit, what task would you like to add?")
+            self._speak_response(GREETING_PROMPT)
             
             # Start recording
-            self.recording_file = self.audio_recorder.start_recording()
+            self._stop_event.clear()
+            self._stop_key_pressed.clear()
+            self.recording_file = self.audio_recorder.start_recording(stream=True)
             if not self.recording_file:
                 logger.error("Failed to start recording")
                 return
             
+            # Transcribe while the user is still speaking
+            stt_future = None
+            if hasattr(self.stt, 'transcribe_stream'):
+                stt_future = self._stt_executor.submit(
+                    self.stt.transcribe_stream, self.audio_recorder.frames_queue
+                )
+            
             self.current_recording = True
-            logger.info(f"Recording file: {self.recording_file}")
-            logger.info("Press '2' key to stop recording...")
+            logger.debug("Recording file: %s", self.recording_file)
+            logger.info("Press '%s' key to stop recording...", STOP_KEY)
             
-            # Wait for recording to complete (either by key press or timeout)
+            # Wait for recording to complete (key press, silence or timeout)
             logger.info("Waiting for recording to complete...")
-            recording_start_time = time.time()
-            max_recording_time = 30  # Maximum 30 seconds
             
             print("\n🎤 RECORDING - Speak your task now!")
-            print("   Press '2' key to stop recording...")
+            print(f"   Press '{STOP_KEY}' key to stop recording...")
             
-            while self.audio_recorder.is_recording():
-                # Check if '2' key is pressed to stop recording
-                try:
-                    import platform
-                    system = platform.system().lower()
-                    
-                    if system == "windows":
-                        import keyboard
-                        if keyboard.is_pressed('2'):
-                            logger.info("Stop key '2' pressed - stopping recording")
-                            print("\n⏹️  Stop key pressed - stopping recording...")
-                            self.audio_recorder.stop_recording()
-                            break
-                    else:
-                        # For macOS/Linux, we'll use timeout-based recording
-                        # since we can't easily detect key presses without pynput
-                        pass
-                        
-                except:
-                    pass
-                
-                # Check for timeout
-                if time.time() - recording_start_time > max_recording_time:
-                    logger.info("Maximum recording time reached - stopping recording")
-                    print("\n⏰ Timeout reached - stopping recording...")
-                    self.audio_recorder.stop_recording()
-                    break
-                
-                time.sleep(0.1)
+            # The stop key is hooked only for the length of the recording
+            remove_stop_listener = self._start_stop_key_listener()
+            try:
+                stopped = self._stop_event.wait(timeout=MAX_RECORDING_SECS)
+            finally:
+                if remove_stop_listener is not None:
+                    remove_stop_listener()
+            
+            if not stopped:
+                logger.info("Maximum recording time reached - stopping recording")
+                print("\n⏰ Timeout reached - stopping recording...")
+                self.audio_recorder.stop_recording()
+            elif self._stop_key_pressed.is_set():
+                # (After a silence endpoint the recorder is still finishing the
+                # WAV, so is_recording() can't tell the two apart)
+                logger.info("Stop key '%s' pressed - stopping recording", STOP_KEY)
+                print("\n⏹️  Stop key pressed - stopping recording...")
+                self.audio_recorder.stop_recording()
             
             print("\n✅ Recording stopped - processing audio...")
             logger.info("Recording completed, processing audio...")
             self.current_recording = False
             
-            # Small delay to ensure recording is fully stopped
-            time.sleep(0.5)
-            
             if self.recording_file:
-                self._process_voice_input(self.recording_file)
+                if stt_future is not None:
+                    stt_result = stt_future.result()
+                else:
+                    # Transcribing from disk: wait for the WAV to be written
+                    self.audio_recorder.wait_until_done(timeout=RECORDING_SAVE_SECS)
+                    stt_result = None
+                self._process_voice_input(self.recording_file, stt_result)
             
         except Exception as e:
-            logger.error(f"Error in voice input: {e}")
-            logger.error(traceback.format_exc())
-            self._speak_response("Sorry, there was an error processing your voice input")
+            logger.error("Error in voice input: %s", e, exc_info=True)
+            self._speak_response("Sorry, there was an error processing your voice input", wait=False)
         finally:
             self.processing_audio = False  # Clear processing flag
+            self._processing_done.set()
+    
+    def _on_stop_key(self, *_):
+        """Stop the current recording (stop-key callback)"""
+        self._stop_key_pressed.set()
+        self._stop_event.set()
     
-    def _process_voice_input(self, audio_file: str):
-        """Process recorded voice input"""
+    def _start_stop_key_listener(self):
+        """
+        Listen for the stop key (keyboard hook on Windows, pynput elsewhere)
+        
+        Returns:
+            Function that removes the listener, or None if no listener could be started
+        """
+        if self._is_windows:
+            if keyboard is None:
+                return None
+            try:
+                stop_hook = keyboard.on_press_key(STOP_KEY, self._on_stop_key)
+            except Exception as e:
+                logger.warning("Stop key unavailable, recording ends on silence or timeout: %s", e)
+                return None
+            return lambda: keyboard.unhook_key(stop_hook)
+        
+        try:
+            from pynput import keyboard as pynput_keyboard
+        except ImportError:
+            logger.warning("pynput not available - recording ends on silence or timeout")
+            return None
+        
+        stop_key = pynput_keyboard.KeyCode.from_char(STOP_KEY)
+        
+        def on_press(key):
+            if key == stop_key:
+                self._on_stop_key()
+        
+        listener = pynput_keyboard.Listener(on_press=on_press)
+        listener.start()
+        return listener.stop
+    
+    def _process_voice_input(self, audio_file: str, stt_result: Optional[Dict[str, Any]] = None):
+        """
+        Process recorded voice input
+        
+        Args:
+            audio_file: Path to the recording
+            stt_result: Transcription already made while recording (transcribes audio_file if None)
+        """
         try:
             logger.info("Processing voice input...")
             
             # Convert speech to text
-            logger.info("Converting speech to text...")
-            stt_result = self.stt.transcribe(audio_file)
+            if stt_result is None:
+                logger.info("Converting speech to text...")
+                stt_result = self.stt.transcribe_audio(audio_file)
             
             if not stt_result['success']:
-                logger.error(f"STT failed: {stt_result.get('error')}")
-                self._speak_response("Sorry, I couldn't understand what you said. Please try again.")
+                logger.error("STT failed: %s", stt_result.get('error'))
+                self._speak_response("Sorry, I couldn't understand what you said. Please try again.", wait=False)
                 return
             
             text = stt_result['text']
-            logger.info(f"Transcribed text: {text}")
+            logger.debug("Transcribed text: %s", text)
             
-            if not text.strip():
-                self._speak_response("I didn't hear anything. Please try again.")
+            # Silence or a stray word: answer with the cached prompt, no OpenAI call
+            if len(text.split()) < MIN_TASK_WORDS:
+                self._speak_response("I didn't hear anything. Please try again.", wait=False)
                 return
             
-            # Parse task using OpenAI
-            logger.info("Parsing task with OpenAI...")
-            parse_result = self.openai_client.parse_task(text)
+            parse_result = self._fast_parser.parse(text)
+            if parse_result is None:
+                # Parse and validate the task in a single OpenAI call
+                self._openai_fallback_count += 1
+                logger.info("Parsing and validating task with OpenAI (fallback #%d)...", self._openai_fallback_count)
+                parse_result = self.openai_client.parse_and_validate(text)
             
             if not parse_result['success']:
-                logger.error(f"Task parsing failed: {parse_result.get('error')}")
-                self._speak_response(f"Sorry, I couldn't parse your request: {parse_result.get('error')}")
+                logger.error("Task parsing failed: %s", parse_result.get('error'))
+                self._speak_response(f"Sorry, I couldn't parse your request: {parse_result.get('error')}", wait=False)
                 return
             
-            task_data = parse_result['task_data']
-            logger.info(f"Parsed task data: {task_data}")
-            
-            # Validate task data
-            logger.info("Validating task data...")
-            validation_result = self.openai_client.validate_task(task_data)
+            task_data = parse_result['parsed_data']
+            logger.debug("Parsed task data: %s", task_data)
             
-            if not validation_result['success']:
-                logger.error(f"Task validation failed: {validation_result.get('error')}")
-                self._speak_response(f"Sorry, I couldn't validate your task: {validation_result.get('error')}")
+            validation_result = parse_result['validation_result']
+            if not validation_result.get('valid', False):
+                errors = ', '.join(validation_result.get('errors', []))
+                logger.error("Task validation failed: %s", errors)
+                self._speak_response(f"Sorry, I couldn't validate your task: {errors}", wait=False)
                 return
             
-            # Add task to Excel
+            # Add task to Excel (written in the background while the confirmation plays)
             logger.info("Adding task to Excel...")
-            add_result = self.excel_manager.add_task(task_data)
-            
-            if not add_result['success']:
-                logger.error(f"Failed to add task: {add_result.get('error')}")
-                self._speak_response("Sorry, I couldn't save your task. Please try again.")
-                return
+            self.excel_manager.enqueue_task(task_data).add_done_callback(self._on_task_saved)
             
             # Success response
             task_summary = f"Task added successfully: {task_data.get('task', 'Unknown task')}"
             logger.info(task_summary)
-            self._speak_response(task_summary)
+            # Played by the speech worker; the hotkey is free again right away
+            self._speak_response(task_summary, wait=False)
             
         except Exception as e:
-            logger.error(f"Error processing voice input: {e}")
-            logger.error(traceback.format_exc())
-            self._speak_response("Sorry, there was an error processing your task. Please try again.")
+            logger.error("Error processing voice input: %s", e, exc_info=True)
+            self._speak_response("Sorry, there was an error processing your task. Please try again.", wait=False)
+    
+    def _on_task_saved(self, add_future: Future):
+        """Report the outcome of a background Excel write"""
+        add_result = add_future.result()
+        if add_result['success']:
+            logger.info("Task saved: %s", add_result)
+        else:
+            logger.error("Failed to add task: %s", add_result.get('error'))
+            self._speak_response("Sorry, I couldn't save your task. Please try again.", wait=False)
     
-    def _speak_response(self, text: str):
-        """Speak a response using TTS"""
+    def _speak_response(self, text: str, wait: bool = True) -> Future:
+        """
+        Queue text to be spoken after any responses already queued
+        
+        Args:
+            text: Text to speak
+            wait: Block until this response has finished playing
+            
+        Returns:
+            Future that completes once the response has been played
+        """
+        future = self._speech_executor.submit(self._play_response, text)
+        if wait:
+            future.result()
+        return future
+    
+    def _play_response(self, text: str):
+        """Speak a response using TTS (runs on the speech worker)"""
         try:
-            logger.info(f"Speaking response: {text}")
+            logger.info("Speaking response: %s", text)
             
             # Log TTS type and availability
             tts_type = type(self.tts).__name__
-            logger.info(f"TTS type: {tts_type}")
-            logger.info(f"TTS available: {self.tts.is_available()}")
+            logger.info("TTS type: %s", tts_type)
+            logger.info("TTS available: %s", self.tts.is_available())
             
             # Generate speech
             if hasattr(self.tts, 'generate_speech'):
@@ -380,19 +501,43 @@ class UniversalVoiceTaskManager:
                 logger.info("Using TTSManager.speak method")
                 result = self.tts.speak(text)
             
-            logger.info(f"TTS result: {result}")
+            logger.debug("TTS result: %s", result)
             
             if result['success']:
                 # Play the audio
                 audio_file = result['output_file']
-                logger.info(f"Playing audio file: {audio_file}")
-                self.audio_recorder.player.play_audio(audio_file)
+                logger.debug("Playing audio file: %s", audio_file)
+                self.audio_player.play_audio(audio_file)
             else:
-                logger.error(f"TTS failed: {result.get('error')}")
+                logger.error("TTS failed: %s", result.get('error'))
                 
         except Exception as e:
-            logger.error(f"Error in TTS: {e}")
-            logger.error(traceback.format_exc())
+            logger.error("Error in TTS: %s", e, exc_info=True)
+    
+    def _cache_prompts(self):
+        """Start synthesizing the fixed prompts missing from the TTS cache (runs on the speech worker)"""
+        if not hasattr(self.tts, 'is_cached'):
+            return
+        missing = [prompt for prompt in CACHED_PROMPTS if not self.tts.is_cached(prompt)]
+        logger.info("%d of %d fixed prompts already cached", len(CACHED_PROMPTS) - len(missing), len(CACHED_PROMPTS))
+        if missing:
+            self._cache_next_prompt(missing)
+    
+    def _cache_next_prompt(self, prompts: List[str]):
+        """
+        Synthesize one prompt into the TTS cache, then requeue the rest
+        
+        Speech queued in the meantime runs first, so a hotkey press waits for
+        at most one prompt's synthesis rather than the whole list.
+        """
+        if not self.tts.speak(prompts[0])['success']:
+            logger.warning("Could not pre-generate prompt: %s", prompts[0])
+        if len(prompts) > 1:
+            try:
+                self._speech_executor.submit(self._cache_next_prompt, prompts[1:])
+            except RuntimeError:
+                # Shutting down; the rest are generated on the next start
+                pass
     
     def start(self):
         """Start the voice task manager"""
@@ -401,26 +546,27 @@ class UniversalVoiceTaskManager:
             logger.info("Starting Universal Voice Task Manager...")
             
             # Speak startup message
-            startup_message = "Voice Task Manager is now active. Press the hotkey to add a new task."
-            self._speak_response(startup_message)
+            self._speak_response(STARTUP_MESSAGE)
+            
+            # Fill the TTS cache behind the startup message, on the same worker
+            self._speech_executor.submit(self._cache_prompts)
             
             logger.info("Universal Voice Task Manager is running. Press Ctrl+C to stop.")
             
-            # Main loop
-            while self.running:
-                time.sleep(0.1)
+            # Main loop: wake once a second rather than blocking outright, so
+            # Ctrl+C still gets through on Windows
+            while not self._shutdown_event.wait(timeout=1.0):
+                pass
                 
         except KeyboardInterrupt:
             logger.info("Received interrupt signal, shutting down...")
             # Don't stop immediately if processing audio
-            if self.processing_audio:
+            if not self._processing_done.is_set():
                 logger.info("Audio processing in progress, waiting for completion...")
-                while self.processing_audio and self.running:
-                    time.sleep(0.1)
+                self._processing_done.wait()
                 logger.info("Audio processing completed, proceeding with shutdown")
         except Exception as e:
-            logger.error(f"Error in main loop: {e}")
-            logger.error(traceback.format_exc())
+            logger.error("Error in main loop: %s", e, exc_info=True)
         finally:
             self.stop()
     
@@ -429,82 +575,71 @@ class UniversalVoiceTaskManager:
         try:
             logger.info("Stopping Universal Voice Task Manager...")
             self.running = False
+            self._shutdown_event.set()
             
             # Wait for audio processing to complete
-            if self.processing_audio:
+            if not self._processing_done.is_set():
                 logger.info("Waiting for audio processing to complete...")
-                while self.processing_audio:
-                    time.sleep(0.1)
+                self._processing_done.wait()
                 logger.info("Audio processing completed")
+            # Also covers a turn that was submitted but hasn't started yet
+            self._voice_executor.shutdown(wait=True)
+            
+            # Finish pending task writes (their callbacks may still queue a response)
+            if self.excel_manager is not None:
+                self.excel_manager.flush()
+            
+            # Let queued responses finish before tearing down audio
+            self._speech_executor.shutdown(wait=True)
+            self._stt_executor.shutdown(wait=False)
             
             # Stop hotkey listeners
-            if hasattr(self, 'hotkey_listener') and self.hotkey_listener:
+            if self.hotkey_listener is not None:
                 try:
                     self.hotkey_listener.stop()
                     logger.info("Hotkey listener stopped")
                 except Exception as e:
-                    logger.error(f"Error stopping hotkey listener: {e}")
+                    logger.error("Error stopping hotkey listener: %s", e)
             
             # Unhook keyboard hotkeys (Windows)
             try:
-                import platform
-                if platform.system().lower() == "windows":
-                    import keyboard
+                if keyboard is not None:
                     keyboard.unhook_all()
                     logger.info("Keyboard hotkeys unhooked")
             except Exception as e:
-                logger.error(f"Error unhooking keyboard: {e}")
+                logger.error("Error unhooking keyboard: %s", e)
             
             # Cleanup components
-            try:
-                if hasattr(self, 'audio_recorder'):
-                    self.audio_recorder.cleanup()
-                    logger.info("Audio recorder cleaned up")
-            except Exception as e:
-                logger.error(f"Error cleaning up audio recorder: {e}")
-            
-            try:
-                if hasattr(self, 'stt'):
-                    self.stt.cleanup()
-                    logger.info("STT model cleaned up")
-            except Exception as e:
-                logger.error(f"Error cleaning up STT: {e}")
-            
-            try:
-                if hasattr(self, 'tts'):
-                    self.tts.cleanup()
-                    logger.info("TTS cleaned up")
-            except Exception as e:
-                logger.error(f"Error cleaning up TTS: {e}")
-            
-            try:
-                if hasattr(self, 'openai_client'):
-                    self.openai_client.cleanup()
-                    logger.info("OpenAI client cleaned up")
-            except Exception as e:
-                logger.error(f"Error cleaning up OpenAI client: {e}")
-            
-            try:
-                if hasattr(self, 'excel_manager'):
-                    self.excel_manager.cleanup()
-                    logger.info("Excel task manager cleaned up")
-            except Exception as e:
-                logger.error(f"Error cleaning up Excel manager: {e}")
+            self._safe_cleanup("audio recorder", self.audio_recorder)
+            self._safe_cleanup("audio player", self.audio_player)
+            self._safe_cleanup("STT", self.stt)
+            self._safe_cleanup("TTS", self.tts)
+            self._safe_cleanup("OpenAI client", self.openai_client)
+            self._safe_cleanup("Excel manager", self.excel_manager)
             
             logger.info("Universal Voice Task Manager stopped")
             
         except Exception as e:
-            logger.error(f"Error during shutdown: {e}")
-            logger.error(traceback.format_exc())
+            logger.error("Error during shutdown: %s", e, exc_info=True)
+    
+    def _safe_cleanup(self, name: str, component):
+        """Clean up one component, logging (not raising) any failure"""
+        if component is None:
+            return
+        try:
+            component.cleanup()
+            logger.info("%s cleaned up", name)
+        except Exception as e:
+            logger.error("Error cleaning up %s: %s", name, e)
 
 def main():
     """Main function"""
+    _configure_logging()
     try:
         manager = UniversalVoiceTaskManager()
         manager.start()
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
-        logger.error(traceback.format_exc())
+        logger.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":